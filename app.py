@@ -1,21 +1,91 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from uvicorn import run as app_run
 
-from src.constants import APP_HOST, APP_PORT
-from src.pipline.prediction_pipeline import VehicleData, VehicleDataClassifier
+from src.constants import (
+    APP_HOST,
+    APP_PORT,
+    ARTIFACT_DIR,
+    BINARY_SCORING_CONTENT_TYPES,
+    INFERENCE_RETRY_AFTER_SECONDS,
+    STREAM_SCORING_OVERLOAD_RETRIES,
+    WARM_UP_RETRY_SECONDS,
+)
+from src.logger import logging
+from src.pipline.inference_executor import InferenceExecutor, InferenceOverloadedError
+from src.pipline.micro_batcher import PredictionBatcher
+from src.pipline.training_jobs import TrainingJobManager
+from src.utils.artifact_index import get_artifact_index
+from src.utils.lazy_import import LazyCallable
+from src.utils.metrics import count_error, render_gauges, render_metrics, timed
+from src.utils.process_memory import process_memory
 
 load_dotenv()
 
-app = FastAPI()
+
+# pandas/sklearn and the model are imported on first use (normally by the lifespan warm-up),
+# not when this module is imported, so the process starts fast and /health answers early.
+readiness = {"ready": False, "error": None}
+
+
+async def warm_up() -> bool:
+    """Load and warm the model off the event loop; record the outcome in ``readiness``."""
+    from src.pipline.prediction_pipeline import warm_up_serving
+
+    try:
+        readiness.update(await asyncio.to_thread(warm_up_serving), ready=True, error=None)
+    except Exception as e:
+        readiness.update(ready=False, error=str(e))
+        logging.warning(f"Model not warmed up: {e}")
+    return readiness["ready"]
+
+
+async def keep_warming_up() -> None:
+    """Retry warm_up every WARM_UP_RETRY_SECONDS until a model is ready (e.g. once the first training finishes)."""
+    while not await warm_up():
+        await asyncio.sleep(WARM_UP_RETRY_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Preload the latest model and warm it with a synthetic batch in one background task, so the
+    process answers /health at once and /ready only reports the task's progress.
+    """
+    warm_up_task = asyncio.create_task(keep_warming_up())
+    yield
+    warm_up_task.cancel()
+    inference_executor.shutdown(wait=False, cancel_futures=True)
+    training_jobs.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+inference_executor = InferenceExecutor()
+prediction_batcher = PredictionBatcher(
+    score_fn=LazyCallable("src.pipline.prediction_pipeline:score_encoded_records"), executor=inference_executor
+)
+training_jobs = TrainingJobManager()
+# pymongo is only imported once /stats or /metrics is first requested
+mongo_pool_stats = LazyCallable("src.configuration.mongo_db_connection:pool_stats")
+
+
+def overloaded_response() -> JSONResponse:
+    return JSONResponse(
+        {"status": False, "error": "Inference queue is full, retry later"},
+        status_code=503,
+        headers={"Retry-After": str(INFERENCE_RETRY_AFTER_SECONDS)},
+    )
 
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -113,65 +183,45 @@ async def index(request: Request):
     Renders the main HTML form page for vehicle data input.
     """
 
-    # Build basic MLOps status to display on UI
-    def find_latest_artifact(base_dir: str):
-        try:
-            if not os.path.exists(base_dir):
-                return None
-            items = []
-            for name in os.listdir(base_dir):
-                full = os.path.join(base_dir, name)
-                if not os.path.isdir(full):
-                    continue
-                try:
-                    dt = datetime.strptime(name, "%m_%d_%Y_%H_%M_%S")
-                    items.append((dt, full, name))
-                except ValueError:
-                    continue
-            if not items:
-                return None
-            items.sort(key=lambda x: x[0], reverse=True)
-            return items[0]
-        except Exception:
-            return None
-
-    latest = find_latest_artifact("artifact")
-    latest_dir = latest[1] if latest else None
-    latest_name = latest[2] if latest else None
-
-    def exists(rel_path: str) -> bool:
-        return bool(latest_dir and os.path.exists(os.path.join(latest_dir, rel_path)))
+    # Build basic MLOps status to display on UI from the cached artifact index
+    artifact_index = get_artifact_index(ARTIFACT_DIR)
+    latest_name = artifact_index.latest_run()
 
     mlops = {
         "artifact": latest_name,
-        "stages": {
-            "data_ingestion": exists(os.path.join("data_ingestion", "ingested", "train.csv"))
-            and exists(os.path.join("data_ingestion", "ingested", "test.csv")),
-            "data_validation": exists(os.path.join("data_validation", "report.yaml")),
-            "data_transformation": exists(os.path.join("data_transformation", "transformed_object", "preprocessing.pkl")),
-            "model_trainer": exists(os.path.join("model_trainer", "trained_model", "model.pkl")),
-        },
+        "stages": artifact_index.stage_status(latest_name),
     }
 
-    return templates.TemplateResponse(
-        "vehicledata.html", {"request": request, "context": "Rendering", "score": None, "mlops": mlops}
-    )
+    with timed("template_rendering"):
+        return templates.TemplateResponse(
+            "vehicledata.html", {"request": request, "context": "Rendering", "score": None, "mlops": mlops}
+        )
 
 
 @app.get("/train")
 async def trainRouteClient():
     """
-    Endpoint to initiate the model training pipeline.
+    Start the model training pipeline as a background job and return its id right away.
+
+    Training runs in a separate lower-priority process, one job at a time; poll
+    ``/train/{job_id}`` for the current stage, per-stage timings and the final artifact path.
     """
     try:
-        from src.pipline.training_pipeline import TrainPipeline
+        # submit() waits on the job locks and reads the job files; keep that off the event loop
+        job = await asyncio.to_thread(training_jobs.submit)
+        return JSONResponse(dict(job, status=True, status_url=f"/train/{job['job_id']}"), status_code=202)
+    except Exception as e:
+        count_error("train")
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=500)
 
-        train_pipeline = TrainPipeline()
-        train_pipeline.run_pipeline()
-        return Response("Training successful!!!")
 
-    except Exception as e:
-        return Response(f"Error Occurred! {e}")
+@app.get("/train/{job_id}")
+async def trainStatusRouteClient(job_id: str):
+    """Status of a training job: state, current stage, seconds per stage and the artifact it produced."""
+    job = await asyncio.to_thread(training_jobs.get, job_id)
+    if job is None:
+        return JSONResponse({"status": False, "error": f"Unknown training job {job_id}"}, status_code=404)
+    return dict(job, status=True)
 
 
 @app.get("/health")
@@ -187,6 +237,41 @@ async def health():
         return {"status": False, "error": str(e)}
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 200 once a model is loaded and warmed, 503 (with the reason) until then."""
+    # Only reads the state; the lifespan's warm-up task is the one loading the model
+    # pid tells apart the workers of a multi-worker uvicorn behind one port
+    if readiness["ready"]:
+        return dict(readiness, pid=os.getpid())
+    return JSONResponse(dict(readiness, pid=os.getpid()), status_code=503)
+
+
+@app.get("/stats")
+async def stats():
+    """Serving-side counters: micro-batch sizes, time requests spent queued, this worker's memory, training jobs
+    and MongoDB connection pool checkouts/waits."""
+    return {
+        "pid": os.getpid(),
+        "batching": prediction_batcher.stats(),
+        "inference": inference_executor.stats(),
+        "memory": process_memory(),
+        "training_jobs": training_jobs.stats(),
+        "mongo_pool": mongo_pool_stats(),
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition: per-stage latency histograms, prediction/error counters and queue gauges."""
+    extra = render_gauges("vehicle_batching", prediction_batcher.stats())
+    extra += render_gauges("vehicle_inference", inference_executor.stats())
+    extra += render_gauges("vehicle_process_memory", process_memory())
+    extra += render_gauges("vehicle_training_jobs", training_jobs.stats())
+    extra += render_gauges("vehicle_mongo_pool", mongo_pool_stats())
+    return PlainTextResponse(render_metrics(extra), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/")
 async def predictRouteClient(request: Request):
     """
@@ -194,35 +279,14 @@ async def predictRouteClient(request: Request):
     """
     try:
         form = DataForm(request)
-        await form.get_vehicle_data()
-
-        encoded_data = form.get_encoded_data()
-
-        vehicle_data = VehicleData(
-            Gender=encoded_data["Gender"],
-            Age=encoded_data["Age"],
-            Driving_License=encoded_data["Driving_License"],
-            Region_Code=encoded_data["Region_Code"],
-            Previously_Insured=encoded_data["Previously_Insured"],
-            Annual_Premium=encoded_data["Annual_Premium"],
-            Policy_Sales_Channel=encoded_data["Policy_Sales_Channel"],
-            Vintage=encoded_data["Vintage"],
-            Vehicle_Age_lt_1_Year=encoded_data["Vehicle_Age_lt_1_Year"],
-            Vehicle_Age_gt_2_Years=encoded_data["Vehicle_Age_gt_2_Years"],
-            Vehicle_Damage_Yes=encoded_data["Vehicle_Damage_Yes"],
-        )
+        with timed("form_parsing"):
+            await form.get_vehicle_data()
 
-        vehicle_df = vehicle_data.get_vehicle_input_data_frame()
+        with timed("encoding"):
+            encoded_data = form.get_encoded_data()
 
-        model_predictor = VehicleDataClassifier()
-
-        value = model_predictor.predict(dataframe=vehicle_df)[0]
-        score = None
-        try:
-            prob = model_predictor.predict_proba(dataframe=vehicle_df)
-            score = float(prob)
-        except Exception:
-            score = None
+        # Concurrent form posts are coalesced into one model call by the batcher
+        value, score = await prediction_batcher.submit(encoded_data)
 
         status = "Response-Yes" if int(value) == 1 else "Response-No"
 
@@ -240,14 +304,153 @@ async def predictRouteClient(request: Request):
             "Vehicle_Damage": form.Vehicle_Damage,
         }
 
-        return templates.TemplateResponse(
-            "vehicledata.html",
-            {"request": request, "context": status, "score": score, "form_data": form_data},
-        )
+        with timed("template_rendering"):
+            return templates.TemplateResponse(
+                "vehicledata.html",
+                {"request": request, "context": status, "score": score, "form_data": form_data},
+            )
 
+    except InferenceOverloadedError:
+        count_error("predict_form")
+        return overloaded_response()
     except Exception as e:
+        count_error("predict_form")
         return {"status": False, "error": f"{e}"}
 
 
+@app.post("/predict/batch")
+async def predictBatchRouteClient(request: Request):
+    """
+    Score many raw vehicle records in one call.
+
+    Accepts a JSON list of records (or ``{"records": [...]}``) using the same user-friendly
+    values as the HTML form and returns labels and positive-class probabilities in input order.
+
+    Bulk callers can instead send an Arrow IPC stream or a ``.npy`` float matrix of already
+    encoded EXPECTED_COLUMNS (Content-Type ``application/vnd.apache.arrow.stream`` or
+    ``application/x-npy``) and get the results back in the same format.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in BINARY_SCORING_CONTENT_TYPES:
+        return await predict_binary_batch(request, media_type)
+
+    try:
+        payload = await request.json()
+        records = payload.get("records") if isinstance(payload, dict) else payload
+        if not isinstance(records, list) or not records:
+            count_error("predict_batch")
+            return JSONResponse({"status": False, "error": "Expected a non-empty list of records"}, status_code=400)
+    except Exception as e:
+        count_error("predict_batch")
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=400)
+
+    try:
+        from src.pipline.prediction_pipeline import score_raw_records
+
+        labels, probabilities, threshold = await inference_executor.run(score_raw_records, records)
+        return JSONResponse({
+            "status": True,
+            "count": len(labels),
+            "threshold": threshold,
+            "predictions": labels,
+            "probabilities": probabilities,
+        })
+    except InferenceOverloadedError:
+        count_error("predict_batch")
+        return overloaded_response()
+    except Exception as e:
+        count_error("predict_batch")
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=500)
+
+
+async def predict_binary_batch(request: Request, media_type: str) -> Response:
+    from src.pipline.binary_scoring import BinaryPayloadError, score_binary_batch
+
+    try:
+        output, threshold, count = await inference_executor.run(score_binary_batch, await request.body(), media_type)
+        return Response(output, media_type=media_type,
+                        headers={"X-Decision-Threshold": repr(threshold), "X-Row-Count": str(count)})
+    except InferenceOverloadedError:
+        count_error("predict_batch")
+        return overloaded_response()
+    except BinaryPayloadError as e:
+        count_error("predict_batch")
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=400)
+    except Exception as e:
+        count_error("predict_batch")
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=500)
+
+
+@app.post("/predict/csv")
+async def predictCsvRouteClient(request: Request, format: str = "csv"):
+    """
+    Score a streamed CSV upload in the raw schema (config/schema.yaml columns; ``id`` and
+    ``Response`` optional) and stream predictions back as CSV or NDJSON (``?format=ndjson``).
+
+    The body is parsed in fixed-size row chunks and each chunk is scored and written out before
+    the next one is read, so memory stays bounded regardless of file size.
+
+    The header and the first chunk are checked and scored before the 200 goes out, so bad input
+    gets a 400 (and overload a 503). A chunk that still fails later ends the body with an error
+    trailer (``# error: ...`` in CSV, ``{"error": ...}`` in NDJSON) and an aborted chunked
+    transfer, so a truncated result cannot pass as a complete one.
+    """
+    from src.pipline.stream_scoring import (
+        OUTPUT_FORMATS,
+        CsvChunkReader,
+        format_scored_block,
+        format_stream_error,
+        missing_raw_columns,
+        score_csv_block,
+    )
+
+    if format not in OUTPUT_FORMATS:
+        count_error("predict_csv")
+        return JSONResponse({"status": False, "error": f"format must be one of {OUTPUT_FORMATS}"}, status_code=400)
+
+    reader = CsvChunkReader(request.stream())
+    missing = missing_raw_columns(await reader.read_header())
+    if missing:
+        count_error("predict_csv")
+        return JSONResponse({"status": False, "error": f"Missing columns in CSV header: {missing}"}, status_code=400)
+
+    blocks = reader.__aiter__()
+    try:
+        first_output = await inference_executor.run(score_csv_block, await blocks.__anext__())
+    except StopAsyncIteration:
+        count_error("predict_csv")
+        return JSONResponse({"status": False, "error": "CSV has no data rows"}, status_code=400)
+    except InferenceOverloadedError:
+        count_error("predict_csv")
+        return overloaded_response()
+    except Exception as e:
+        count_error("predict_csv")
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=400)
+
+    async def score_with_retries(block: bytes):
+        for _ in range(STREAM_SCORING_OVERLOAD_RETRIES):
+            try:
+                return await inference_executor.run(score_csv_block, block)
+            except InferenceOverloadedError:
+                # A long upload waits for capacity instead of failing half way through
+                await asyncio.sleep(INFERENCE_RETRY_AFTER_SECONDS)
+        return await inference_executor.run(score_csv_block, block)
+
+    async def scored_blocks():
+        yield format_scored_block(first_output, format, include_header=True)
+        try:
+            async for block in blocks:
+                yield format_scored_block(await score_with_retries(block), format, include_header=False)
+        except Exception as e:
+            count_error("predict_csv")
+            logging.error(f"/predict/csv failed mid-stream: {e}")
+            yield format_stream_error(e, format)
+            # Re-raising makes the server drop the connection without the final chunk
+            raise
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    return StreamingResponse(scored_blocks(), media_type=media_type)
+
+
 if __name__ == "__main__":
     app_run(app, host=APP_HOST, port=APP_PORT)
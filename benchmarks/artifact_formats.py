@@ -0,0 +1,107 @@
+"""
+CSV against Parquet for the data-ingestion artifacts (feature store and train/test splits):
+write time, file size, and read time as each pipeline stage reads them, i.e. the full table,
+the transformation/evaluation projection (no id columns), and the header only (validation);
+``pipeline_reads_s`` adds these up the way one training run reads its splits.
+
+CSV is written and read as the pipeline did before Parquet artifacts (``to_csv``/``read_csv``
+with inferred types); Parquet goes through save_dataframe/load_dataframe, once per
+``--compressions`` codec. Timings are medians over ``--repeats``.
+
+    python -m benchmarks.artifact_formats --sizes 100000 1000000 --output formats.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable
+
+import pandas as pd
+
+from benchmarks.synthetic import make_raw_training_frame
+from src.utils.main_utils import cast_to_schema, load_dataframe, read_dataframe_columns, save_dataframe
+
+DEFAULT_SIZES = (100_000, 1_000_000)
+PROJECTED_COLUMNS = [name for name in make_raw_training_frame(1).columns if name not in ("_id", "id")]
+
+
+def _median_seconds(function: Callable[[], object], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return round(statistics.median(timings), 4)
+
+
+def measure_csv(frame: pd.DataFrame, file_path: str, repeats: int) -> dict:
+    write_s = _median_seconds(lambda: frame.to_csv(file_path, index=False, header=True), repeats)
+    loaded = pd.read_csv(file_path)
+    return {
+        "format": "csv",
+        "write_s": write_s,
+        "file_mb": round(os.path.getsize(file_path) / 2**20, 2),
+        "read_s": _median_seconds(lambda: pd.read_csv(file_path), repeats),
+        "projected_read_s": _median_seconds(lambda: pd.read_csv(file_path, usecols=PROJECTED_COLUMNS), repeats),
+        "header_read_s": _median_seconds(lambda: pd.read_csv(file_path, nrows=0), repeats),
+        "frame_mb": round(loaded.memory_usage(deep=True).sum() / 2**20, 2),
+    }
+
+
+def measure_parquet(frame: pd.DataFrame, file_path: str, compression: str, repeats: int) -> dict:
+    write_s = _median_seconds(lambda: save_dataframe(file_path, frame, compression=compression), repeats)
+    loaded = load_dataframe(file_path)
+    return {
+        "format": f"parquet-{compression}",
+        "write_s": write_s,
+        "file_mb": round(os.path.getsize(file_path) / 2**20, 2),
+        "read_s": _median_seconds(lambda: load_dataframe(file_path), repeats),
+        "projected_read_s": _median_seconds(lambda: load_dataframe(file_path, columns=PROJECTED_COLUMNS), repeats),
+        "header_read_s": _median_seconds(lambda: read_dataframe_columns(file_path), repeats),
+        "frame_mb": round(loaded.memory_usage(deep=True).sum() / 2**20, 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--compressions", nargs="+", default=["snappy", "zstd", "none"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Write the JSON results here")
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in sorted(args.sizes):
+        frame = make_raw_training_frame(rows)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            measured = [measure_csv(frame, os.path.join(tmp_dir, "train.csv"), args.repeats)]
+            typed = cast_to_schema(frame)
+            for compression in args.compressions:
+                measured.append(measure_parquet(typed, os.path.join(tmp_dir, f"train-{compression}.parquet"),
+                                                compression, args.repeats))
+        for result in measured:
+            result["rows"] = rows
+            # Validation reads train and test, transformation train and test, evaluation test (0.25
+            # of the rows): CSV reads all of them whole, Parquet two headers and the projections
+            if result["format"] == "csv":
+                pipeline_reads_s = 2.25 * result["read_s"]
+            else:
+                pipeline_reads_s = 2 * result["header_read_s"] + 1.25 * result["projected_read_s"]
+            result["pipeline_reads_s"] = round(pipeline_reads_s, 4)
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    text = json.dumps({"config": config, "results": results}, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
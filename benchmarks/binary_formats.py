@@ -0,0 +1,150 @@
+"""
+JSON versus Arrow IPC versus ``.npy`` request bodies for /predict/batch: per batch size, the
+client-side encode/decode time, round-trip latency, server CPU time and bytes on the wire.
+
+JSON posts raw-schema records (the existing bulk path); Arrow and ``.npy`` post the same number
+of rows already encoded in EXPECTED_COLUMNS order. Runs against a synthetic model, offline.
+
+    python -m benchmarks.binary_formats --rows 1000 10000 100000 --repeats 5 --output formats.json
+"""
+import argparse
+import http.client
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.parse
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from benchmarks.server import http_status, running_server
+from benchmarks.synthetic import make_feature_frame, raw_records, write_synthetic_artifact
+from src.constants import BINARY_SCORING_CONTENT_TYPES
+
+ARROW_STREAM_CONTENT_TYPE, NPY_CONTENT_TYPE = BINARY_SCORING_CONTENT_TYPES
+FORMATS = ("json", "arrow", "npy")
+DEFAULT_ROWS = (1_000, 10_000, 100_000)
+
+
+def _cpu_seconds(pid: int) -> Optional[float]:
+    """User plus system CPU time of ``pid`` so far (Linux /proc only)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _arrow_bytes(table: pa.Table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def build_payload(fmt: str, n_rows: int) -> Tuple[Callable[[], bytes], str, Callable[[bytes], int]]:
+    """(encode the request body, its content type, decode a response body into a row count)."""
+    if fmt == "json":
+        records = raw_records(n_rows)
+        return (lambda: json.dumps(records).encode(), "application/json",
+                lambda body: len(json.loads(body)["predictions"]))
+
+    features = make_feature_frame(n_rows, seed=11)
+    if fmt == "arrow":
+        return (lambda: _arrow_bytes(pa.Table.from_pandas(features, preserve_index=False)),
+                ARROW_STREAM_CONTENT_TYPE, lambda body: pa.ipc.open_stream(body).read_all().num_rows)
+
+    def encode_npy() -> bytes:
+        buffer = io.BytesIO()
+        np.save(buffer, features.to_numpy(dtype=np.float64))
+        return buffer.getvalue()
+
+    return encode_npy, NPY_CONTENT_TYPE, lambda body: len(np.load(io.BytesIO(body)))
+
+
+def measure(base_url: str, server_pid: int, fmt: str, n_rows: int, repeats: int) -> Dict[str, object]:
+    encode, content_type, decode = build_payload(fmt, n_rows)
+    parsed = urllib.parse.urlparse(base_url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=300)
+    encode_s, round_trip_s, decode_s, server_cpu_s = [], [], [], []
+    try:
+        for attempt in range(repeats + 1):
+            started = time.perf_counter()
+            body = encode()
+            encoded = time.perf_counter()
+            cpu_before = _cpu_seconds(server_pid)
+            connection.request("POST", "/predict/batch", body=body, headers={"Content-Type": content_type})
+            response = connection.getresponse()
+            response_body = response.read()
+            answered = time.perf_counter()
+            cpu_after = _cpu_seconds(server_pid)
+            if response.status != 200:
+                raise RuntimeError(f"{fmt} x {n_rows}: HTTP {response.status} {response_body[:200]!r}")
+            if decode(response_body) != n_rows:
+                raise RuntimeError(f"{fmt} x {n_rows}: wrong number of results")
+            decoded = time.perf_counter()
+            if attempt == 0:
+                continue  # warm-up
+            encode_s.append(encoded - started)
+            round_trip_s.append(answered - encoded)
+            decode_s.append(decoded - answered)
+            if cpu_before is not None and cpu_after is not None:
+                server_cpu_s.append(cpu_after - cpu_before)
+    finally:
+        connection.close()
+
+    def median_ms(values):
+        return round(float(np.median(values)) * 1000, 2) if len(values) else None
+
+    return {
+        "format": fmt,
+        "rows": n_rows,
+        "request_bytes": len(body),
+        "response_bytes": len(response_body),
+        "client_encode_ms": median_ms(encode_s),
+        "round_trip_ms": median_ms(round_trip_s),
+        "client_decode_ms": median_ms(decode_s),
+        "server_cpu_ms": median_ms(server_cpu_s),
+        "total_ms": median_ms(np.add(np.add(encode_s, round_trip_s), decode_s)),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS), help="Rows per request")
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=FORMATS)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="Write the JSON results here")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as artifact_base:
+        write_synthetic_artifact(artifact_base)
+        with running_server(artifact_base) as base_url:
+            server_pid = json.loads(http_status(f"{base_url}/ready")[1])["pid"]
+            for n_rows in args.rows:
+                for fmt in args.formats:
+                    result = measure(base_url, server_pid, fmt, n_rows, args.repeats)
+                    results.append(result)
+                    print(json.dumps(result), file=sys.stderr)
+
+    for result in results:
+        baseline = next(r for r in results if r["rows"] == result["rows"])
+        if baseline["format"] == "json" and result["total_ms"]:
+            result["speedup_vs_json"] = round(baseline["total_ms"] / result["total_ms"], 2)
+
+    text = json.dumps({"results": results}, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Cold-start benchmark: how long ``import app`` takes, how long a fresh uvicorn process needs
+before it reports ready, and the latency of the first and of subsequent /predict/batch calls.
+
+Runs offline against a synthetic model. Exits non-zero when the median import time exceeds
+``--import-budget`` so CI can catch a heavy import creeping back into app.py.
+
+    python -m benchmarks.cold_start --runs 5 --output cold_start.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.server import ROOT, http_status, start_server, stop_server, wait_until_ready
+from benchmarks.synthetic import raw_records, write_synthetic_artifact
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+
+
+def measure_import_seconds(runs: int) -> list:
+    """Wall time of ``import app`` in fresh interpreters."""
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, check=True, capture_output=True, text=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def measure_server_start(artifact_base: str, requests: int, batch_rows: int) -> dict:
+    """Spawn uvicorn, wait for /ready, then time the first and following /predict/batch calls."""
+    started = time.perf_counter()
+    server, base_url = start_server(artifact_base)
+    try:
+        wait_until_ready(server, base_url)
+        ready_seconds = time.perf_counter() - started
+
+        payload = raw_records(batch_rows)
+        latencies = []
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            status, _ = http_status(f"{base_url}/predict/batch", payload)
+            latencies.append(time.perf_counter() - request_started)
+            if status != 200:
+                raise RuntimeError(f"/predict/batch returned {status}")
+        return {
+            "ready_seconds": round(ready_seconds, 4),
+            "first_request_ms": round(latencies[0] * 1000, 3),
+            "warm_request_median_ms": round(statistics.median(latencies[1:] or latencies) * 1000, 3),
+        }
+    finally:
+        stop_server(server)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Fresh processes to start for each measurement")
+    parser.add_argument("--requests", type=int, default=20, help="/predict/batch calls per server start")
+    parser.add_argument("--batch-rows", type=int, default=1, help="Records per /predict/batch call")
+    parser.add_argument("--import-budget", type=float, default=1.5, help="Max median seconds for 'import app'")
+    parser.add_argument("--output", help="Write the JSON report here as well as to stdout")
+    args = parser.parse_args(argv)
+
+    import_seconds = measure_import_seconds(args.runs)
+    with tempfile.TemporaryDirectory() as artifact_base:
+        write_synthetic_artifact(artifact_base)
+        starts = [measure_server_start(artifact_base, args.requests, args.batch_rows) for _ in range(args.runs)]
+
+    report = {
+        "import_app_seconds": {
+            "median": round(statistics.median(import_seconds), 4),
+            "max": round(max(import_seconds), 4),
+            "budget": args.import_budget,
+        },
+        "ready_seconds_median": round(statistics.median(s["ready_seconds"] for s in starts), 4),
+        "first_request_ms_median": round(statistics.median(s["first_request_ms"] for s in starts), 3),
+        "warm_request_ms_median": round(statistics.median(s["warm_request_median_ms"] for s in starts), 3),
+        "runs": starts,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0 if report["import_app_seconds"]["median"] <= args.import_budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
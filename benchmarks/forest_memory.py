@@ -0,0 +1,62 @@
+"""
+Size of the pickled sklearn forest versus the compact compiled forest served next to it,
+with an exact-parity check and per-batch latency for both.
+
+    python -m benchmarks.forest_memory --rows 50000 --trees 200 --max-depth 10
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_feature_frame, make_synthetic_model
+from src.entity.compiled_forest import CompiledForest, forest_size_report
+
+
+def _median_ms(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return round(float(np.median(timings)) * 1000, 3)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000, help="Training rows for the synthetic model")
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--max-depth", type=int, default=10)
+    parser.add_argument("--check-rows", type=int, default=20_000, help="Rows compared for exact parity")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    model = make_synthetic_model(n_rows=args.rows, n_estimators=args.trees, max_depth=args.max_depth)
+    forest = model.trained_model_object
+    features = model.preprocessing_object.transform(make_feature_frame(args.check_rows, seed=11))
+
+    compiled = CompiledForest.from_sklearn(forest)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "compiled_forest.npz")
+        compiled.save(file_path)
+        report = forest_size_report(forest, compiled, file_path)
+        compiled = CompiledForest.load(file_path)
+
+    report["exact_parity"] = bool(np.array_equal(compiled.predict_proba(features), forest.predict_proba(features)))
+    report["latency_ms"] = {
+        str(batch): {
+            "sklearn": _median_ms(lambda: forest.predict_proba(features[:batch]), args.repeats),
+            "compiled": _median_ms(lambda: compiled.predict_proba(features[:batch]), args.repeats),
+        }
+        for batch in (1, 256, args.check_rows)
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["exact_parity"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Daily ingestion cost with and without the incremental feature store: a collection of
+``--sizes`` documents is ingested once, ``--delta`` new documents arrive, and the next run is
+timed as a full re-export (the default) and as an incremental one (``DATA_INGESTION_INCREMENTAL=1``) that
+fetches only documents past the watermark.
+
+Each size runs against the in-process BSON stand-in (benchmarks/mongo_standin.py); the
+train/test split of the combined store is timed separately, as it is the same in both modes.
+
+    python -m benchmarks.incremental_ingestion --sizes 100000 1000000 --delta 10000 --output incremental.json
+    python -m benchmarks.incremental_ingestion --round-trip-ms 2 --cursor-mbps 40
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.mongo_standin import StandInMongoClient, load_collection
+from benchmarks.synthetic import make_raw_training_frame
+
+DEFAULT_SIZES = (100_000, 1_000_000)
+
+
+def _ingestion(tmp_dir: str, run: str, incremental: bool):
+    from src.components.data_ingestion import DataIngestion
+    from src.constants import DATA_INGESTION_COLLECTION_NAME, FILE_NAME, TEST_FILE_NAME, TRAIN_FILE_NAME
+    from src.entity.config_entity import DataIngestionConfig
+
+    run_dir = os.path.join(tmp_dir, run, "data_ingestion")
+    return DataIngestion(DataIngestionConfig(
+        data_ingestion_dir=run_dir,
+        feature_store_file_path=os.path.join(run_dir, "feature_store", FILE_NAME),
+        training_file_path=os.path.join(run_dir, "ingested", TRAIN_FILE_NAME),
+        testing_file_path=os.path.join(run_dir, "ingested", TEST_FILE_NAME),
+        feature_store_dir=os.path.join(tmp_dir, "feature_store", DATA_INGESTION_COLLECTION_NAME),
+        incremental=incremental,
+    ))
+
+
+def _timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, round(time.perf_counter() - started, 3)
+
+
+def measure(rows: int, delta: int, round_trip_ms: float, cursor_mbps: float) -> dict:
+    from src.configuration.mongo_db_connection import MongoDBClient
+    from src.constants import DATA_INGESTION_COLLECTION_NAME, DATABASE_NAME
+
+    client = StandInMongoClient(round_trip_ms / 1000, cursor_mbps * 2**20 if cursor_mbps else None)
+    MongoDBClient.client = client
+    collection = load_collection(client, DATABASE_NAME, DATA_INGESTION_COLLECTION_NAME, make_raw_training_frame(rows))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _, initial_s = _timed(_ingestion(tmp_dir, "initial", incremental=True).export_data_into_feature_store)
+        new_rows = make_raw_training_frame(delta, seed=8)
+        new_rows["id"] += rows
+        load_collection(client, DATABASE_NAME, DATA_INGESTION_COLLECTION_NAME, new_rows)
+
+        full = _ingestion(tmp_dir, "full", incremental=False)
+        full_frame, full_export_s = _timed(full.export_data_into_feature_store)
+        incremental = _ingestion(tmp_dir, "incremental", incremental=True)
+        store_frame, incremental_export_s = _timed(incremental.export_data_into_feature_store)
+        _, split_s = _timed(lambda: incremental.split_data_as_train_test(store_frame))
+
+    if len(full_frame) != len(store_frame) or len(store_frame) != collection.estimated_document_count():
+        raise RuntimeError(f"Row counts differ: full {len(full_frame)}, store {len(store_frame)}")
+    return {
+        "rows": rows,
+        "delta": delta,
+        "initial_load_s": initial_s,
+        "full_export_s": full_export_s,
+        "incremental_export_s": incremental_export_s,
+        "split_s": split_s,
+        "speedup": round(full_export_s / incremental_export_s, 2) if incremental_export_s else None,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--delta", type=int, default=10_000, help="Documents added between the two runs")
+    parser.add_argument("--round-trip-ms", type=float, default=0.0, help="Emulated latency per cursor batch")
+    parser.add_argument("--cursor-mbps", type=float, default=0.0, help="Emulated MiB/s per cursor (0: unbounded)")
+    parser.add_argument("--output", help="Write the JSON results here")
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in sorted(args.sizes):
+        result = measure(rows, args.delta, args.round_trip_ms, args.cursor_mbps)
+        results.append(result)
+        print(json.dumps(result), file=sys.stderr)
+
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    text = json.dumps({"config": config, "results": results}, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
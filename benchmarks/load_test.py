@@ -0,0 +1,218 @@
+"""
+HTTP load test for the serving app: drives a weighted mix of endpoints at a fixed concurrency
+and reports throughput and p50/p95/p99 latency per endpoint.
+
+Starts ``app:app`` under uvicorn against a synthetic model (or ``--artifact-dir`` holding a
+locally trained run, or ``--url`` of a server that is already running), so it needs no network
+access or MongoDB. Results are written as JSON; with ``--baseline`` the run fails when any
+endpoint's latency percentile regresses by more than ``--max-regression``.
+
+    python -m benchmarks.load_test --concurrency 16 --duration 30 --output load.json
+    python -m benchmarks.load_test --baseline load.json --max-regression 0.2
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.server import ROOT, running_server
+from benchmarks.synthetic import raw_records, write_synthetic_artifact
+
+DEFAULT_MIX = "form=6,batch=3,index=1"
+PERCENTILES = (50, 95, 99)
+
+
+def build_requests(batch_rows: int) -> Dict[str, Tuple[str, str, bytes, Dict[str, str]]]:
+    """(method, path, body, headers) for every endpoint the mix can name."""
+    records = raw_records(max(batch_rows, 1))
+    form = {key: str(value) for key, value in records[0].items()}
+    csv_lines = [",".join(records[0].keys())] + [",".join(str(v) for v in record.values()) for record in records]
+    return {
+        "index": ("GET", "/", b"", {}),
+        "health": ("GET", "/health", b"", {}),
+        "form": ("POST", "/", urllib.parse.urlencode(form).encode(),
+                 {"Content-Type": "application/x-www-form-urlencoded"}),
+        "batch": ("POST", "/predict/batch", json.dumps(records[:batch_rows]).encode(),
+                  {"Content-Type": "application/json"}),
+        "csv": ("POST", "/predict/csv", ("\n".join(csv_lines[:batch_rows + 1]) + "\n").encode(),
+                {"Content-Type": "text/csv"}),
+    }
+
+
+def parse_mix(mix: str, available: List[str]) -> Dict[str, float]:
+    """Parse ``"form=6,batch=3"`` into endpoint weights."""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in available:
+            raise ValueError(f"Unknown endpoint {name!r} in mix; choose from {available}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def _worker(base_url: str, requests: dict, weights: Dict[str, float], deadline: float,
+            max_requests: Optional[int], counter: dict, lock: threading.Lock, seed: int) -> List[tuple]:
+    """One client loop on a keep-alive connection; returns (endpoint, status, seconds) samples."""
+    parsed = urllib.parse.urlparse(base_url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+    rng = random.Random(seed)
+    names, cumulative = list(weights), np.cumsum(list(weights.values()))
+    samples = []
+    try:
+        while time.perf_counter() < deadline:
+            if max_requests is not None:
+                with lock:
+                    if counter["sent"] >= max_requests:
+                        break
+                    counter["sent"] += 1
+            name = names[int(np.searchsorted(cumulative, rng.random() * cumulative[-1], side="right"))]
+            method, path, body, headers = requests[name]
+            started = time.perf_counter()
+            try:
+                connection.request(method, path, body=body or None, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                status = 0
+            samples.append((name, status, time.perf_counter() - started))
+    finally:
+        connection.close()
+    return samples
+
+
+def summarize(samples: List[tuple], elapsed: float) -> dict:
+    """Throughput, error count and latency percentiles (ms), per endpoint and overall."""
+    def stats(rows: List[tuple]) -> dict:
+        latencies = np.array([seconds for _, _, seconds in rows]) * 1000
+        summary = {
+            "requests": len(rows),
+            "errors": sum(1 for _, status, _ in rows if not 200 <= status < 300),
+            "throughput_rps": round(len(rows) / elapsed, 2),
+            "mean_ms": round(float(latencies.mean()), 3) if len(rows) else None,
+            "max_ms": round(float(latencies.max()), 3) if len(rows) else None,
+        }
+        for percentile in PERCENTILES:
+            summary[f"p{percentile}_ms"] = round(float(np.percentile(latencies, percentile)), 3) if len(rows) else None
+        return summary
+
+    by_endpoint = {}
+    for sample in samples:
+        by_endpoint.setdefault(sample[0], []).append(sample)
+    return {"overall": stats(samples), "endpoints": {name: stats(rows) for name, rows in sorted(by_endpoint.items())}}
+
+
+def run_load(base_url: str, weights: Dict[str, float], concurrency: int, duration: float,
+             max_requests: Optional[int], batch_rows: int, warmup_requests: int, seed: int) -> dict:
+    requests = build_requests(batch_rows)
+    if warmup_requests:
+        # Untimed pass so connection setup and lazy imports do not land in the percentiles
+        _worker(base_url, requests, weights, float("inf"), warmup_requests, {"sent": 0}, threading.Lock(), seed)
+
+    counter, lock = {"sent": 0}, threading.Lock()
+    started = time.perf_counter()
+    deadline = started + duration if max_requests is None else float("inf")
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(_worker, base_url, requests, weights, deadline, max_requests, counter, lock, seed + i)
+                   for i in range(concurrency)]
+        samples = [sample for future in futures for sample in future.result()]
+    return summarize(samples, time.perf_counter() - started)
+
+
+def find_regressions(results: dict, baseline: dict, metric: str, max_regression: float) -> List[str]:
+    """Endpoints whose ``metric`` grew by more than ``max_regression`` (a fraction) over the baseline."""
+    regressions = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("results", {}).get("endpoints", {}).get(name)
+        if not previous or not previous.get(metric) or current.get(metric) is None:
+            continue
+        change = current[metric] / previous[metric] - 1
+        if change > max_regression:
+            regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]} ms (+{change:.0%})")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client connections")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds to run (ignored with --requests)")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests instead of after --duration")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help="Weighted endpoints, e.g. 'form=6,batch=3,index=1' (also: health, csv)")
+    parser.add_argument("--batch-rows", type=int, default=32, help="Records per /predict/batch and /predict/csv call")
+    parser.add_argument("--warmup-requests", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--artifact-dir", help="Serve this artifact base dir instead of a synthetic model")
+    parser.add_argument("--url", help="Load an already running server instead of starting one")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON results here")
+    parser.add_argument("--baseline", help="Earlier --output to compare against")
+    parser.add_argument("--metric", default="p95_ms", choices=[f"p{p}_ms" for p in PERCENTILES] + ["mean_ms"])
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed fractional increase of --metric over the baseline")
+    args = parser.parse_args(argv)
+
+    weights = parse_mix(args.mix, list(build_requests(1)))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.url:
+            server = nullcontext(args.url.rstrip("/"))
+        else:
+            artifact_base = args.artifact_dir
+            if artifact_base is None:
+                artifact_base = tmp_dir
+                write_synthetic_artifact(artifact_base)
+            server = running_server(os.path.abspath(artifact_base), workers=args.workers)
+        with server as base_url:
+            results = run_load(base_url, weights, args.concurrency, args.duration, args.requests,
+                               args.batch_rows, args.warmup_requests, args.seed)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.metric, args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0 if results["overall"]["errors"] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Peak memory and wall time of exporting the MongoDB collection: the old
+``pd.DataFrame(list(collection.find()))`` against Proj1Data's projected, batched export into
+typed column buffers (whole DataFrame by one cursor or by ``--workers`` parallel ``_id``
+ranges, streamed chunks, and streamed chunks written as Parquet part files the way the
+feature store stores them).
+
+Each (mode, size) runs in a fresh subprocess against the in-process BSON stand-in
+(benchmarks/mongo_standin.py); the stand-in's own storage is part of the baseline, so the
+reported ``peak_rss_delta_mb`` is what the export itself added. ``--round-trip-ms`` and
+``--cursor-mbps`` emulate the network so the per-connection bound that parallel ranges work
+around shows up locally.
+
+    python -m benchmarks.mongo_export --sizes 100000 1000000 --output export.json
+    python -m benchmarks.mongo_export --modes dataframe parallel --workers 8 --round-trip-ms 2 --cursor-mbps 40
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.server import ROOT
+from benchmarks.training_stages import RssSampler
+
+MODES = ("legacy_list_of_dicts", "dataframe", "parallel", "chunks", "parquet_parts")
+DEFAULT_SIZES = (100_000, 1_000_000)
+
+
+def legacy_export(collection):
+    """Proj1Data.export_collection_as_dataframe before the streaming export, for comparison."""
+    import numpy as np
+    import pandas as pd
+
+    df = pd.DataFrame(list(collection.find()))
+    if "id" in df.columns.to_list():
+        df = df.drop(columns=["id"])
+    df.replace({"na": np.nan}, inplace=True)
+    return df
+
+
+def run_mode(mode: str, rows: int, batch_size: int, workers: int, round_trip_ms: float, cursor_mbps: float) -> dict:
+    """Child-process entry point: load the stand-in collection, then time and sample one export."""
+    from benchmarks.mongo_standin import StandInMongoClient, load_collection
+    from benchmarks.synthetic import make_raw_training_frame
+    from src.configuration.mongo_db_connection import MongoDBClient
+    from src.constants import DATA_INGESTION_COLLECTION_NAME, DATABASE_NAME
+    from src.data_access.proj1_data import Proj1Data
+    from src.utils.main_utils import save_dataframe
+
+    client = StandInMongoClient(round_trip_ms / 1000, cursor_mbps * 2**20 if cursor_mbps else None)
+    collection = load_collection(client, DATABASE_NAME, DATA_INGESTION_COLLECTION_NAME, make_raw_training_frame(rows))
+    MongoDBClient.client = client
+    export = Proj1Data(batch_size=batch_size, workers=workers if mode == "parallel" else 1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir, RssSampler() as sampler:
+        started = time.perf_counter()
+        output = {}
+        if mode == "legacy_list_of_dicts":
+            df = legacy_export(collection)
+            output["dataframe_mb"] = df.memory_usage(deep=True).sum() / 2**20
+        elif mode in ("dataframe", "parallel"):
+            df = export.export_collection_as_dataframe(DATA_INGESTION_COLLECTION_NAME)
+            output["dataframe_mb"] = df.memory_usage(deep=True).sum() / 2**20
+        elif mode == "chunks":
+            output["rows"] = sum(len(chunk) for chunk in export.iter_collection_chunks(DATA_INGESTION_COLLECTION_NAME))
+        else:
+            output["rows"] = 0
+            output["parquet_mb"] = 0.0
+            for index, chunk in enumerate(export.iter_collection_chunks(DATA_INGESTION_COLLECTION_NAME)):
+                file_path = os.path.join(tmp_dir, f"part-{index:05d}.parquet")
+                save_dataframe(file_path, chunk)
+                output["rows"] += len(chunk)
+                output["parquet_mb"] += os.path.getsize(file_path) / 2**20
+        seconds = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "rows": rows,
+        "workers": export.workers,
+        "status": "ok",
+        "seconds": round(seconds, 3),
+        "peak_rss_mb": round(sampler.peak / 2**20, 1),
+        "peak_rss_delta_mb": round((sampler.peak - sampler.baseline) / 2**20, 1),
+        **{key: round(value, 1) if isinstance(value, float) else value for key, value in output.items()},
+    }
+
+
+def measure(mode: str, rows: int, args: argparse.Namespace) -> dict:
+    command = [sys.executable, "-m", "benchmarks.mongo_export", "--run-mode", mode, "--rows", str(rows),
+               "--batch-size", str(args.batch_size), "--workers", str(args.workers),
+               "--round-trip-ms", str(args.round_trip_ms), "--cursor-mbps", str(args.cursor_mbps)]
+    timeout = args.timeout
+    try:
+        completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"mode": mode, "rows": rows, "status": "timeout", "timeout_seconds": timeout}
+    if completed.returncode != 0:
+        return {"mode": mode, "rows": rows, "status": "failed", "returncode": completed.returncode,
+                "error": completed.stderr.strip().splitlines()[-1:] or [""]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Cursor batch size for Proj1Data")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent range cursors in 'parallel' mode")
+    parser.add_argument("--round-trip-ms", type=float, default=0.0, help="Emulated latency per cursor batch")
+    parser.add_argument("--cursor-mbps", type=float, default=0.0, help="Emulated MiB/s per cursor (0: unbounded)")
+    parser.add_argument("--timeout", type=float, default=3600.0)
+    parser.add_argument("--output", help="Write the JSON results here")
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--rows", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_mode:
+        print(json.dumps(run_mode(args.run_mode, args.rows, args.batch_size, args.workers,
+                                  args.round_trip_ms, args.cursor_mbps)))
+        return 0
+
+    results = []
+    for rows in sorted(args.sizes):
+        for mode in args.modes:
+            result = measure(mode, rows, args)
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "run_mode", "rows")}
+    text = json.dumps({"config": config, "results": results}, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
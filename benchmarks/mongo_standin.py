@@ -0,0 +1,169 @@
+"""
+Minimal in-process MongoDB stand-in for the export benchmarks.
+
+Documents are stored BSON-encoded (as a server holds them) and decoded one cursor batch at a
+time (as the driver does with each reply), so the client-side cost and memory of a query are
+close to a real ``find`` without a server. mongomock keeps full Python documents and copies
+them on every query, which is too slow past ~10^4 documents to benchmark an export with.
+
+Supports what Proj1Data uses: ``find(filter, projection)`` with an empty filter or a range on
+``_id``, ``sort("_id")``, ``batch_size``, ``find_one`` sorted by ``_id``,
+``estimated_document_count``, ``count_documents``, ``aggregate([$sample, $project])`` and
+``insert_many``.
+
+Optionally each cursor batch also waits ``round_trip_seconds`` plus its size over
+``cursor_bytes_per_second``, emulating a network link where one cursor's throughput is bounded
+by its connection. Waiting releases the GIL, so concurrent cursors overlap as they would.
+"""
+import bisect
+import random
+import time
+from typing import Iterator, List, Optional
+
+import bson
+
+
+class StandInCursor:
+    def __init__(self, collection: "StandInCollection", filter: Optional[dict], projection: Optional[dict]):
+        self.collection = collection
+        self.filter = filter or {}
+        self.projection = projection
+        self._batch_size = 101
+
+    def batch_size(self, batch_size: int) -> "StandInCursor":
+        self._batch_size = batch_size
+        return self
+
+    def sort(self, key, direction: int = 1) -> "StandInCursor":
+        if key != "_id" or direction != 1:
+            raise NotImplementedError("Only ascending _id order is supported")
+        return self  # documents are kept in _id order
+
+    def _project(self, document: dict) -> dict:
+        if not self.projection:
+            return document
+        included = {name for name, keep in self.projection.items() if keep and name != "_id"}
+        projected = {name: document[name] for name in included if name in document}
+        if self.projection.get("_id", 1):
+            projected["_id"] = document["_id"]
+        return projected
+
+    def _range(self) -> range:
+        ids = self.collection._ids
+        start, stop = 0, len(ids)
+        condition = self.filter.get("_id", {})
+        unsupported = set(self.filter) - {"_id"} or set(condition) - {"$gt", "$gte", "$lt", "$lte"}
+        if unsupported:
+            raise NotImplementedError(f"Unsupported filter {self.filter}")
+        if "$gte" in condition:
+            start = max(start, bisect.bisect_left(ids, condition["$gte"]))
+        if "$gt" in condition:
+            start = max(start, bisect.bisect_right(ids, condition["$gt"]))
+        if "$lt" in condition:
+            stop = min(stop, bisect.bisect_left(ids, condition["$lt"]))
+        if "$lte" in condition:
+            stop = min(stop, bisect.bisect_right(ids, condition["$lte"]))
+        return range(start, max(start, stop))
+
+    def __iter__(self) -> Iterator[dict]:
+        rows = self._range()
+        blobs = self.collection._blobs
+        link = self.collection.link
+        for start in range(rows.start, rows.stop, self._batch_size):
+            reply = b"".join(blobs[start:min(start + self._batch_size, rows.stop)])
+            link.transfer(len(reply))
+            for document in bson.decode_all(reply):
+                yield self._project(document)
+
+
+class Link:
+    """Emulated network cost of one cursor reply."""
+
+    def __init__(self, round_trip_seconds: float = 0.0, cursor_bytes_per_second: Optional[float] = None):
+        self.round_trip_seconds = round_trip_seconds
+        self.cursor_bytes_per_second = cursor_bytes_per_second
+
+    def transfer(self, n_bytes: int) -> None:
+        delay = self.round_trip_seconds
+        if self.cursor_bytes_per_second:
+            delay += n_bytes / self.cursor_bytes_per_second
+        if delay:
+            time.sleep(delay)
+
+
+class StandInCollection:
+    def __init__(self, link: Optional[Link] = None):
+        self.link = link or Link()
+        self._ids: List[bson.ObjectId] = []
+        self._blobs: List[bytes] = []
+
+    def insert_many(self, documents) -> None:
+        for document in documents:
+            document = dict(document)
+            document.setdefault("_id", bson.ObjectId())
+            # ObjectIds are generated increasing, so appending keeps _id order
+            self._ids.append(document["_id"])
+            self._blobs.append(bson.encode(document))
+
+    def find(self, filter: Optional[dict] = None, projection: Optional[dict] = None) -> StandInCursor:
+        return StandInCursor(self, filter, projection)
+
+    def find_one(self, filter: Optional[dict] = None, projection: Optional[dict] = None,
+                 sort: Optional[list] = None) -> Optional[dict]:
+        if sort not in (None, [("_id", 1)], [("_id", -1)]):
+            raise NotImplementedError("Only sorting by _id is supported")
+        cursor = self.find(filter, projection)
+        rows = cursor._range()
+        if not rows:
+            return None
+        blob = self._blobs[rows[-1] if sort == [("_id", -1)] else rows[0]]
+        self.link.transfer(len(blob))
+        return cursor._project(bson.decode(blob))
+
+    def estimated_document_count(self) -> int:
+        return len(self._ids)
+
+    def count_documents(self, filter: dict) -> int:
+        return len(self.find(filter)._range())
+
+    def aggregate(self, pipeline: List[dict]) -> List[dict]:
+        """Only ``[{"$sample": {"size": n}}, {"$project": {"_id": 0, <name>: "$_id"}}]``."""
+        if len(pipeline) != 2 or "$sample" not in pipeline[0] or "$project" not in pipeline[1]:
+            raise NotImplementedError(f"Unsupported pipeline {pipeline}")
+        fields = {name: value for name, value in pipeline[1]["$project"].items() if value == "$_id"}
+        if len(fields) != 1:
+            raise NotImplementedError("Only projecting _id is supported after $sample")
+        name = next(iter(fields))
+        sample = random.sample(self._ids, min(pipeline[0]["$sample"]["size"], len(self._ids)))
+        self.link.transfer(len(sample) * 32)
+        return [{name: value} for value in sample]
+
+
+class StandInDatabase(dict):
+    def __init__(self, link: Link):
+        super().__init__()
+        self.link = link
+
+    def __missing__(self, name: str) -> StandInCollection:
+        self[name] = StandInCollection(self.link)
+        return self[name]
+
+
+class StandInMongoClient(dict):
+    """``client[database][collection]``; assign to ``MongoDBClient.client`` to route the app to it."""
+
+    def __init__(self, round_trip_seconds: float = 0.0, cursor_bytes_per_second: Optional[float] = None):
+        super().__init__()
+        self.link = Link(round_trip_seconds, cursor_bytes_per_second)
+
+    def __missing__(self, name: str) -> StandInDatabase:
+        self[name] = StandInDatabase(self.link)
+        return self[name]
+
+
+def load_collection(client: StandInMongoClient, database: str, collection: str, frame, chunk_rows: int = 100_000):
+    """Insert a DataFrame's rows as documents, a chunk at a time."""
+    target = client[database][collection]
+    for start in range(0, len(frame), chunk_rows):
+        target.insert_many(frame.iloc[start:start + chunk_rows].to_dict("records"))
+    return target
@@ -0,0 +1,81 @@
+"""Start ``app:app`` under uvicorn in a subprocess for the HTTP benchmarks."""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def http_status(url: str, payload: Optional[list] = None, timeout: float = 30.0) -> Tuple[int, bytes]:
+    """GET ``url`` (or POST ``payload`` as JSON) and return the status code and body."""
+    data = None if payload is None else json.dumps(payload).encode()
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def start_server(artifact_base: str, workers: int = 1, env: Optional[dict] = None) -> Tuple[subprocess.Popen, str]:
+    """Spawn uvicorn serving the artifacts under ``artifact_base``; returns the process and its base URL."""
+    port = free_port()
+    command = [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+               "--log-level", "warning"]
+    if workers > 1:
+        command += ["--workers", str(workers)]
+    server = subprocess.Popen(
+        command, cwd=ROOT, env=dict(os.environ, ARTIFACT_DIR=artifact_base, **(env or {})),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return server, f"http://127.0.0.1:{port}"
+
+
+def wait_until_ready(server: subprocess.Popen, base_url: str, timeout: float = 120.0) -> dict:
+    """Poll /ready until it answers 200; returns its payload."""
+    started = time.perf_counter()
+    while True:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        if time.perf_counter() - started > timeout:
+            raise TimeoutError("server did not become ready")
+        try:
+            status, body = http_status(f"{base_url}/ready", timeout=1.0)
+            if status == 200:
+                return json.loads(body)
+        except OSError:
+            pass
+        time.sleep(0.02)
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+@contextmanager
+def running_server(artifact_base: str, workers: int = 1, env: Optional[dict] = None) -> Iterator[str]:
+    """Run uvicorn for the duration of the block and yield its base URL once /ready is 200."""
+    server, base_url = start_server(artifact_base, workers, env)
+    try:
+        wait_until_ready(server, base_url)
+        yield base_url
+    finally:
+        stop_server(server)
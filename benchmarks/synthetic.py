@@ -0,0 +1,125 @@
+"""Synthetic model artifacts so benchmarks run offline, without MongoDB or a training run."""
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from src.constants import (
+    ARTIFACT_TIMESTAMP_FORMAT,
+    DATA_TRANSFORMATION_PREPROCESSING_KERNEL_NAME,
+    MODEL_TRAINER_COMPILED_FOREST_NAME,
+    MODEL_TRAINER_SERVING_MODEL_DIR,
+)
+from src.entity.compiled_forest import CompiledForest
+from src.entity.estimator import EXPECTED_COLUMNS, MyModel
+from src.entity.fused_preprocessor import FusedPreprocessor
+from src.pipline.prediction_pipeline import synthetic_raw_frame
+from src.utils.main_utils import save_object
+
+
+def make_feature_frame(n_rows: int, seed: int = 7) -> pd.DataFrame:
+    """Random rows in the encoded EXPECTED_COLUMNS layout."""
+    rng = np.random.default_rng(seed)
+    vehicle_age = rng.integers(0, 3, n_rows)
+    return pd.DataFrame({
+        "Gender": rng.integers(0, 2, n_rows),
+        "Age": rng.integers(20, 80, n_rows),
+        "Driving_License": rng.integers(0, 2, n_rows),
+        "Region_Code": rng.integers(0, 52, n_rows).astype(float),
+        "Previously_Insured": rng.integers(0, 2, n_rows),
+        "Annual_Premium": rng.uniform(2630, 100000, n_rows).round(1),
+        "Policy_Sales_Channel": rng.integers(1, 160, n_rows).astype(float),
+        "Vintage": rng.integers(10, 300, n_rows),
+        "Vehicle_Age_lt_1_Year": (vehicle_age == 0).astype(int),
+        "Vehicle_Age_gt_2_Years": (vehicle_age == 2).astype(int),
+        "Vehicle_Damage_Yes": rng.integers(0, 2, n_rows),
+    }, columns=EXPECTED_COLUMNS)
+
+
+def make_synthetic_model(n_rows: int = 5_000, n_estimators: int = 100, max_depth: int = 12, seed: int = 7,
+                         noise: float = 0.1, class_weight=None) -> MyModel:
+    """
+    A MyModel with DataTransformation's preprocessing layout; the defaults give a forest of
+    production-like size. ``noise`` is the share of labels flipped away from the learnable signal.
+    """
+    features = make_feature_frame(n_rows, seed)
+    rng = np.random.default_rng(seed + 1)
+    signal = (features["Vehicle_Damage_Yes"] == 1) & (features["Previously_Insured"] == 0)
+    target = (signal ^ (rng.random(n_rows) < noise)).astype(int)
+    preprocessor = Pipeline(steps=[("Preprocessor", ColumnTransformer(
+        transformers=[
+            ("StandardScaler", StandardScaler(), ["Age", "Vintage"]),
+            ("MinMaxScaler", MinMaxScaler(), ["Annual_Premium"]),
+        ],
+        remainder="passthrough",
+    ))])
+    transformed = preprocessor.fit_transform(features)
+    forest = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=seed,
+                                    class_weight=class_weight, n_jobs=-1)
+    forest.fit(transformed, target.to_numpy(dtype=float))
+    forest.n_jobs = None  # ModelTrainer's forest predicts single-threaded; match it
+    return MyModel(preprocessing_object=preprocessor, trained_model_object=forest)
+
+
+def write_synthetic_artifact(base_dir: str, model: MyModel = None, serving_exports: bool = True,
+                             serving_model: bool = True) -> str:
+    """
+    Write a synthetic model in the training pipeline's artifact layout; returns the run directory.
+    With ``serving_exports`` the compiled forest and fused preprocessing kernel are written too,
+    and with ``serving_model`` also the memory-mappable serving directory, as the training
+    components do.
+    """
+    model = make_synthetic_model() if model is None else model
+    artifact_dir = os.path.join(base_dir, datetime.now().strftime(ARTIFACT_TIMESTAMP_FORMAT))
+    model_dir = os.path.join(artifact_dir, "model_trainer", "trained_model")
+    transform_dir = os.path.join(artifact_dir, "data_transformation", "transformed_object")
+    save_object(os.path.join(model_dir, "model.pkl"), model)
+    save_object(os.path.join(transform_dir, "preprocessing.pkl"), model.preprocessing_object)
+    if serving_exports:
+        compiled_forest = CompiledForest.from_sklearn(model.trained_model_object)
+        compiled_forest.save(os.path.join(model_dir, MODEL_TRAINER_COMPILED_FOREST_NAME))
+        kernel = FusedPreprocessor.from_pipeline(model.preprocessing_object, input_columns=EXPECTED_COLUMNS)
+        kernel.save(os.path.join(transform_dir, DATA_TRANSFORMATION_PREPROCESSING_KERNEL_NAME))
+        if serving_model:
+            serving = MyModel(preprocessing_object=None, trained_model_object=None)
+            serving.compiled_forest = compiled_forest
+            serving.fused_preprocessor = kernel
+            serving.save_serving_model(os.path.join(model_dir, MODEL_TRAINER_SERVING_MODEL_DIR))
+    return artifact_dir
+
+
+def make_raw_training_frame(n_rows: int, seed: int = 7) -> pd.DataFrame:
+    """
+    Random rows in the MongoDB/feature-store schema (config/schema.yaml columns),
+    with a learnable, imbalanced ``Response`` like the real book. Vectorized, so millions of
+    rows build in seconds.
+    """
+    rng = np.random.default_rng(seed)
+    previously_insured = rng.integers(0, 2, n_rows)
+    vehicle_damage = rng.random(n_rows) < 0.5
+    age = rng.integers(20, 85, n_rows)
+    response_probability = np.where((previously_insured == 0) & vehicle_damage, 0.3, 0.02) + (age < 30) * 0.02
+    return pd.DataFrame({
+        "id": np.arange(1, n_rows + 1),
+        "Gender": np.where(rng.random(n_rows) < 0.54, "Male", "Female"),
+        "Age": age,
+        "Driving_License": (rng.random(n_rows) < 0.998).astype(int),
+        "Region_Code": rng.integers(0, 53, n_rows).astype(float),
+        "Previously_Insured": previously_insured,
+        "Vehicle_Age": np.array(["< 1 Year", "1-2 Year", "> 2 Years"])[rng.choice(3, n_rows, p=[0.43, 0.53, 0.04])],
+        "Vehicle_Damage": np.where(vehicle_damage, "Yes", "No"),
+        "Annual_Premium": rng.uniform(2630, 100000, n_rows).round(1),
+        "Policy_Sales_Channel": rng.integers(1, 164, n_rows).astype(float),
+        "Vintage": rng.integers(10, 300, n_rows),
+        "Response": (rng.random(n_rows) < response_probability).astype(int),
+    })
+
+
+def raw_records(n_rows: int) -> list:
+    """Raw-schema request records, as posted to /predict/batch."""
+    return synthetic_raw_frame(n_rows).to_dict("records")
@@ -0,0 +1,275 @@
+"""
+Scaling benchmark for the TrainPipeline stages: wall time, peak RSS and output size of each
+stage on synthetic datasets of increasing size, plus a scaling plot per stage.
+
+Every (stage, size) pair runs in a fresh subprocess so peak RSS belongs to that stage alone.
+MongoDB is replaced by the in-process stand-in in benchmarks/mongo_standin.py, so nothing
+leaves the machine. Inputs a stage needs (train/test splits, transformed arrays) are prepared in the
+same subprocess before the clock starts. Once a stage fails or times out at some size, larger sizes are skipped for it.
+
+    python -m benchmarks.training_stages --sizes 100000 1000000 5000000 --output stages.json --plot stages.png
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.server import ROOT
+
+STAGES = ("mongo_export", "ingestion_write", "data_validation", "data_transformation", "model_trainer")
+DEFAULT_SIZES = (100_000, 1_000_000, 5_000_000)
+
+
+class RssSampler:
+    """Samples this process's resident set size on a background thread to find the peak of one block."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.baseline = self.peak = self._rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _rss() -> int:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            # No procfs: fall back to the process high-water mark (kB on Linux, bytes on macOS)
+            scale = 1 if sys.platform == "darwin" else 1024
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._rss())
+
+
+def _file_sizes(paths: Dict[str, str]) -> Dict[str, int]:
+    return {name: os.path.getsize(path) for name, path in paths.items() if os.path.exists(path)}
+
+
+def _write_splits(rows: int):
+    """Untimed setup shared by later stages: raw frame -> feature store-like train/test splits."""
+    from benchmarks.synthetic import make_raw_training_frame
+    from src.components.data_ingestion import DataIngestion
+    from src.entity.artifact_entity import DataIngestionArtifact
+
+    ingestion = DataIngestion()
+    ingestion.split_data_as_train_test(make_raw_training_frame(rows))
+    config = ingestion.data_ingestion_config
+    return DataIngestionArtifact(trained_file_path=config.training_file_path, test_file_path=config.testing_file_path)
+
+
+def prepare_stage(stage: str, rows: int) -> Tuple[Callable[[], object], Callable[[object], Dict[str, int]]]:
+    """Build the stage's inputs; returns the timed call and a function measuring its outputs."""
+    from benchmarks.synthetic import make_raw_training_frame
+
+    if stage == "mongo_export":
+        from benchmarks.mongo_standin import StandInMongoClient, load_collection
+        from src.configuration.mongo_db_connection import MongoDBClient
+        from src.constants import DATA_INGESTION_COLLECTION_NAME, DATABASE_NAME
+        from src.data_access.proj1_data import Proj1Data
+
+        client = StandInMongoClient()
+        load_collection(client, DATABASE_NAME, DATA_INGESTION_COLLECTION_NAME, make_raw_training_frame(rows))
+        # MongoDBClient shares one class-level client; point it at the stand-in
+        MongoDBClient.client = client
+        return (lambda: Proj1Data().export_collection_as_dataframe(DATA_INGESTION_COLLECTION_NAME),
+                lambda df: {"dataframe_bytes": int(df.memory_usage(deep=True).sum())})
+
+    if stage == "ingestion_write":
+        from src.components.data_ingestion import DataIngestion
+        from src.utils.main_utils import save_dataframe
+
+        ingestion = DataIngestion()
+        config = ingestion.data_ingestion_config
+        frame = make_raw_training_frame(rows)
+
+        def write_artifacts():
+            # export_data_into_feature_store's full-export write, then the train/test split and writes
+            save_dataframe(config.feature_store_file_path, frame)
+            ingestion.split_data_as_train_test(frame)
+
+        return write_artifacts, lambda _: _file_sizes({
+            "feature_store": config.feature_store_file_path,
+            "train": config.training_file_path,
+            "test": config.testing_file_path,
+        })
+
+    if stage == "data_validation":
+        from src.components.data_validation import DataValidation
+        from src.entity.config_entity import DataValidationConfig
+
+        validation = DataValidation(_write_splits(rows), DataValidationConfig())
+        return validation.initiate_data_validation, lambda artifact: _file_sizes(
+            {"report": artifact.validation_report_file_path}
+        )
+
+    if stage == "data_transformation":
+        from src.components.data_transformation import DataTransformation
+        from src.entity.artifact_entity import DataValidationArtifact
+        from src.entity.config_entity import DataTransformationConfig
+
+        transformation = DataTransformation(
+            _write_splits(rows),
+            DataTransformationConfig(),
+            DataValidationArtifact(validation_status=True, message="", validation_report_file_path=""),
+        )
+        return transformation.initiate_data_transformation, lambda artifact: _file_sizes({
+            "preprocessor": artifact.transformed_object_file_path,
+            "train_npy": artifact.transformed_train_file_path,
+            "test_npy": artifact.transformed_test_file_path,
+        })
+
+    if stage == "model_trainer":
+        import numpy as np
+
+        from src.components.data_transformation import DataTransformation
+        from src.components.model_trainer import ModelTrainer
+        from src.entity.artifact_entity import DataTransformationArtifact
+        from src.entity.config_entity import DataTransformationConfig, ModelTrainerConfig
+        from src.pipline.prediction_pipeline import encode_vehicle_dataframe
+        from src.utils.main_utils import save_numpy_array_data, save_object
+
+        # Transformed arrays without SMOTEENN, so training can be measured at sizes the resampler cannot reach
+        transform_config = DataTransformationConfig()
+        frame = make_raw_training_frame(rows)
+        features = encode_vehicle_dataframe(frame)
+        # Only the preprocessing Pipeline is needed, which does not read the other artifacts
+        pipeline = DataTransformation(None, transform_config, None).get_data_transformer_object()
+        split = int(rows * 0.75)
+        train = np.c_[pipeline.fit_transform(features.iloc[:split]), frame["Response"].to_numpy()[:split]]
+        test = np.c_[pipeline.transform(features.iloc[split:]), frame["Response"].to_numpy()[split:]]
+        save_object(transform_config.transformed_object_file_path, pipeline)
+        save_numpy_array_data(transform_config.transformed_train_file_path, train)
+        save_numpy_array_data(transform_config.transformed_test_file_path, test)
+        del frame, features, train, test
+
+        trainer = ModelTrainer(
+            DataTransformationArtifact(
+                transformed_object_file_path=transform_config.transformed_object_file_path,
+                transformed_train_file_path=transform_config.transformed_train_file_path,
+                transformed_test_file_path=transform_config.transformed_test_file_path,
+            ),
+            ModelTrainerConfig(),
+        )
+        return trainer.initiate_model_trainer, lambda artifact: _file_sizes({"model": artifact.trained_model_file_path})
+
+    raise ValueError(f"Unknown stage {stage!r}; choose from {STAGES}")
+
+
+def run_stage(stage: str, rows: int) -> dict:
+    """Child-process entry point: prepare inputs, then time one stage and sample its memory."""
+    timed_call, measure_outputs = prepare_stage(stage, rows)
+    with RssSampler() as sampler:
+        started = time.perf_counter()
+        result = timed_call()
+        seconds = time.perf_counter() - started
+    return {
+        "stage": stage,
+        "rows": rows,
+        "status": "ok",
+        "seconds": round(seconds, 3),
+        "peak_rss_mb": round(sampler.peak / 2**20, 1),
+        "peak_rss_delta_mb": round((sampler.peak - sampler.baseline) / 2**20, 1),
+        "output_bytes": measure_outputs(result),
+    }
+
+
+def measure(stage: str, rows: int, timeout: float) -> dict:
+    """Run one (stage, size) pair in a fresh interpreter with its own artifact directory."""
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        command = [sys.executable, "-m", "benchmarks.training_stages", "--run-stage", stage, "--rows", str(rows)]
+        try:
+            completed = subprocess.run(
+                command, cwd=ROOT, env=dict(os.environ, ARTIFACT_DIR=artifact_dir),
+                capture_output=True, text=True, timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return {"stage": stage, "rows": rows, "status": "timeout", "timeout_seconds": timeout}
+    if completed.returncode != 0:
+        return {"stage": stage, "rows": rows, "status": "failed", "returncode": completed.returncode,
+                "error": completed.stderr.strip().splitlines()[-1:] or [""]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def plot(results: List[dict], file_path: str) -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    figure, (time_axis, memory_axis) = plt.subplots(1, 2, figsize=(12, 5))
+    for stage in STAGES:
+        points = sorted((r["rows"], r["seconds"], r["peak_rss_mb"]) for r in results
+                        if r["stage"] == stage and r["status"] == "ok")
+        if not points:
+            continue
+        rows, seconds, memory = zip(*points)
+        time_axis.plot(rows, seconds, marker="o", label=stage)
+        memory_axis.plot(rows, memory, marker="o", label=stage)
+    for axis, label in ((time_axis, "wall time (s)"), (memory_axis, "peak RSS (MB)")):
+        axis.set_xscale("log")
+        axis.set_yscale("log")
+        axis.set_xlabel("rows")
+        axis.set_ylabel(label)
+        axis.grid(True, which="both", alpha=0.3)
+    time_axis.legend()
+    figure.suptitle("TrainPipeline stage scaling")
+    figure.tight_layout()
+    figure.savefig(file_path, dpi=120)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=STAGES)
+    parser.add_argument("--timeout", type=float, default=3600.0, help="Seconds before a stage counts as broken")
+    parser.add_argument("--output", help="Write the JSON results here")
+    parser.add_argument("--plot", help="Write a PNG scaling plot here")
+    parser.add_argument("--run-stage", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--rows", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_stage:
+        print(json.dumps(run_stage(args.run_stage, args.rows)))
+        return 0
+
+    results = []
+    for stage in args.stages:
+        for rows in sorted(args.sizes):
+            result = measure(stage, rows, args.timeout)
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+            if result["status"] != "ok":
+                break
+
+    report = {"sizes": sorted(args.sizes), "results": results}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if args.plot:
+        plot(results, args.plot)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Per-worker memory of ``uvicorn --workers N`` as N grows, serving either the pickled model or the
+memory-mapped serving model. With the memory-mapped model, per-worker private (dirty) memory
+should stay flat as workers are added and the model's pages are shared across workers.
+
+    python -m benchmarks.worker_memory --workers 1 2 4
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.server import start_server, stop_server, wait_until_ready
+from benchmarks.synthetic import make_synthetic_model, write_synthetic_artifact
+from src.utils.process_memory import process_memory
+
+
+def measure_workers(artifact_base: str, workers: int, timeout: float = 180.0) -> dict:
+    """Start uvicorn with ``workers`` processes, wait until every worker reported ready, read their memory."""
+    server, base_url = start_server(artifact_base, workers=workers)
+    try:
+        pids = set()
+        started = time.perf_counter()
+        while len(pids) < workers:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"only {len(pids)} of {workers} workers became ready")
+            # Each new connection may land on any worker; collect pids until all have answered
+            pids.add(wait_until_ready(server, base_url, timeout)["pid"])
+        memory = [process_memory(pid) for pid in sorted(pids)]
+        if not all(memory):
+            raise RuntimeError("/proc/<pid>/smaps_rollup is not available on this host")
+        return {
+            "workers": workers,
+            "private_dirty_mb_per_worker": round(statistics.mean(m["private_dirty_bytes"] for m in memory) / 2**20, 2),
+            "private_mb_per_worker": round(statistics.mean(m["private_bytes"] for m in memory) / 2**20, 2),
+            "pss_mb_total": round(sum(m["pss_bytes"] for m in memory) / 2**20, 2),
+            "rss_mb_per_worker": round(statistics.mean(m["rss_bytes"] for m in memory) / 2**20, 2),
+        }
+    finally:
+        stop_server(server)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--max-depth", type=int, default=14)
+    parser.add_argument("--rows", type=int, default=50_000, help="Training rows for the synthetic model")
+    args = parser.parse_args(argv)
+
+    model = make_synthetic_model(n_rows=args.rows, n_estimators=args.trees, max_depth=args.max_depth)
+    report = {}
+    for mode, serving_model in (("pickle", False), ("mmap", True)):
+        with tempfile.TemporaryDirectory() as artifact_base:
+            write_synthetic_artifact(artifact_base, model, serving_model=serving_model)
+            report[mode] = [measure_workers(artifact_base, workers) for workers in args.workers]
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
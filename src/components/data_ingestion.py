@@ -9,6 +9,9 @@ from src.entity.artifact_entity import DataIngestionArtifact
 from src.exception import MyException
 from src.logger import logging
 from src.data_access.proj1_data import Proj1Data
+from src.data_access.feature_store import FeatureStore
+from src.constants import DATA_INGESTION_DEDUPLICATION_KEY, DATA_INGESTION_MANIFEST_FILE_NAME
+from src.utils.main_utils import save_dataframe
 
 class DataIngestion:
     def __init__(self,data_ingestion_config:DataIngestionConfig=DataIngestionConfig()):
@@ -24,22 +27,61 @@ class DataIngestion:
     def export_data_into_feature_store(self)->DataFrame:
         """
         Method Name :   export_data_into_feature_store
-        Description :   This method exports data from mongodb to csv file
+        Description :   This method exports data from mongodb to a parquet file. In incremental mode only the
+                        documents past the stored watermark are fetched and appended to the shared
+                        feature store, and the whole store is returned.
         
         Output      :   data is returned as artifact of data ingestion components
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
+            if self.data_ingestion_config.incremental:
+                return self.export_increment_into_feature_store()
             logging.info(f"Exporting data from mongodb")
             my_data = Proj1Data()
             dataframe = my_data.export_collection_as_dataframe(collection_name=
                                                                    self.data_ingestion_config.collection_name)
             logging.info(f"Shape of dataframe: {dataframe.shape}")
             feature_store_file_path  = self.data_ingestion_config.feature_store_file_path
-            dir_path = os.path.dirname(feature_store_file_path)
-            os.makedirs(dir_path,exist_ok=True)
             logging.info(f"Saving exported data into feature store file path: {feature_store_file_path}")
-            dataframe.to_csv(feature_store_file_path,index=False,header=True)
+            save_dataframe(feature_store_file_path, dataframe)
+            return dataframe
+
+        except Exception as e:
+            raise MyException(e,sys)
+
+    def export_increment_into_feature_store(self)->DataFrame:
+        """
+        Method Name :   export_increment_into_feature_store
+        Description :   This method fetches the documents added since the feature store's watermark,
+                        appends them as a new part and advances the watermark. The run writes
+                        manifest.json (watermark range and the parts it read) next to where the
+                        full export would go, so its input can be rebuilt from the store.
+        
+        Output      :   all rows of the feature store are returned
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_ingestion_config
+            store = FeatureStore(config.feature_store_dir)
+            watermark = store.watermark(config.watermark_field)
+            if config.watermark_field == "_id":
+                logging.warning("Incremental ingestion on _id misses documents whose client-generated ObjectId "
+                                "sorts below the watermark; set DATA_INGESTION_WATERMARK_FIELD to an insert timestamp "
+                                "if clients or imports create ids")
+            logging.info(f"Exporting documents after {config.watermark_field} {watermark} from mongodb")
+            my_data = Proj1Data(partition_key=config.watermark_field)
+            increment, new_watermark = my_data.export_new_documents(config.collection_name, watermark)
+            logging.info(f"Shape of new data: {increment.shape}")
+            store.append(increment, new_watermark, config.watermark_field)
+            manifest = store.write_manifest(
+                os.path.join(os.path.dirname(config.feature_store_file_path), DATA_INGESTION_MANIFEST_FILE_NAME), watermark
+            )
+
+            # Documents watermarked on an update timestamp come back when they change; keep the latest
+            deduplicate_on = None if config.watermark_field == "_id" else DATA_INGESTION_DEDUPLICATION_KEY
+            dataframe = store.read(deduplicate_on=deduplicate_on, parts=manifest["parts"])
+            logging.info(f"Shape of feature store: {dataframe.shape}")
             return dataframe
 
         except Exception as e:
@@ -61,12 +103,9 @@ class DataIngestion:
             logging.info(
                 "Exited split_data_as_train_test method of Data_Ingestion class"
             )
-            dir_path = os.path.dirname(self.data_ingestion_config.training_file_path)
-            os.makedirs(dir_path,exist_ok=True)
-            
             logging.info(f"Exporting train and test file path.")
-            train_set.to_csv(self.data_ingestion_config.training_file_path,index=False,header=True)
-            test_set.to_csv(self.data_ingestion_config.testing_file_path,index=False,header=True)
+            save_dataframe(self.data_ingestion_config.training_file_path, train_set)
+            save_dataframe(self.data_ingestion_config.testing_file_path, test_set)
 
             logging.info(f"Exported train and test file path.")
         except Exception as e:
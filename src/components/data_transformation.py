@@ -9,9 +9,10 @@ from sklearn.compose import ColumnTransformer
 from src.constants import TARGET_COLUMN, SCHEMA_FILE_PATH, CURRENT_YEAR
 from src.entity.config_entity import DataTransformationConfig
 from src.entity.artifact_entity import DataTransformationArtifact, DataIngestionArtifact, DataValidationArtifact
+from src.entity.fused_preprocessor import FusedPreprocessor
 from src.exception import MyException
 from src.logger import logging
-from src.utils.main_utils import save_object, save_numpy_array_data, read_yaml_file
+from src.utils.main_utils import load_dataframe, save_object, save_numpy_array_data, read_yaml_file
 
 
 class DataTransformation:
@@ -27,12 +28,18 @@ class DataTransformation:
             raise MyException(e, sys)
 
     @staticmethod
-    def read_data(file_path) -> pd.DataFrame:
+    def read_data(file_path, columns=None) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return load_dataframe(file_path, columns=columns)
         except Exception as e:
             raise MyException(e, sys)
 
+    def _input_columns(self) -> list:
+        """Schema columns except drop_columns, so ids are never read from the split files."""
+        drop_cols = self._schema_config['drop_columns']
+        drop_cols = [drop_cols] if isinstance(drop_cols, str) else drop_cols
+        return [name for column in self._schema_config['columns'] for name in column if name not in drop_cols]
+
     def get_data_transformer_object(self) -> Pipeline:
         """
         Creates and returns a data transformer object for the data, 
@@ -93,12 +100,34 @@ class DataTransformation:
         return df
 
     def _drop_id_column(self, df):
-        """Drop the 'id' column if it exists."""
+        """Drop the schema's drop_columns ('_id' and 'id') that exist."""
         logging.info("Dropping 'id' column")
-        drop_col = self._schema_config['drop_columns']
-        if drop_col in df.columns:
-            df = df.drop(drop_col, axis=1)
-        return df
+        drop_cols = self._schema_config['drop_columns']
+        if isinstance(drop_cols, str):
+            drop_cols = [drop_cols]
+        return df.drop(columns=[col for col in drop_cols if col in df.columns])
+
+    def export_fused_preprocessor(self, preprocessor: Pipeline, input_feature_df: pd.DataFrame,
+                                  expected_arr: np.ndarray) -> None:
+        """
+        Export the fitted preprocessor as a FusedPreprocessor kernel for serving, after confirming it
+        reproduces ``expected_arr`` (the ColumnTransformer output for ``input_feature_df``) exactly.
+        """
+        try:
+            kernel = FusedPreprocessor.from_pipeline(preprocessor, input_columns=list(input_feature_df.columns))
+        except Exception as e:
+            logging.warning(f"Preprocessor cannot be fused, serving will use ColumnTransformer: {e}")
+            return
+
+        try:
+            fused_arr = kernel.transform(input_feature_df.to_numpy(dtype=np.float64))
+            if not np.array_equal(fused_arr, np.asarray(expected_arr, dtype=np.float64)):
+                logging.warning("Fused preprocessing kernel differs from ColumnTransformer output; not exporting it")
+                return
+            kernel.save(self.data_transformation_config.preprocessing_kernel_file_path)
+            logging.info("Fused preprocessing kernel verified on the test set and exported.")
+        except Exception as e:
+            raise MyException(e, sys) from e
 
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         """
@@ -109,14 +138,15 @@ class DataTransformation:
             if not self.data_validation_artifact.validation_status:
                 raise Exception(self.data_validation_artifact.message)
 
-            train_df = self.read_data(file_path=self.data_ingestion_artifact.trained_file_path)
-            test_df = self.read_data(file_path=self.data_ingestion_artifact.test_file_path)
+            columns = self._input_columns()
+            train_df = self.read_data(file_path=self.data_ingestion_artifact.trained_file_path, columns=columns)
+            test_df = self.read_data(file_path=self.data_ingestion_artifact.test_file_path, columns=columns)
             logging.info("Train-Test data loaded")
 
-            input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN], axis=1)
+            input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN])
             target_feature_train_df = train_df[TARGET_COLUMN]
 
-            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
+            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN])
             target_feature_test_df = test_df[TARGET_COLUMN]
             logging.info("Input and Target cols defined for both train and test df.")
 
@@ -161,6 +191,8 @@ class DataTransformation:
             save_numpy_array_data(self.data_transformation_config.transformed_test_file_path, array=test_arr)
             logging.info("Saving transformation object and transformed files.")
 
+            self.export_fused_preprocessor(preprocessor, input_feature_test_df, input_feature_test_arr)
+
             logging.info("Data transformation completed successfully")
             return DataTransformationArtifact(
                 transformed_object_file_path=self.data_transformation_config.transformed_object_file_path,
@@ -4,7 +4,7 @@ from sklearn.metrics import f1_score
 from src.exception import MyException
 from src.constants import TARGET_COLUMN
 from src.logger import logging
-from src.utils.main_utils import load_object
+from src.utils.main_utils import load_dataframe, load_object, schema_column_types
 import sys
 import pandas as pd
 from typing import Optional
@@ -77,9 +77,7 @@ class ModelEvaluation:
     def _drop_id_column(self, df):
         """Drop the 'id' column if it exists."""
         logging.info("Dropping 'id' column")
-        if "_id" in df.columns:
-            df = df.drop("_id", axis=1)
-        return df
+        return df.drop(columns=[col for col in ("_id", "id") if col in df.columns])
 
     def evaluate_model(self) -> EvaluateModelResponse:
         """
@@ -91,7 +89,8 @@ class ModelEvaluation:
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
-            test_df = pd.read_csv(self.data_ingestion_artifact.test_file_path)
+            columns = [name for name in schema_column_types() if name not in ("_id", "id")]
+            test_df = load_dataframe(self.data_ingestion_artifact.test_file_path, columns=columns)
             x, y = test_df.drop(TARGET_COLUMN, axis=1), test_df[TARGET_COLUMN]
 
             logging.info("Test data loaded and now transforming it for prediction...")
@@ -1,16 +1,19 @@
+import os
 import sys
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
 
+from src.constants import DATA_TRANSFORMATION_PREPROCESSING_KERNEL_NAME
 from src.exception import MyException
 from src.logger import logging
 from src.utils.main_utils import load_numpy_array_data, load_object, save_object
 from src.entity.config_entity import ModelTrainerConfig
 from src.entity.artifact_entity import DataTransformationArtifact, ModelTrainerArtifact, ClassificationMetricArtifact
 from src.entity.estimator import MyModel
+from src.entity.compiled_forest import CompiledForest, forest_size_report
 
 class ModelTrainer:
     def __init__(self, data_transformation_artifact: DataTransformationArtifact,
@@ -63,6 +66,58 @@ class ModelTrainer:
         except Exception as e:
             raise MyException(e, sys) from e
 
+    def export_compiled_forest(self, trained_model: object, x_check: np.array) -> Optional[CompiledForest]:
+        """
+        Method Name :   export_compiled_forest
+        Description :   Flattens the fitted forest into compact, narrow-dtype arrays saved next to model.pkl
+                        for serving and logs their size against the pickled forest. The export is skipped if
+                        it does not reproduce sklearn's probabilities exactly on the test set.
+
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            if not isinstance(trained_model, RandomForestClassifier):
+                logging.info("Trained model is not a RandomForestClassifier; skipping compiled forest export")
+                return None
+
+            compiled_forest = CompiledForest.from_sklearn(trained_model)
+            if not np.array_equal(compiled_forest.predict_proba(x_check), trained_model.predict_proba(x_check)):
+                logging.warning("Compiled forest probabilities differ from sklearn; not exporting it")
+                return None
+
+            compiled_forest.save(self.model_trainer_config.compiled_forest_file_path)
+            size_report = forest_size_report(
+                trained_model, compiled_forest, self.model_trainer_config.compiled_forest_file_path
+            )
+            logging.info(f"Compiled forest size report: {size_report}")
+            return compiled_forest
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def export_serving_model(self, compiled_forest: Optional[CompiledForest]) -> None:
+        """
+        Method Name :   export_serving_model
+        Description :   Writes the compiled forest and the fused preprocessing kernel as a directory of
+                        .npy files that serving memory-maps, so uvicorn workers share one copy of the model
+                        instead of each unpickling model.pkl. Skipped unless both were exported.
+
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            kernel_path = os.path.join(
+                os.path.dirname(self.data_transformation_artifact.transformed_object_file_path),
+                DATA_TRANSFORMATION_PREPROCESSING_KERNEL_NAME,
+            )
+            serving_model = MyModel(preprocessing_object=None, trained_model_object=None)
+            if compiled_forest is None or not serving_model.attach_fused_preprocessor(kernel_path):
+                logging.info("Compiled forest or fused preprocessor missing; skipping serving model export")
+                return
+
+            serving_model.compiled_forest = compiled_forest
+            serving_model.save_serving_model(self.model_trainer_config.serving_model_dir)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     def initiate_model_trainer(self) -> ModelTrainerArtifact:
         logging.info("Entered initiate_model_trainer method of ModelTrainer class")
         """
@@ -96,6 +151,9 @@ class ModelTrainer:
             save_object(self.model_trainer_config.trained_model_file_path, my_model)
             logging.info("Saved final model object that includes both preprocessing and the trained model")
 
+            compiled_forest = self.export_compiled_forest(trained_model, x_check=test_arr[:, :-1])
+            self.export_serving_model(compiled_forest)
+
             model_trainer_artifact = ModelTrainerArtifact(
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
                 metric_artifact=metric_artifact,
@@ -1,14 +1,174 @@
+import importlib.util
 import os
 import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
 import pymongo
 import certifi
+from pymongo import monitoring
 
 from src.exception import MyException
 from src.logger import logging
-from src.constants import DATABASE_NAME, MONGODB_URL_KEY
+from src.constants import (
+    DATABASE_NAME,
+    MONGODB_COMPRESSORS,
+    MONGODB_CONNECT_TIMEOUT_MS,
+    MONGODB_MAX_POOL_SIZE,
+    MONGODB_MIN_POOL_SIZE,
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+    MONGODB_SOCKET_TIMEOUT_MS,
+    MONGODB_STANDIN_URL_PREFIX,
+    MONGODB_URL_KEY,
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+)
+
+# Python package each wire compressor needs
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+class PoolCounters(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener counting checkouts and how often they had to wait.
+
+    A checkout "waits" when it starts while all max_pool_size connections to that server are
+    checked out, so it queues until one is returned (or waitQueueTimeoutMS expires, counted
+    as a checkout failure). pymongo publishes these events on the thread doing the checkout.
+    """
+
+    def __init__(self, max_pool_size: int = MONGODB_MAX_POOL_SIZE):
+        self.max_pool_size = max_pool_size
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._in_use: Dict[Tuple, int] = {}
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.waits = 0
+        self.peak_in_use = 0
+        self.checkout_seconds = 0.0
+        self.max_checkout_seconds = 0.0
+
+    def _finish_checkout(self) -> None:
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            seconds = time.perf_counter() - started
+            self.checkout_seconds += seconds
+            self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+            self._local.started = None
+
+    def connection_check_out_started(self, event) -> None:
+        self._local.started = time.perf_counter()
+        with self._lock:
+            if self._in_use.get(event.address, 0) >= self.max_pool_size:
+                self.waits += 1
+
+    def connection_checked_out(self, event) -> None:
+        with self._lock:
+            self.checkouts += 1
+            in_use = self._in_use[event.address] = self._in_use.get(event.address, 0) + 1
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self._finish_checkout()
+
+    def connection_check_out_failed(self, event) -> None:
+        with self._lock:
+            self.checkout_failures += 1
+            self._finish_checkout()
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            self._in_use[event.address] = max(0, self._in_use.get(event.address, 0) - 1)
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            self.connections_closed += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def pool_created(self, event) -> None:
+        pass
 
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        with self._lock:
+            self._in_use.pop(event.address, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_pool_size": self.max_pool_size,
+                "connections_open": self.connections_created - self.connections_closed,
+                "connections_created": self.connections_created,
+                "in_use": sum(self._in_use.values()),
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "checkout_waits": self.waits,
+                "checkout_failures": self.checkout_failures,
+                "checkout_seconds": round(self.checkout_seconds, 6),
+                "max_checkout_seconds": round(self.max_checkout_seconds, 6),
+            }
+
+
+def available_compressors(names: str = MONGODB_COMPRESSORS) -> list:
+    """The comma-separated wire compressors in ``names`` whose Python package is installed, in order."""
+    compressors = []
+    for name in filter(None, (name.strip() for name in names.split(","))):
+        module = COMPRESSOR_MODULES.get(name)
+        if module is not None and importlib.util.find_spec(module) is not None:
+            compressors.append(name)
+        else:
+            logging.info(f"MongoDB wire compressor '{name}' is not available; skipping it")
+    return compressors
+
+
+def create_client(mongo_db_url: Optional[str]) -> Tuple[object, Optional[PoolCounters]]:
+    """
+    Build the process's MongoClient from MONGODB_URL and the MONGODB_* pool settings, with a
+    PoolCounters listener attached. No connection is opened until the first operation.
+    A ``mongomock://`` URL returns an in-process mongomock client (and no counters) instead.
+    """
+    if mongo_db_url is None:
+        raise Exception(f"Environment variable '{MONGODB_URL_KEY}' is not set.")
+    if mongo_db_url.startswith(MONGODB_STANDIN_URL_PREFIX):
+        import mongomock
+
+        logging.info("Using the in-process mongomock stand-in for MongoDB")
+        return mongomock.MongoClient(), None
+
+    counters = PoolCounters(MONGODB_MAX_POOL_SIZE)
+    options = {
+        "maxPoolSize": MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": MONGODB_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGODB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGODB_SOCKET_TIMEOUT_MS or None,
+        "waitQueueTimeoutMS": MONGODB_WAIT_QUEUE_TIMEOUT_MS or None,
+        "event_listeners": [counters],
+        # Defer the monitor threads and sockets to the first operation
+        "connect": False,
+    }
+    compressors = available_compressors(MONGODB_COMPRESSORS)
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    if mongo_db_url.startswith("mongodb+srv://"):
+        options["tlsCAFile"] = certifi.where()
+    client = pymongo.MongoClient(mongo_db_url, **options)
+    logging.info(f"MongoDB client created: maxPoolSize={MONGODB_MAX_POOL_SIZE}, minPoolSize={MONGODB_MIN_POOL_SIZE}, "
+                 f"compressors={compressors or 'none'}")
+    return client, counters
 
-ca = certifi.where()
 
 class MongoDBClient:
     """
@@ -17,7 +177,9 @@ class MongoDBClient:
     Attributes:
     ----------
     client : MongoClient
-        A shared MongoClient instance for the class.
+        A shared MongoClient instance for the class, created on first use and reused by every
+        instance (and so by every Proj1Data and scoring job) in the process. Assigning a client
+        here (mongomock, the benchmark stand-in) routes all of them to it.
     database : Database
         The specific database instance that MongoDBClient connects to.
 
@@ -25,9 +187,35 @@ class MongoDBClient:
     -------
     __init__(database_name: str) -> None
         Initializes the MongoDB connection using the given database name.
+    get_client() -> MongoClient
+        The shared client, created if needed.
     """
 
-    client = None 
+    client = None
+    pool_counters: Optional[PoolCounters] = None
+    # The client this class created and the pid it was created in, to replace it after a fork
+    _owned_client = None
+    _owner_pid: Optional[int] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_client(cls):
+        """
+        Return the process-wide client, creating it on first use. A client inherited through
+        fork() is not reused (its sockets and monitor threads belong to the parent); the child
+        builds its own. Clients assigned from outside are returned as they are.
+        """
+        client = cls.client
+        if client is not None and (client is not cls._owned_client or cls._owner_pid == os.getpid()):
+            return client
+        with cls._lock:
+            if cls.client is not None and cls.client is cls._owned_client and cls._owner_pid != os.getpid():
+                logging.info("MongoDB client was created before fork; creating a new one in this process")
+                cls.client = None
+            if cls.client is None:
+                cls.client, cls.pool_counters = create_client(os.getenv(MONGODB_URL_KEY))
+                cls._owned_client, cls._owner_pid = cls.client, os.getpid()
+            return cls.client
 
     def __init__(self, database_name: str = DATABASE_NAME) -> None:
         """
@@ -44,18 +232,21 @@ class MongoDBClient:
             If there is an issue connecting to MongoDB or if the environment variable for the MongoDB URL is not set.
         """
         try:
-            
-            if MongoDBClient.client is None:
-                mongo_db_url = os.getenv(MONGODB_URL_KEY)
-                
-                if mongo_db_url is None:
-                    raise Exception(f"Environment variable '{MONGODB_URL_KEY}' is not set.")
-                
-
-            self.database = self.client[database_name]  
+            self.client = MongoDBClient.get_client()
+            self.database = self.client[database_name]
             self.database_name = database_name
             logging.info("MongoDB connection successful.")
             
         except Exception as e:
             
-            raise MyException(e, sys)
\ No newline at end of file
+            raise MyException(e, sys)
+
+
+def pool_stats() -> dict:
+    """Connection pool counters of this process's MongoDB client (``client`` is "none" before first use)."""
+    if MongoDBClient.client is None:
+        return {"client": "none"}
+    counters = MongoDBClient.pool_counters
+    if MongoDBClient.client is not MongoDBClient._owned_client or counters is None:
+        return {"client": "stand-in"}
+    return dict(counters.stats(), client="pymongo")
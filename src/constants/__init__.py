@@ -4,9 +4,22 @@ from datetime import date
 DATABASE_NAME = "Proj1"
 COLLECTION_NAME = "Proj1-Data"
 MONGODB_URL_KEY = "MONGODB_URL"
+# MONGODB_URL=mongomock:// runs against an in-process mongomock client (tests, local runs)
+MONGODB_STANDIN_URL_PREFIX = "mongomock://"
+MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+# Preference order; codecs whose Python package is not installed are skipped, "" disables compression
+MONGODB_COMPRESSORS: str = os.getenv("MONGODB_COMPRESSORS", "zstd,snappy,zlib")
+MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGODB_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "10000"))
+# 0 means no timeout (long exports hold a socket for a while)
+MONGODB_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "0"))
+MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "0"))
 
 PIPELINE_NAME: str = ""
-ARTIFACT_DIR: str = "artifact"
+ARTIFACT_DIR: str = os.getenv("ARTIFACT_DIR", "artifact")
+ARTIFACT_INDEX_FILE_NAME: str = "index.json"
+ARTIFACT_TIMESTAMP_FORMAT: str = "%m_%d_%Y_%H_%M_%S"
 
 MODEL_FILE_NAME = "model.pkl"
 
@@ -14,9 +27,10 @@ TARGET_COLUMN = "Response"
 CURRENT_YEAR = date.today().year
 PREPROCSSING_OBJECT_FILE_NAME = "preprocessing.pkl"
 
-FILE_NAME: str = "data.csv"
-TRAIN_FILE_NAME: str = "train.csv"
-TEST_FILE_NAME: str = "test.csv"
+FILE_NAME: str = "data.parquet"
+TRAIN_FILE_NAME: str = "train.parquet"
+TEST_FILE_NAME: str = "test.parquet"
+ARTIFACT_PARQUET_COMPRESSION: str = "zstd"
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 
 
@@ -32,6 +46,19 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.25
+DATA_INGESTION_MONGO_BATCH_SIZE: int = int(os.getenv("DATA_INGESTION_MONGO_BATCH_SIZE", "10000"))
+DATA_INGESTION_EXPORT_CHUNK_ROWS: int = 100_000
+DATA_INGESTION_EXPORT_WORKERS: int = int(os.getenv("DATA_INGESTION_EXPORT_WORKERS", "4"))
+DATA_INGESTION_EXPORT_PARTITION_KEY: str = os.getenv("DATA_INGESTION_EXPORT_PARTITION_KEY", "_id")
+DATA_INGESTION_EXPORT_SAMPLES_PER_PARTITION: int = 100
+# Opt-in: an _id watermark misses documents whose client-generated ObjectId sorts below it
+DATA_INGESTION_INCREMENTAL: bool = os.getenv("DATA_INGESTION_INCREMENTAL", "0") == "1"
+DATA_INGESTION_WATERMARK_FIELD: str = os.getenv("DATA_INGESTION_WATERMARK_FIELD", "_id")
+DATA_INGESTION_WATERMARK_FILE_NAME: str = "watermark.json"
+DATA_INGESTION_MANIFEST_FILE_NAME: str = "manifest.json"
+DATA_INGESTION_DEDUPLICATION_KEY: str = "id"
+# Shared by all runs, next to (not inside) the timestamped run directories
+DATA_INGESTION_FEATURE_STORE_ROOT: str = os.path.join(ARTIFACT_DIR, DATA_INGESTION_FEATURE_STORE_DIR)
 
 """
 Data Validation realted contant start with DATA_VALIDATION VAR NAME
@@ -45,6 +72,7 @@ Data Transformation ralated constant start with DATA_TRANSFORMATION VAR NAME
 DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
 DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
 DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR: str = "transformed_object"
+DATA_TRANSFORMATION_PREPROCESSING_KERNEL_NAME: str = "preprocessing_kernel.npz"
 
 """
 MODEL TRAINER related constant start with MODEL_TRAINER var name
@@ -52,6 +80,10 @@ MODEL TRAINER related constant start with MODEL_TRAINER var name
 MODEL_TRAINER_DIR_NAME: str = "model_trainer"
 MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
+MODEL_TRAINER_COMPILED_FOREST_NAME: str = "compiled_forest.npz"
+MODEL_TRAINER_SERVING_MODEL_DIR: str = "serving_model"
+MODEL_TRAINER_SERVING_MODEL_MANIFEST_NAME: str = "manifest.json"
+MODEL_DECISION_THRESHOLD: float = 0.5
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_MODEL_CONFIG_FILE_PATH: str = os.path.join("config", "model.yaml")
 MODEL_TRAINER_N_ESTIMATORS=200
@@ -69,5 +101,31 @@ MODEL_BUCKET_NAME = "my-model-mlopsproj"
 MODEL_PUSHER_S3_KEY = "model-registry"
 
 
+"""
+Prediction serving related constants
+"""
+MODEL_CACHE_POLL_INTERVAL_SECONDS: float = 30.0
+MICRO_BATCH_MAX_SIZE: int = 256
+MICRO_BATCH_MAX_WAIT_MS: float = 5.0
+INFERENCE_EXECUTOR_KIND: str = os.getenv("INFERENCE_EXECUTOR_KIND", "thread")
+INFERENCE_MAX_WORKERS: int = int(os.getenv("INFERENCE_MAX_WORKERS", "4"))
+INFERENCE_MAX_QUEUE_DEPTH: int = int(os.getenv("INFERENCE_MAX_QUEUE_DEPTH", "64"))
+INFERENCE_RETRY_AFTER_SECONDS: int = 1
+WARM_UP_RETRY_SECONDS: float = float(os.getenv("WARM_UP_RETRY_SECONDS", "30"))
+STREAM_SCORING_CHUNK_ROWS: int = 10_000
+STREAM_SCORING_OVERLOAD_RETRIES: int = 60
+BATCH_SCORING_CHUNK_ROWS: int = 100_000
+BINARY_SCORING_CONTENT_TYPES = ("application/vnd.apache.arrow.stream", "application/x-npy")
+BATCH_SCORING_OUTPUT_FORMATS = ("csv", "parquet")
+MONGO_SCORING_PREDICTIONS_COLLECTION: str = "Proj1-Predictions"
+MONGO_SCORING_CHECKPOINT_COLLECTION: str = "scoring_checkpoints"
+MONGO_SCORING_BATCH_SIZE: int = 5_000
+MONGO_SCORING_WORKERS: int = 4
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "1") != "0"
+TRAINING_JOB_NICENESS: int = int(os.getenv("TRAINING_JOB_NICENESS", "10"))
+TRAINING_JOB_HISTORY: int = 20
+TRAINING_JOB_DIR: str = os.path.join(ARTIFACT_DIR, "training_jobs")
+
+
 APP_HOST = "0.0.0.0"
 APP_PORT = 5000
\ No newline at end of file
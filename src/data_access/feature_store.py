@@ -0,0 +1,139 @@
+import os
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+from bson import json_util
+
+from src.constants import DATA_INGESTION_WATERMARK_FILE_NAME
+from src.data_access.proj1_data import concat_frames
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import load_dataframe, save_dataframe
+
+
+class FeatureStore:
+    """
+    Append-only store of exported rows for one collection, shared by all training runs.
+
+    Each ingestion appends the newly exported rows as one Parquet part file (stores started
+    before Parquet artifacts keep their CSV parts), then records the part and
+    the new watermark in watermark.json. Both are written to a temporary name and renamed into
+    place, and only parts listed in watermark.json are ever read, so a run that dies halfway
+    leaves the store as it was before that run.
+
+    A run only sees documents whose watermark field is above the stored watermark. With the
+    default ``_id`` that is insertion order only for server-generated ObjectIds: ids created on
+    clients with a lagging clock, or imported from older data, can sort below the watermark
+    and are then never exported. Watermark on an insert/update timestamp set by the writer
+    (DATA_INGESTION_WATERMARK_FIELD) when that can happen.
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        self.state_file_path = os.path.join(store_dir, DATA_INGESTION_WATERMARK_FILE_NAME)
+
+    def read_state(self) -> dict:
+        """Contents of watermark.json, or the state of an empty store."""
+        try:
+            if not os.path.exists(self.state_file_path):
+                return {"watermark_field": None, "watermark": None, "rows": 0, "parts": []}
+            with open(self.state_file_path) as state_file:
+                return json_util.loads(state_file.read())
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def watermark(self, watermark_field: str):
+        """
+        Watermark to export after, or None for an empty store. Raises if the store was filled
+        using a different watermark field, whose values would not be comparable.
+        """
+        try:
+            state = self.read_state()
+            if state["parts"] and state["watermark_field"] != watermark_field:
+                raise ValueError(
+                    f"Feature store {self.store_dir} is watermarked on {state['watermark_field']!r}, not "
+                    f"{watermark_field!r}; remove the directory to rebuild it from scratch"
+                )
+            return state["watermark"]
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def part_file_paths(self, parts: Optional[List[str]] = None) -> List[str]:
+        """Paths of the parts listed in watermark.json, or of just ``parts`` (part file names)."""
+        names = [part["file"] for part in self.read_state()["parts"]] if parts is None else parts
+        return [os.path.join(self.store_dir, name) for name in names]
+
+    def append(self, dataframe: pd.DataFrame, watermark, watermark_field: str) -> Optional[str]:
+        """
+        Add ``dataframe`` as a new part and advance the watermark. Returns the part's path, or
+        None (and leaves the store untouched) when the frame is empty.
+        """
+        try:
+            if dataframe.empty:
+                return None
+            state = self.read_state()
+            os.makedirs(self.store_dir, exist_ok=True)
+            part_name = f"part-{len(state['parts']):05d}.parquet"
+            part_file_path = os.path.join(self.store_dir, part_name)
+            tmp_path = f"{part_file_path}.{os.getpid()}.tmp"
+            save_dataframe(tmp_path, dataframe)
+            os.replace(tmp_path, part_file_path)
+
+            now = datetime.now().isoformat()
+            state["parts"].append({"file": part_name, "rows": len(dataframe), "watermark": watermark, "written_at": now})
+            state.update(watermark_field=watermark_field, watermark=watermark,
+                         rows=state["rows"] + len(dataframe), updated_at=now)
+            tmp_path = f"{self.state_file_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as state_file:
+                state_file.write(json_util.dumps(state, indent=2))
+            os.replace(tmp_path, self.state_file_path)
+            logging.info(f"Appended {len(dataframe)} rows to feature store as {part_name}; {state['rows']} rows in total")
+            return part_file_path
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def write_manifest(self, file_path: str, previous_watermark) -> dict:
+        """
+        Record the watermark range a run exported and the parts it consumes in ``file_path``.
+        Parts are never rewritten, so ``read(parts=manifest["parts"])`` rebuilds the run's input
+        for as long as the store is kept.
+        """
+        try:
+            state = self.read_state()
+            manifest = {
+                "store_dir": os.path.abspath(self.store_dir),
+                "watermark_field": state["watermark_field"],
+                "watermark_from": previous_watermark,
+                "watermark_to": state["watermark"],
+                "parts": [part["file"] for part in state["parts"]],
+                "rows": state["rows"],
+            }
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w") as manifest_file:
+                manifest_file.write(json_util.dumps(manifest, indent=2))
+            return manifest
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def read(self, deduplicate_on: Optional[str] = None, columns: Optional[List[str]] = None,
+             parts: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        All stored rows (only ``columns`` if given, only the ``parts`` named if given), oldest part
+        first, with schema column types. With ``deduplicate_on`` only the latest row per value of
+        that column is kept (for stores watermarked on an update timestamp, where a changed
+        document is exported again).
+        """
+        try:
+            if columns is not None and deduplicate_on is not None and deduplicate_on not in columns:
+                columns = [*columns, deduplicate_on]
+            parts = [load_dataframe(file_path, columns=columns) for file_path in self.part_file_paths(parts)]
+            if not parts:
+                raise ValueError(f"Feature store {self.store_dir} is empty")
+            dataframe = concat_frames(parts)
+            if deduplicate_on is not None:
+                dataframe = dataframe.drop_duplicates(subset=deduplicate_on, keep="last", ignore_index=True)
+            return dataframe
+        except Exception as e:
+            raise MyException(e, sys) from e
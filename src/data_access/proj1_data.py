@@ -1,27 +1,199 @@
 import sys
 import pandas as pd
 import numpy as np
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from src.configuration.mongo_db_connection import MongoDBClient
-from src.constants import DATABASE_NAME
+from src.constants import (
+    DATA_INGESTION_EXPORT_CHUNK_ROWS,
+    DATA_INGESTION_EXPORT_PARTITION_KEY,
+    DATA_INGESTION_EXPORT_SAMPLES_PER_PARTITION,
+    DATA_INGESTION_EXPORT_WORKERS,
+    DATA_INGESTION_MONGO_BATCH_SIZE,
+    DATABASE_NAME,
+)
 from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import schema_column_types, schema_int_dtype
+
+MISSING_VALUES = (None, "na", "")
+
+
+class ColumnBuffers:
+    """
+    Typed, growable per-column arrays that documents are appended to in cursor batches.
+
+    Numeric columns are held as float64 (missing and ``"na"`` become NaN) and categorical
+    columns as int16 codes, so memory grows by a few bytes per value instead of by a dict
+    and a string object per document.
+    """
+
+    def __init__(self, column_types: Dict[str, str], capacity: int = 0):
+        self.column_types = column_types
+        self.size = 0
+        self._categories: Dict[str, Dict[object, int]] = {
+            name: {} for name, dtype in column_types.items() if dtype == "category"
+        }
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._allocate(max(capacity, 1))
+
+    def _allocate(self, capacity: int) -> None:
+        for name, dtype in self.column_types.items():
+            array = np.empty(capacity, dtype=np.int16 if dtype == "category" else np.float64)
+            old = self._arrays.get(name)
+            if old is not None:
+                array[:self.size] = old[:self.size]
+            self._arrays[name] = array
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, documents: List[dict]) -> None:
+        count = len(documents)
+        if self.size + count > len(next(iter(self._arrays.values()))):
+            self._allocate(max(2 * (self.size + count), 1024))
+        end = self.size + count
+        for name, dtype in self.column_types.items():
+            values = [document.get(name) for document in documents]
+            target = self._arrays[name][self.size:end]
+            if dtype == "category":
+                target[:] = self._category_codes(name, values)
+            else:
+                try:
+                    # Numbers and None (-> NaN) convert in one C loop; strings like "na" take the slow path
+                    target[:] = np.array(values, dtype=np.float64)
+                except (TypeError, ValueError):
+                    target[:] = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(
+                        dtype=np.float64, na_value=np.nan
+                    )
+        self.size = end
+
+    def _category_codes(self, name: str, values: list) -> list:
+        lookup = self._categories[name]
+        codes = [lookup.get(value, -2) for value in values]
+        if -2 in codes:
+            for i, value in enumerate(values):
+                if codes[i] == -2:
+                    missing = value in MISSING_VALUES or value != value
+                    codes[i] = -1 if missing else lookup.setdefault(value, len(lookup))
+        return codes
+
+    def to_frame(self, copy: bool = True) -> pd.DataFrame:
+        """
+        Schema-typed DataFrame of the buffered rows: ints at the schema width (float64 if any are
+        missing) and categoricals. With ``copy=False`` float columns share the buffers, for a last call.
+        """
+        columns = {}
+        for name, dtype in self.column_types.items():
+            values = self._arrays[name][:self.size]
+            if dtype == "category":
+                columns[name] = pd.Categorical.from_codes(values, categories=list(self._categories[name]))
+            elif dtype.startswith("int") and not np.isnan(values).any():
+                columns[name] = values.astype(schema_int_dtype(dtype))
+            else:
+                columns[name] = values.copy() if copy else values
+        # copy=False also keeps pandas from consolidating the columns into 2-D blocks (another full copy)
+        return pd.DataFrame(columns, columns=list(self.column_types), copy=False)
+
+    def clear(self) -> None:
+        self.size = 0
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate schema-typed frames in order. Categorical columns are unioned so their categories
+    keep first-appearance order across the frames, and int columns become float64 only if some
+    frame has missing values, exactly as if the rows had been buffered as one frame.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    columns = {}
+    for name in frames[0].columns:
+        parts = [frame[name] for frame in frames]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            arrays = [part.array for part in parts]
+            # A range with no values for a column has untyped (object) empty categories
+            typed = next((array.categories for array in arrays if len(array.categories)), None)
+            if typed is not None:
+                arrays = [array if len(array.categories) else array.set_categories(typed[:0]) for array in arrays]
+            columns[name] = pd.api.types.union_categoricals(arrays)
+        else:
+            columns[name] = np.concatenate([part.to_numpy() for part in parts])
+    return pd.DataFrame(columns, columns=frames[0].columns, copy=False)
+
 
 class Proj1Data:
     """
     A class to export MongoDB records as a pandas DataFrame.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, mongo_client: Optional[MongoDBClient] = None,
+                 batch_size: int = DATA_INGESTION_MONGO_BATCH_SIZE,
+                 workers: int = DATA_INGESTION_EXPORT_WORKERS,
+                 partition_key: str = DATA_INGESTION_EXPORT_PARTITION_KEY) -> None:
         """
         Initializes the MongoDB client connection.
+
+        workers > 1 makes export_collection_as_dataframe split the collection into that many
+        ranges of partition_key ('_id', or an indexed field such as 'id') and fetch them concurrently.
+        Cursors read in partition_key order; with a key other than '_id', documents that lack the
+        key are skipped by the ranged queries.
         """
         try:
-            self.mongo_client = MongoDBClient(database_name=DATABASE_NAME)
+            self.mongo_client = MongoDBClient(database_name=DATABASE_NAME) if mongo_client is None else mongo_client
+            self.batch_size = batch_size
+            self.workers = max(1, workers)
+            self.partition_key = partition_key
+            self.column_types = schema_column_types()
         except Exception as e:
             raise MyException(e, sys)
 
-    def export_collection_as_dataframe(self, collection_name: str, database_name: Optional[str] = None) -> pd.DataFrame:
+    def _collection(self, collection_name: str, database_name: Optional[str]):
+        if database_name is None:
+            return self.mongo_client.database[collection_name]
+        return self.mongo_client.client[database_name][collection_name]
+
+    def _cursor(self, collection, query: Optional[dict] = None):
+        """Batched cursor over only the schema columns (``_id`` excluded), in partition_key order."""
+        projection = {name: 1 for name in self.column_types}
+        projection["_id"] = 0
+        cursor = collection.find(query or {}, projection)
+        return cursor.sort(self.partition_key, 1).batch_size(self.batch_size)
+
+    def _iter_batches(self, collection, query: Optional[dict] = None) -> Iterator[List[dict]]:
+        batch = []
+        for document in self._cursor(collection, query):
+            batch.append(document)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def iter_collection_chunks(self, collection_name: str, database_name: Optional[str] = None,
+                               chunk_rows: int = DATA_INGESTION_EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """
+        Stream a collection as schema-typed DataFrame chunks of at most ``chunk_rows`` rows, so only
+        one chunk (plus one cursor batch) is in memory at a time.
+        """
+        try:
+            buffers = ColumnBuffers(self.column_types, capacity=chunk_rows)
+            for batch in self._iter_batches(self._collection(collection_name, database_name)):
+                while batch:
+                    room = chunk_rows - len(buffers)
+                    buffers.append(batch[:room])
+                    batch = batch[room:]
+                    if len(buffers) >= chunk_rows:
+                        yield buffers.to_frame()
+                        buffers.clear()
+            if len(buffers):
+                yield buffers.to_frame()
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def export_collection_as_dataframe(self, collection_name: str, database_name: Optional[str] = None,
+                                       after=None, up_to=None) -> pd.DataFrame:
         """
         Exports an entire MongoDB collection as a pandas DataFrame.
 
@@ -31,25 +203,124 @@ class Proj1Data:
             The name of the MongoDB collection to export.
         database_name : Optional[str]
             Name of the database (optional). Defaults to DATABASE_NAME.
+        after, up_to : optional
+            Only export documents whose partition_key is > after and <= up_to.
 
         Returns:
         -------
         pd.DataFrame
-            DataFrame containing the collection data, with '_id' column removed and 'na' values replaced with NaN.
+            DataFrame with the config/schema.yaml columns in schema order and dtypes ('_id' and
+            any other fields are not fetched), with missing and 'na' values as NaN, in
+            partition_key order whether fetched by one cursor or by parallel ranges.
         """
         try:
-            if database_name is None:
-                collection = self.mongo_client.database[collection_name]
+            collection = self._collection(collection_name, database_name)
+            logging.info("Fetching data from mongoDB")
+            ranges = [(None, None)]
+            if self.workers > 1:
+                ranges = self.partition_ranges(collection, self.workers, after, up_to)
+            if len(ranges) == 1:
+                bounded = after is not None or up_to is not None
+                capacity = None if bounded else collection.estimated_document_count()
+                df = self._fetch_range(collection, None, None, capacity, after, up_to)
             else:
-                collection = self.mongo_client[database_name][collection_name]
-
-            print("Fetching data from mongoDB")
-            df = pd.DataFrame(list(collection.find()))
-            print(f"Data fecthed with len: {len(df)}")
-            if "id" in df.columns.to_list():
-                df = df.drop(columns=["id"], axis=1)
-            df.replace({"na":np.nan},inplace=True)
+                logging.info(f"Fetching {len(ranges)} {self.partition_key} ranges on {self.workers} threads")
+                with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mongo-export") as pool:
+                    # map() returns the partitions in range order, so the merge is deterministic
+                    frames = list(pool.map(lambda bounds: self._fetch_range(collection, *bounds, None, after, up_to),
+                                           ranges))
+                df = concat_frames(frames)
+                del frames
+            logging.info(f"Data fetched with len: {len(df)}")
             return df
 
         except Exception as e:
-            raise MyException(e, sys)
\ No newline at end of file
+            raise MyException(e, sys)
+
+    def max_key(self, collection_name: str, database_name: Optional[str] = None):
+        """Largest partition_key value in the collection, or None if it is empty."""
+        try:
+            collection = self._collection(collection_name, database_name)
+            projection = {self.partition_key: 1} if self.partition_key == "_id" else {"_id": 0, self.partition_key: 1}
+            # Missing keys sort lowest, so the first document in descending order has the maximum
+            document = collection.find_one({}, projection, sort=[(self.partition_key, -1)])
+            return None if document is None else document.get(self.partition_key)
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def export_new_documents(self, collection_name: str, watermark=None,
+                             database_name: Optional[str] = None) -> Tuple[pd.DataFrame, object]:
+        """
+        Export only the documents added since ``watermark`` (a partition_key value from an earlier
+        call; None exports everything). The upper bound is the largest key when the call starts,
+        so documents inserted meanwhile are left for the next call rather than half-read.
+
+        Returns (DataFrame, new watermark); the watermark is unchanged when nothing is new.
+        '_id' works as a watermark because ObjectIds grow with insert time, as does an indexed
+        update timestamp, in which case updated documents are exported again.
+        """
+        try:
+            up_to = self.max_key(collection_name, database_name)
+            if up_to is None or (watermark is not None and up_to <= watermark):
+                logging.info(f"No documents in {collection_name} after {self.partition_key} {watermark}")
+                return ColumnBuffers(self.column_types).to_frame(), watermark
+            df = self.export_collection_as_dataframe(collection_name, database_name, after=watermark, up_to=up_to)
+            return df, up_to
+        except Exception as e:
+            raise MyException(e, sys)
+
+    @staticmethod
+    def _range_query(key: str, lower, upper, after=None, up_to=None) -> dict:
+        condition = {}
+        if lower is not None:
+            condition["$gte"] = lower
+        if upper is not None:
+            condition["$lt"] = upper
+        if after is not None:
+            condition["$gt"] = after
+        if up_to is not None:
+            condition["$lte"] = up_to
+        return {key: condition} if condition else {}
+
+    def partition_ranges(self, collection, partitions: int, after=None, up_to=None) -> List[Tuple[object, object]]:
+        """
+        Split the collection into about ``partitions`` contiguous [lower, upper) ranges of
+        partition_key, with split points taken as quantiles of a random $sample of keys; the
+        first and last ranges are open (None). Returns one open range for small collections.
+        With after/up_to only sampled keys inside those bounds are used, so a small delta of a
+        large collection is usually fetched as one range.
+        """
+        sample_size = min(
+            collection.estimated_document_count(), partitions * DATA_INGESTION_EXPORT_SAMPLES_PER_PARTITION
+        )
+        if partitions <= 1 or sample_size < partitions:
+            return [(None, None)]
+        sample = collection.aggregate([
+            {"$sample": {"size": sample_size}},
+            {"$project": {"_id": 0, "key": f"${self.partition_key}"}},
+        ])
+        keys = sorted(
+            document["key"] for document in sample
+            if document.get("key") is not None
+            and (after is None or document["key"] > after) and (up_to is None or document["key"] <= up_to)
+        )
+        if len(keys) < partitions:
+            return [(None, None)]
+        split_points = []
+        for i in range(1, partitions):
+            point = keys[i * len(keys) // partitions]
+            if not split_points or point > split_points[-1]:
+                split_points.append(point)
+        bounds = [None] + split_points + [None]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _fetch_range(self, collection, lower, upper, capacity: Optional[int] = None,
+                     after=None, up_to=None) -> pd.DataFrame:
+        """Buffer one partition_key range into a schema-typed DataFrame."""
+        query = self._range_query(self.partition_key, lower, upper, after, up_to)
+        if capacity is None:
+            capacity = collection.count_documents(query)
+        buffers = ColumnBuffers(self.column_types, capacity=capacity)
+        for batch in self._iter_batches(collection, query):
+            buffers.append(batch)
+        return buffers.to_frame(copy=False)
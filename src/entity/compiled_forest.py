@@ -0,0 +1,282 @@
+import os
+import pickle
+import sys
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.exception import MyException
+from src.logger import logging
+
+
+def _narrowest_int(max_value: int, signed: bool = True) -> np.dtype:
+    """Smallest integer dtype (8/16/32/64 bits) that can hold ``max_value``."""
+    for dtype in ((np.int8, np.int16, np.int32, np.int64) if signed else (np.uint8, np.uint16, np.uint32, np.uint64)):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"{max_value} does not fit in 64 bits")
+
+
+def _float32_round_down(threshold: np.ndarray) -> np.ndarray:
+    """
+    Largest float32 not above each float64 threshold. For float32 inputs ``x > t32`` then
+    holds exactly when ``x > t``, so splits are unchanged by the narrower dtype.
+    """
+    narrowed = threshold.astype(np.float32)
+    too_high = narrowed.astype(np.float64) > threshold
+    return np.where(too_high, np.nextafter(narrowed, np.float32(-np.inf)), narrowed)
+
+
+class CompiledForest:
+    """
+    Compact array-backed evaluator for a fitted sklearn RandomForestClassifier.
+
+    Only what inference reads is kept (impurities, sample counts and internal-node values
+    are dropped), in the narrowest safe dtypes: uint8 feature ids, float32 thresholds
+    rounded down, int16 (or int32 for very large trees) tree-local child indices, and
+    float64 class probabilities for leaves only. Within each tree internal nodes come
+    first and leaves last; leaves point to themselves with an infinite threshold, so a
+    batch is scored by stepping every (row, tree) pair down ``max_depth`` levels at once
+    with no per-node branching. Probabilities are bit-for-bit identical to sklearn's
+    predict_proba: inputs are compared as float32 like sklearn's tree code and per-tree
+    probabilities are accumulated in estimator order.
+    """
+
+    # Rows traversed together; keeps the (rows x trees) working set cache-sized
+    chunk_size = 1024
+    # Saved with the arrays; load() and load_arrays() read only this version
+    format_version = 2
+    _ARRAY_NAMES = ("feature", "threshold", "children", "tree_offsets", "leaf_shift", "leaf_value", "classes_")
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children: np.ndarray, tree_offsets: np.ndarray,
+                 leaf_shift: np.ndarray, leaf_value: np.ndarray, classes: np.ndarray, n_features: int, max_depth: int):
+        self.feature = feature
+        self.threshold = threshold
+        # children[2 * node + go_right] is the tree-local id of the next node
+        self.children = children
+        self.tree_offsets = tree_offsets
+        # tree-local leaf id + leaf_shift[tree] = row in leaf_value
+        self.leaf_shift = leaf_shift
+        self.leaf_value = leaf_value
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features)
+        self.max_depth = int(max_depth)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.tree_offsets)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the node and leaf arrays."""
+        return sum(array.nbytes for array in (
+            self.feature, self.threshold, self.children, self.tree_offsets, self.leaf_shift, self.leaf_value,
+        ))
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "CompiledForest":
+        """Flatten a fitted RandomForestClassifier (single output) into a CompiledForest."""
+        try:
+            if getattr(forest, "n_outputs_", 1) != 1:
+                raise ValueError("Only single-output forests can be compiled")
+
+            trees = []
+            max_depth = 0
+            for estimator in forest.estimators_:
+                tree = estimator.tree_
+                # Same normalisation sklearn applies to tree_.predict output in predict_proba
+                value = tree.value[:, 0, :].astype(np.float64)
+                normalizer = value.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                trees.append((tree.children_left, tree.children_right, tree.feature, tree.threshold, value / normalizer))
+                max_depth = max(max_depth, tree.max_depth)
+
+            return cls._pack(trees, np.asarray(forest.classes_), forest.n_features_in_, max_depth)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @classmethod
+    def _pack(cls, trees: List[Tuple[np.ndarray, ...]], classes: np.ndarray, n_features: int,
+              max_depth: int) -> "CompiledForest":
+        """
+        Build the compact layout from per-tree (children_left, children_right, feature,
+        threshold, normalized value) arrays in sklearn's convention (-1 children at leaves).
+        """
+        features, thresholds, children, offsets, leaf_shifts, leaf_values = [], [], [], [], [], []
+        node_offset = 0
+        leaf_offset = 0
+        for left, right, feature, threshold, value in trees:
+            is_leaf = left == -1
+            # Internal nodes first, then leaves; the root stays at local id 0 either way
+            order = np.concatenate([np.flatnonzero(~is_leaf), np.flatnonzero(is_leaf)])
+            new_id = np.empty(len(order), dtype=np.int64)
+            new_id[order] = np.arange(len(order))
+            n_internal = int((~is_leaf).sum())
+
+            leaf = is_leaf[order]
+            local_ids = np.arange(len(order))
+            new_left = np.where(leaf, local_ids, new_id[left[order]])
+            new_right = np.where(leaf, local_ids, new_id[right[order]])
+
+            features.append(np.where(leaf, 0, feature[order]))
+            thresholds.append(np.where(leaf, np.inf, threshold[order]))
+            children.append(np.stack([new_left, new_right], axis=1).ravel())
+            leaf_values.append(value[order][n_internal:])
+            offsets.append(node_offset)
+            leaf_shifts.append(leaf_offset - n_internal)
+            node_offset += len(order)
+            leaf_offset += len(order) - n_internal
+
+        largest_tree = max(len(child) // 2 for child in children)
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=_narrowest_int(max(n_features - 1, 0), signed=False)),
+            threshold=np.ascontiguousarray(_float32_round_down(np.concatenate(thresholds).astype(np.float64))),
+            # int16 at minimum: int8 arithmetic would overflow when offsets are added during traversal
+            children=np.ascontiguousarray(
+                np.concatenate(children), dtype=np.promote_types(_narrowest_int(largest_tree), np.int16)
+            ),
+            # One entry per tree, so there is nothing to gain from narrowing these
+            tree_offsets=np.asarray(offsets, dtype=np.int32),
+            leaf_shift=np.asarray(leaf_shifts, dtype=np.int32),
+            leaf_value=np.ascontiguousarray(np.concatenate(leaf_values), dtype=np.float64),
+            classes=classes,
+            n_features=n_features,
+            max_depth=max_depth,
+        )
+
+    def _validate(self, features: np.ndarray) -> np.ndarray:
+        features = np.asarray(features, dtype=np.float32)
+        if features.ndim == 1:
+            features = features.reshape(1, -1)
+        if features.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got {features.shape[1]}")
+        return np.ascontiguousarray(features)
+
+    def _leaf_rows(self, features: np.ndarray) -> np.ndarray:
+        """Row of leaf_value reached in every tree, shape (n_rows, n_trees)."""
+        flat = features.ravel()
+        row_base = (np.arange(features.shape[0], dtype=np.int32) * features.shape[1])[:, np.newaxis]
+        local = np.zeros((features.shape[0], self.n_trees), dtype=self.children.dtype)
+        for _ in range(self.max_depth):
+            nodes = local + self.tree_offsets
+            go_right = flat.take(row_base + self.feature.take(nodes)) > self.threshold.take(nodes)
+            local = self.children.take(2 * nodes + go_right)
+        return local + self.leaf_shift
+
+    def apply(self, features: np.ndarray) -> np.ndarray:
+        """Return the leaf (as a row of ``leaf_value``) reached in every tree, shape (n_samples, n_trees)."""
+        features = self._validate(features)
+        leaves = np.empty((features.shape[0], self.n_trees), dtype=np.int64)
+        for start in range(0, features.shape[0], self.chunk_size):
+            leaves[start:start + self.chunk_size] = self._leaf_rows(features[start:start + self.chunk_size])
+        return leaves
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        features = self._validate(features)
+        proba = np.empty((features.shape[0], self.leaf_value.shape[1]), dtype=np.float64)
+        for start in range(0, features.shape[0], self.chunk_size):
+            leaves = self._leaf_rows(features[start:start + self.chunk_size])
+            # (n_trees, n_rows, n_classes); summing over the leading axis accumulates tree by tree
+            proba[start:start + self.chunk_size] = self.leaf_value.take(leaves.T, axis=0).sum(axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(features), axis=1), axis=0)
+
+    def save(self, file_path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as file_obj:
+                np.savez(
+                    file_obj,
+                    feature=self.feature,
+                    threshold=self.threshold,
+                    children=self.children,
+                    tree_offsets=self.tree_offsets,
+                    leaf_shift=self.leaf_shift,
+                    leaf_value=self.leaf_value,
+                    classes=self.classes_,
+                    meta=np.array([self.n_features_in_, self.max_depth, self.format_version], dtype=np.int64),
+                )
+            logging.info(f"Saved compiled forest ({self.n_trees} trees, {self.n_nodes} nodes, "
+                         f"{self.nbytes} bytes) to {file_path}")
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @classmethod
+    def load(cls, file_path: str) -> "CompiledForest":
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                n_features, max_depth = cls._read_meta(data["meta"], file_path)
+                return cls(
+                    feature=data["feature"],
+                    threshold=data["threshold"],
+                    children=data["children"],
+                    tree_offsets=data["tree_offsets"],
+                    leaf_shift=data["leaf_shift"],
+                    leaf_value=data["leaf_value"],
+                    classes=data["classes"],
+                    n_features=n_features,
+                    max_depth=max_depth,
+                )
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def save_arrays(self, directory: str) -> None:
+        """Write every array as its own uncompressed .npy file so ``load_arrays`` can memory-map them."""
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for name in self._ARRAY_NAMES:
+                np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+            meta = np.array([self.n_features_in_, self.max_depth, self.format_version], dtype=np.int64)
+            np.save(os.path.join(directory, "meta.npy"), meta)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @classmethod
+    def load_arrays(cls, directory: str, mmap_mode: Optional[str] = "r") -> "CompiledForest":
+        """
+        Load a directory written by ``save_arrays``. With the default read-only ``mmap_mode`` the
+        node arrays stay in the OS page cache, so every process serving the same file shares them.
+        """
+        try:
+            arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                      for name in cls._ARRAY_NAMES}
+            n_features, max_depth = cls._read_meta(np.load(os.path.join(directory, "meta.npy")), directory)
+            return cls(classes=arrays.pop("classes_"), n_features=n_features, max_depth=max_depth, **arrays)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @classmethod
+    def _read_meta(cls, meta: np.ndarray, source: str) -> Tuple[int, int]:
+        """``n_features`` and ``max_depth`` from a saved meta array, after checking its format version."""
+        values = meta.tolist()
+        version = values[2] if len(values) > 2 else None
+        if version != cls.format_version:
+            raise ValueError(f"{source} is compiled forest format {version}, expected {cls.format_version}; "
+                             f"re-export it from model.pkl")
+        return values[0], values[1]
+
+
+def forest_size_report(forest, compiled: CompiledForest, file_path: Optional[str] = None) -> dict:
+    """Bytes used by the sklearn forest (pickled and as tree arrays) versus the compact serving arrays."""
+    sklearn_array_bytes = sum(
+        estimator.tree_.__getstate__()["nodes"].nbytes + estimator.tree_.value.nbytes
+        for estimator in forest.estimators_
+    )
+    report = {
+        "n_trees": compiled.n_trees,
+        "n_nodes": compiled.n_nodes,
+        "sklearn_pickle_bytes": len(pickle.dumps(forest, protocol=pickle.HIGHEST_PROTOCOL)),
+        "sklearn_tree_array_bytes": sklearn_array_bytes,
+        "compiled_bytes": compiled.nbytes,
+    }
+    if file_path is not None and os.path.exists(file_path):
+        report["compiled_file_bytes"] = os.path.getsize(file_path)
+    report["reduction_factor"] = round(report["sklearn_pickle_bytes"] / max(compiled.nbytes, 1), 2)
+    return report
@@ -1,10 +1,22 @@
+import json
+import os
 import sys
+import warnings
+from dataclasses import dataclass
+from typing import List, Mapping, Optional, Sequence, Union
+
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
+from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 
+from src.constants import MODEL_DECISION_THRESHOLD, MODEL_TRAINER_SERVING_MODEL_MANIFEST_NAME
+from src.entity.compiled_forest import CompiledForest
+from src.entity.fused_preprocessor import FusedPreprocessor
 from src.exception import MyException
 from src.logger import logging
+from src.utils.metrics import timed
 
 
 
@@ -25,6 +37,33 @@ EXPECTED_COLUMNS = [
 
 
 
+@dataclass
+class ScoredPredictions:
+    """Labels and positive-class probabilities for a batch, plus the threshold that produced the labels."""
+    labels: np.ndarray
+    probabilities: np.ndarray
+    threshold: float
+
+
+def positive_class_scores(model: object, transformed_feature: np.ndarray) -> np.ndarray:
+    """Positive-class probability per row from predict_proba, or a sigmoid of decision_function."""
+    if hasattr(model, "predict_proba"):
+        proba = model.predict_proba(transformed_feature)
+        if proba.shape[1] != 2:
+            raise ValueError(f"Expected a binary classifier, got {proba.shape[1]} classes")
+        return proba[:, 1]
+    if hasattr(model, "decision_function"):
+        return 1 / (1 + np.exp(-model.decision_function(transformed_feature)))
+    raise ValueError("Model does not support probability output")
+
+
+def scores_to_predictions(model: object, probabilities: np.ndarray,
+                          threshold: float = MODEL_DECISION_THRESHOLD) -> ScoredPredictions:
+    """Apply the decision threshold and map the result onto the model's class labels."""
+    labels = np.asarray(model.classes_).take((probabilities > threshold).astype(np.intp))
+    return ScoredPredictions(labels=labels, probabilities=probabilities, threshold=threshold)
+
+
 class TargetValueMapping:
     """
     Optional helper class if you want readable outputs later.
@@ -63,24 +102,113 @@ class MyModel:
         except Exception as e:
             raise MyException(e, sys) from e
 
-    def predict(self, dataframe: DataFrame):
+    def _classifier(self):
+        """The compiled forest when one is attached for serving, otherwise the fitted sklearn model."""
+        compiled_forest = self.__dict__.get("compiled_forest")
+        return compiled_forest if compiled_forest is not None else self.trained_model_object
+
+    def attach_compiled_forest(self, file_path: str) -> bool:
+        """
+        Serve predictions from the CompiledForest saved at ``file_path`` by ModelTrainer.
+        Returns False, keeping the sklearn model, when no compiled forest was exported.
+        """
         try:
-            logging.info("Entered MyModel.predict method")
+            if not os.path.exists(file_path):
+                return False
+            self.compiled_forest = CompiledForest.load(file_path)
+            return True
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def attach_fused_preprocessor(self, file_path: str) -> bool:
+        """
+        Replace ColumnTransformer.transform at inference with the FusedPreprocessor kernel saved at
+        ``file_path`` by DataTransformation. Returns False when no kernel was exported.
+        """
+        try:
+            if not os.path.exists(file_path):
+                return False
+            self.fused_preprocessor = FusedPreprocessor.load(file_path).with_input_columns(EXPECTED_COLUMNS)
+            return True
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def save_serving_model(self, directory: str) -> None:
+        """
+        Write the attached compiled forest and fused kernel as a directory of .npy files
+        (``forest/``, ``preprocessor/``) that ``load_serving_model`` memory-maps. The manifest is
+        written last, so a directory without one is an incomplete export and is ignored.
+        """
+        try:
+            compiled_forest = self.__dict__.get("compiled_forest")
+            fused_preprocessor = self.__dict__.get("fused_preprocessor")
+            if compiled_forest is None or fused_preprocessor is None:
+                raise ValueError("A serving model needs both a compiled forest and a fused preprocessor")
+
+            compiled_forest.save_arrays(os.path.join(directory, "forest"))
+            fused_preprocessor.save_arrays(os.path.join(directory, "preprocessor"))
+            manifest = {
+                "format_version": 1,
+                "n_trees": compiled_forest.n_trees,
+                "n_nodes": compiled_forest.n_nodes,
+                "input_columns": list(fused_preprocessor.input_columns),
+            }
+            with open(os.path.join(directory, MODEL_TRAINER_SERVING_MODEL_MANIFEST_NAME), "w") as f:
+                json.dump(manifest, f)
+            logging.info(f"Saved memory-mappable serving model to {directory}")
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def has_serving_model(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, MODEL_TRAINER_SERVING_MODEL_MANIFEST_NAME))
+
+    @classmethod
+    def load_serving_model(cls, directory: str, mmap_mode: Optional[str] = "r") -> "MyModel":
+        """
+        Build a MyModel from a ``save_serving_model`` directory without unpickling model.pkl.
+        Its arrays are mapped read-only, so every worker process on the host shares one copy
+        through the page cache; only the sklearn objects (absent here) would be per-process.
+        """
+        try:
+            model = cls(preprocessing_object=None, trained_model_object=None)
+            model.compiled_forest = CompiledForest.load_arrays(os.path.join(directory, "forest"), mmap_mode=mmap_mode)
+            model.fused_preprocessor = FusedPreprocessor.load_arrays(
+                os.path.join(directory, "preprocessor"), mmap_mode=mmap_mode
+            ).with_input_columns(EXPECTED_COLUMNS)
+            return model
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _transform_dataframe(self, dataframe: DataFrame) -> np.ndarray:
+        if self.__dict__.get("fused_preprocessor") is not None:
+            return self._transform_array(dataframe.to_numpy(dtype=np.float64))
+        return self.preprocessing_object.transform(dataframe)
+
+    @staticmethod
+    def _prepare_dataframe(dataframe: DataFrame) -> DataFrame:
+        """Align columns to EXPECTED_COLUMNS and coerce them to numeric, filling gaps with 0."""
+        if not isinstance(dataframe, pd.DataFrame):
+            dataframe = pd.DataFrame(dataframe)
+
+        dataframe = dataframe.reindex(columns=EXPECTED_COLUMNS)
 
-            if not isinstance(dataframe, pd.DataFrame):
-                dataframe = pd.DataFrame(dataframe)
+        dataframe = dataframe.apply(pd.to_numeric, errors="coerce")
 
-            dataframe = dataframe.reindex(columns=EXPECTED_COLUMNS)
+        dataframe.fillna(0, inplace=True)
+        return dataframe
 
-            dataframe = dataframe.apply(pd.to_numeric, errors="coerce")
+    def predict(self, dataframe: DataFrame):
+        try:
+            logging.info("Entered MyModel.predict method")
 
-            dataframe.fillna(0, inplace=True)
+            dataframe = self._prepare_dataframe(dataframe)
 
             logging.info("Applying preprocessing pipeline")
-            transformed_feature = self.preprocessing_object.transform(dataframe)
+            transformed_feature = self._transform_dataframe(dataframe)
 
             logging.info("Generating predictions")
-            predictions = self.trained_model_object.predict(transformed_feature)
+            predictions = self._classifier().predict(transformed_feature)
 
             return predictions
 
@@ -88,9 +216,135 @@ class MyModel:
             logging.error("Error occurred in MyModel.predict", exc_info=True)
             raise MyException(e, sys) from e
 
+    def predict_proba(self, dataframe: DataFrame):
+        """Return the class probability matrix for every row, with one transform and one model call."""
+        try:
+            dataframe = self._prepare_dataframe(dataframe)
+            transformed_feature = self._transform_dataframe(dataframe)
+            return self._classifier().predict_proba(transformed_feature)
+
+        except Exception as e:
+            logging.error("Error occurred in MyModel.predict_proba", exc_info=True)
+            raise MyException(e, sys) from e
+
+
+    def predict_with_scores(self, data: Union[DataFrame, np.ndarray, Mapping, List[Mapping]],
+                            threshold: float = MODEL_DECISION_THRESHOLD) -> ScoredPredictions:
+        """
+        Transform once and run the model once, returning labels, positive-class probabilities and
+        the threshold used. Accepts a DataFrame, a float matrix in EXPECTED_COLUMNS order, or a dict /
+        list of dicts; the last two skip pandas.
+        """
+        try:
+            with timed("preprocessing_transform"):
+                if isinstance(data, pd.DataFrame):
+                    transformed_feature = self._transform_dataframe(self._prepare_dataframe(data))
+                else:
+                    if isinstance(data, Mapping) or (isinstance(data, list) and data and isinstance(data[0], Mapping)):
+                        features = self._records_to_array(data)
+                    else:
+                        features = np.asarray(data, dtype=np.float64)
+                        if features.ndim == 1:
+                            features = features.reshape(1, -1)
+                    features = np.where(np.isnan(features), 0.0, features)
+                    transformed_feature = self._transform_array(features)
+
+            classifier = self._classifier()
+            with timed("forest_inference"):
+                probabilities = positive_class_scores(classifier, transformed_feature)
+            return scores_to_predictions(classifier, probabilities, threshold)
+
+        except Exception as e:
+            logging.error("Error occurred in MyModel.predict_with_scores", exc_info=True)
+            raise MyException(e, sys) from e
+
+    def _build_array_plan(self) -> list:
+        """
+        Resolve the fitted preprocessing pipeline into (transformer, column indices) steps over
+        EXPECTED_COLUMNS so it can be applied to a NumPy matrix without building a DataFrame.
+        """
+        steps = self.preprocessing_object.steps if isinstance(self.preprocessing_object, Pipeline) \
+            else [("Preprocessor", self.preprocessing_object)]
+        if len(steps) != 1 or not isinstance(steps[0][1], ColumnTransformer):
+            raise ValueError("Array path supports a single fitted ColumnTransformer")
+
+        column_transformer = steps[0][1]
+        input_columns = list(getattr(column_transformer, "feature_names_in_", EXPECTED_COLUMNS))
+        position = {name: EXPECTED_COLUMNS.index(name) for name in input_columns}
+
+        plan = []
+        for _, transformer, columns in column_transformer.transformers_:
+            if transformer == "drop":
+                continue
+            names = [input_columns[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+            if not names:
+                continue
+            plan.append((transformer, np.array([position[name] for name in names], dtype=np.intp)))
+        return plan
+
+    def _transform_array(self, features: np.ndarray) -> np.ndarray:
+        fused_preprocessor = self.__dict__.get("fused_preprocessor")
+        if fused_preprocessor is not None:
+            return fused_preprocessor.transform(features)
+
+        plan = self.__dict__.get("_array_plan")
+        if plan is None:
+            plan = self._build_array_plan()
+            self._array_plan = plan
+
+        blocks = []
+        with warnings.catch_warnings():
+            # Scalers were fitted on a DataFrame; feeding their ndarray slices is intentional here.
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            for transformer, indices in plan:
+                block = features[:, indices]
+                blocks.append(block if transformer == "passthrough" else transformer.transform(block))
+        return np.hstack(blocks).astype(np.float64, copy=False)
+
+    @staticmethod
+    def _records_to_array(records: Union[Mapping, Sequence[Mapping]]) -> np.ndarray:
+        """Turn a dict (or list of dicts) keyed by EXPECTED_COLUMNS into a float64 matrix; bad values become NaN."""
+        if isinstance(records, Mapping):
+            records = [records]
+        features = np.empty((len(records), len(EXPECTED_COLUMNS)), dtype=np.float64)
+        for i, record in enumerate(records):
+            for j, column in enumerate(EXPECTED_COLUMNS):
+                value = record.get(column)
+                try:
+                    features[i, j] = np.nan if value is None else float(value)
+                except (TypeError, ValueError):
+                    features[i, j] = np.nan
+        return features
+
+    def predict_array(self, features: np.ndarray):
+        """
+        Predict from a float64 matrix (or a single row) already in EXPECTED_COLUMNS order.
+        Skips pandas entirely and matches predict() on the equivalent DataFrame.
+        """
+        try:
+            features = np.asarray(features, dtype=np.float64)
+            if features.ndim == 1:
+                features = features.reshape(1, -1)
+            if features.shape[1] != len(EXPECTED_COLUMNS):
+                raise ValueError(f"Expected {len(EXPECTED_COLUMNS)} columns, got {features.shape[1]}")
+            features = np.where(np.isnan(features), 0.0, features)
+
+            transformed_feature = self._transform_array(features)
+            return self._classifier().predict(transformed_feature)
+
+        except Exception as e:
+            logging.error("Error occurred in MyModel.predict_array", exc_info=True)
+            raise MyException(e, sys) from e
+
+    def predict_records(self, records: Union[Mapping, List[Mapping]]):
+        """Predict from a dict or list of dicts keyed by EXPECTED_COLUMNS without building a DataFrame."""
+        try:
+            return self.predict_array(self._records_to_array(records))
+        except Exception as e:
+            raise MyException(e, sys) from e
 
     def __repr__(self):
-        return f"MyModel(model={type(self.trained_model_object).__name__})"
+        return f"MyModel(model={type(self._classifier()).__name__})"
 
     def __str__(self):
         return self.__repr__()
@@ -0,0 +1,150 @@
+import os
+import sys
+from typing import List, Optional
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, MinMaxScaler, StandardScaler
+
+from src.exception import MyException
+from src.logger import logging
+
+
+class FusedPreprocessor:
+    """
+    The fitted preprocessing Pipeline collapsed into one per-column affine kernel.
+
+    A ColumnTransformer of StandardScaler / MinMaxScaler / passthrough blocks is just a
+    column permutation followed by a per-column shift and scale, so ``transform`` computes
+    ``(X[:, column_order] - center) / scale * factor + offset``. StandardScaler columns use
+    center/scale and MinMaxScaler columns use factor/offset (the other pair is 0/1), which
+    reproduces sklearn's arithmetic exactly rather than just approximately.
+    """
+
+    _ARRAY_NAMES = ("column_order", "center", "scale", "factor", "offset")
+
+    def __init__(self, input_columns: List[str], column_order: np.ndarray, center: np.ndarray,
+                 scale: np.ndarray, factor: np.ndarray, offset: np.ndarray):
+        self.input_columns = list(input_columns)
+        self.column_order = np.asarray(column_order, dtype=np.intp)
+        self.center = np.asarray(center, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.factor = np.asarray(factor, dtype=np.float64)
+        self.offset = np.asarray(offset, dtype=np.float64)
+
+    @classmethod
+    def from_pipeline(cls, preprocessing_object, input_columns: Optional[List[str]] = None) -> "FusedPreprocessor":
+        """
+        Build the kernel from a fitted Pipeline([ColumnTransformer]) as produced by
+        DataTransformation.get_data_transformer_object. ``input_columns`` is the column order
+        of the matrices that will be passed to ``transform`` (defaults to the fitted order).
+        """
+        try:
+            steps = preprocessing_object.steps if isinstance(preprocessing_object, Pipeline) \
+                else [("Preprocessor", preprocessing_object)]
+            if len(steps) != 1 or not isinstance(steps[0][1], ColumnTransformer):
+                raise ValueError("Only a single fitted ColumnTransformer can be fused")
+            column_transformer = steps[0][1]
+            fitted_columns = list(column_transformer.feature_names_in_)
+            input_columns = fitted_columns if input_columns is None else list(input_columns)
+
+            order, center, scale, factor, offset = [], [], [], [], []
+            for _, transformer, columns in column_transformer.transformers_:
+                if isinstance(transformer, str) and transformer == "drop":
+                    continue
+                names = [fitted_columns[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+                n = len(names)
+                if n == 0:
+                    continue
+                zeros, ones = np.zeros(n), np.ones(n)
+                # Fitted 'passthrough' blocks show up as an identity FunctionTransformer in recent sklearn
+                if (isinstance(transformer, str) and transformer == "passthrough") or \
+                        (isinstance(transformer, FunctionTransformer) and transformer.func is None):
+                    block = (zeros, ones, ones, zeros)
+                elif isinstance(transformer, StandardScaler):
+                    block = (
+                        transformer.mean_ if transformer.with_mean else zeros,
+                        transformer.scale_ if transformer.with_std else ones,
+                        ones,
+                        zeros,
+                    )
+                elif isinstance(transformer, MinMaxScaler) and not transformer.clip:
+                    block = (zeros, ones, transformer.scale_, transformer.min_)
+                else:
+                    raise ValueError(f"Cannot fuse transformer {type(transformer).__name__}")
+
+                order.extend(input_columns.index(name) for name in names)
+                for target, values in zip((center, scale, factor, offset), block):
+                    target.extend(np.asarray(values, dtype=np.float64).tolist())
+
+            return cls(input_columns, np.array(order), np.array(center), np.array(scale),
+                       np.array(factor), np.array(offset))
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def with_input_columns(self, input_columns: List[str]) -> "FusedPreprocessor":
+        """Return the same kernel re-indexed for matrices laid out in ``input_columns`` order."""
+        input_columns = list(input_columns)
+        column_order = np.array([input_columns.index(self.input_columns[i]) for i in self.column_order])
+        return FusedPreprocessor(input_columns, column_order, self.center, self.scale, self.factor, self.offset)
+
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        transformed = np.asarray(features, dtype=np.float64).take(self.column_order, axis=1)
+        transformed -= self.center
+        transformed /= self.scale
+        transformed *= self.factor
+        transformed += self.offset
+        return transformed
+
+    def save(self, file_path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as file_obj:
+                np.savez(
+                    file_obj,
+                    input_columns=np.array(self.input_columns),
+                    column_order=self.column_order,
+                    center=self.center,
+                    scale=self.scale,
+                    factor=self.factor,
+                    offset=self.offset,
+                )
+            logging.info(f"Saved fused preprocessing kernel to {file_path}")
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def save_arrays(self, directory: str) -> None:
+        """Write the kernel as uncompressed .npy files so ``load_arrays`` can memory-map them."""
+        try:
+            os.makedirs(directory, exist_ok=True)
+            np.save(os.path.join(directory, "input_columns.npy"), np.array(self.input_columns))
+            for name in self._ARRAY_NAMES:
+                np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @classmethod
+    def load_arrays(cls, directory: str, mmap_mode: Optional[str] = "r") -> "FusedPreprocessor":
+        try:
+            arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                      for name in cls._ARRAY_NAMES}
+            input_columns = np.load(os.path.join(directory, "input_columns.npy")).tolist()
+            return cls(input_columns=input_columns, **arrays)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @classmethod
+    def load(cls, file_path: str) -> "FusedPreprocessor":
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                return cls(
+                    input_columns=data["input_columns"].tolist(),
+                    column_order=data["column_order"],
+                    center=data["center"],
+                    scale=data["scale"],
+                    factor=data["factor"],
+                    offset=data["offset"],
+                )
+        except Exception as e:
+            raise MyException(e, sys) from e
@@ -11,9 +11,19 @@ MAX_LOG_SIZE = 5 * 1024 * 1024
 BACKUP_COUNT = 3
 
 log_dir_path = os.path.join(from_root(), LOG_DIR)
-os.makedirs(log_dir_path, exist_ok=True)
 log_file_path = os.path.join(log_dir_path, LOG_FILE)
 
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that creates the log directory and file on the first record, not at import."""
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
 def configure_logger():
     """
     Configures logging with a rotating file handler and a console handler.
@@ -24,7 +34,7 @@ def configure_logger():
     
     formatter = logging.Formatter("[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s")
 
-    file_handler = RotatingFileHandler(log_file_path, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT)
+    file_handler = LazyRotatingFileHandler(log_file_path, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT)
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.DEBUG)
     
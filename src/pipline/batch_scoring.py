@@ -0,0 +1,122 @@
+"""
+Offline batch scoring of large raw-schema files.
+
+    python -m src.pipline.batch_scoring --input book.csv --output scored/ --workers 8
+
+The input (CSV or Parquet in the config/schema.yaml layout) is read in chunks and the chunks
+are scored across a process pool. Each worker loads the model once in its initializer and
+writes its chunk to ``part-<chunk number>`` in the output directory, so concatenating the parts
+in name order reproduces the input row order.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from src.constants import ARTIFACT_DIR, BATCH_SCORING_CHUNK_ROWS, BATCH_SCORING_OUTPUT_FORMATS
+from src.exception import MyException
+from src.logger import logging
+from src.pipline.prediction_pipeline import ModelCache, VehicleDataClassifier, score_raw_dataframe
+
+_worker_classifier: Optional[VehicleDataClassifier] = None
+
+
+def _init_worker(artifact_dir: str) -> None:
+    """Load the latest model once per worker process."""
+    global _worker_classifier
+    _worker_classifier = VehicleDataClassifier(cache=ModelCache(base_dir=artifact_dir))
+
+
+def _score_partition(chunk_index: int, raw: pd.DataFrame, output_dir: str, output_format: str) -> int:
+    output = score_raw_dataframe(raw, classifier=_worker_classifier)
+    part_path = os.path.join(output_dir, f"part-{chunk_index:05d}.{output_format}")
+    if output_format == "parquet":
+        output.to_parquet(part_path, index=False)
+    else:
+        output.to_csv(part_path, index=False)
+    return len(output)
+
+
+def iter_input_chunks(input_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yield the input file in frames of at most ``chunk_rows`` rows without reading it whole."""
+    if input_path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(input_path, chunksize=chunk_rows)
+
+
+def run_batch_scoring(input_path: str, output_dir: str, workers: int = os.cpu_count() or 1,
+                      chunk_rows: int = BATCH_SCORING_CHUNK_ROWS, output_format: str = "csv",
+                      artifact_dir: str = ARTIFACT_DIR) -> dict:
+    """
+    Score ``input_path`` into partition files under ``output_dir`` and return a summary with
+    the row count, elapsed seconds and rows/sec. At most two chunks per worker are in flight,
+    so memory use does not grow with the size of the input.
+    """
+    try:
+        if output_format not in BATCH_SCORING_OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {BATCH_SCORING_OUTPUT_FORMATS}")
+        os.makedirs(output_dir, exist_ok=True)
+
+        started = time.perf_counter()
+        rows = 0
+        partitions = 0
+        in_flight = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(artifact_dir,)) as pool:
+            for chunk_index, raw in enumerate(iter_input_chunks(input_path, chunk_rows)):
+                in_flight.append(pool.submit(_score_partition, chunk_index, raw, output_dir, output_format))
+                if len(in_flight) >= 2 * workers:
+                    rows += in_flight.pop(0).result()
+                    partitions += 1
+            for future in in_flight:
+                rows += future.result()
+                partitions += 1
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            "input": input_path,
+            "output": output_dir,
+            "partitions": partitions,
+            "rows": rows,
+            "workers": workers,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+        logging.info(f"Batch scoring finished: {summary}")
+        return summary
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Score a large raw-schema CSV/Parquet file with the latest model.")
+    parser.add_argument("--input", required=True, help="CSV or .parquet file in the config/schema.yaml layout")
+    parser.add_argument("--output", required=True, help="directory for the part-NNNNN output files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=BATCH_SCORING_CHUNK_ROWS, help="rows per chunk")
+    parser.add_argument("--output-format", choices=BATCH_SCORING_OUTPUT_FORMATS, default="csv")
+    parser.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    args = parser.parse_args(argv)
+
+    summary = run_batch_scoring(
+        input_path=args.input,
+        output_dir=args.output,
+        workers=args.workers,
+        chunk_rows=args.chunk_size,
+        output_format=args.output_format,
+        artifact_dir=args.artifact_dir,
+    )
+    print(f"Scored {summary['rows']} rows in {summary['seconds']}s "
+          f"({summary['rows_per_second']} rows/sec, {summary['partitions']} partitions, {summary['workers']} workers)")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
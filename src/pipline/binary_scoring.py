@@ -0,0 +1,121 @@
+import io
+import sys
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.constants import BINARY_SCORING_CONTENT_TYPES
+from src.entity.estimator import EXPECTED_COLUMNS
+from src.exception import MyException
+from src.pipline.prediction_pipeline import VehicleDataClassifier
+from src.utils.metrics import timed
+
+ARROW_STREAM_CONTENT_TYPE, NPY_CONTENT_TYPE = BINARY_SCORING_CONTENT_TYPES
+
+
+class BinaryPayloadError(ValueError):
+    """Raised when a binary batch cannot be decoded into an EXPECTED_COLUMNS float matrix."""
+
+
+def decode_npy(body: bytes) -> np.ndarray:
+    """Load a ``.npy`` matrix with one column per EXPECTED_COLUMNS entry, in that order."""
+    try:
+        features = np.load(io.BytesIO(body), allow_pickle=False)
+        features = features.astype(np.float64, copy=False)
+    except Exception as e:
+        raise BinaryPayloadError(f"Not a numeric .npy array: {e}") from e
+    if features.ndim == 1 and features.size == len(EXPECTED_COLUMNS):
+        features = features.reshape(1, -1)
+    if features.ndim != 2 or features.shape[1] != len(EXPECTED_COLUMNS) or not len(features):
+        raise BinaryPayloadError(
+            f"Expected a non-empty (rows, {len(EXPECTED_COLUMNS)}) matrix in {EXPECTED_COLUMNS} order, "
+            f"got shape {features.shape}"
+        )
+    return features
+
+
+def decode_arrow(body: bytes) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Read an Arrow IPC stream holding every EXPECTED_COLUMNS column (any numeric type, nulls allowed)
+    into a float64 matrix; an optional ``id`` column is returned as well so results can carry it.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except Exception as e:
+        raise BinaryPayloadError(f"Not an Arrow IPC stream: {e}") from e
+    missing = [column for column in EXPECTED_COLUMNS if column not in table.column_names]
+    if missing:
+        raise BinaryPayloadError(f"Missing columns in Arrow batch: {missing}")
+    if not table.num_rows:
+        raise BinaryPayloadError("Arrow batch has no rows")
+
+    features = np.empty((table.num_rows, len(EXPECTED_COLUMNS)), dtype=np.float64)
+    try:
+        for j, column in enumerate(EXPECTED_COLUMNS):
+            # Nulls become NaN, which the model treats like the JSON path's missing values
+            features[:, j] = pc.cast(table.column(column), pa.float64()).to_numpy(zero_copy_only=False)
+    except Exception as e:
+        raise BinaryPayloadError(f"Non-numeric feature column in Arrow batch: {e}") from e
+    ids = table.column("id").to_numpy(zero_copy_only=False) if "id" in table.column_names else None
+    return features, ids
+
+
+def encode_arrow(labels: np.ndarray, probabilities: np.ndarray, threshold: float,
+                 ids: Optional[np.ndarray] = None) -> bytes:
+    import pyarrow as pa
+
+    columns = {} if ids is None else {"id": pa.array(ids)}
+    columns["prediction"] = pa.array(labels.astype(np.int8, copy=False))
+    columns["probability"] = pa.array(probabilities.astype(np.float64, copy=False))
+    table = pa.table(columns).replace_schema_metadata({"threshold": repr(float(threshold))})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_npy(labels: np.ndarray, probabilities: np.ndarray) -> bytes:
+    """(rows, 2) float64 matrix of [prediction, probability]."""
+    buffer = io.BytesIO()
+    np.save(buffer, np.column_stack([labels.astype(np.float64), probabilities]), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def score_binary_batch(body: bytes, content_type: str) -> Tuple[bytes, float, int]:
+    """
+    Decode an Arrow IPC or ``.npy`` batch already in EXPECTED_COLUMNS layout, score it as one
+    matrix and encode the results in the same format. Returns (body, threshold, row count).
+
+    The matrix goes straight to the model's array path, so no per-row Python objects or
+    DataFrame are built. Malformed payloads raise BinaryPayloadError.
+    """
+    with timed("binary_decoding"):
+        if content_type == ARROW_STREAM_CONTENT_TYPE:
+            features, ids = decode_arrow(body)
+        elif content_type == NPY_CONTENT_TYPE:
+            features, ids = decode_npy(body), None
+        else:
+            raise BinaryPayloadError(
+                f"Unsupported content type {content_type!r}; use one of {BINARY_SCORING_CONTENT_TYPES}"
+            )
+
+    try:
+        classifier = VehicleDataClassifier()
+        if classifier.preprocessor is not None:
+            # A raw estimator with a separate preprocessor needs column names
+            import pandas as pd
+
+            features = pd.DataFrame(features, columns=EXPECTED_COLUMNS)
+        scored = classifier.predict_with_scores(features)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+    with timed("binary_encoding"):
+        if content_type == ARROW_STREAM_CONTENT_TYPE:
+            output = encode_arrow(scored.labels, scored.probabilities, scored.threshold, ids)
+        else:
+            output = encode_npy(scored.labels, scored.probabilities)
+    return output, scored.threshold, len(scored.labels)
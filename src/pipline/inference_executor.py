@@ -0,0 +1,151 @@
+import asyncio
+import sys
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Tuple
+
+from src.constants import INFERENCE_EXECUTOR_KIND, INFERENCE_MAX_QUEUE_DEPTH, INFERENCE_MAX_WORKERS
+from src.exception import MyException
+from src.utils.metrics import merge_metrics
+
+
+class InferenceOverloadedError(Exception):
+    """Raised when the inference pool already holds its maximum number of queued calls."""
+
+
+def _call_in_worker(fn: Callable, args: tuple, kwargs: dict) -> Tuple[Any, dict]:
+    """Process-pool task: ``fn``'s result plus the metrics recorded in this worker since its last call."""
+    from src.utils.metrics import drain_metrics
+
+    return fn(*args, **kwargs), drain_metrics()
+
+
+def _merge_worker_metrics(worker_future: Future) -> Future:
+    """Future for the result of a ``_call_in_worker`` task, folding its metrics into this process."""
+    future = Future()
+
+    def on_worker_done(done: Future) -> None:
+        if done.cancelled():
+            future.cancel()
+            return
+        exception = done.exception()
+        if exception is None:
+            result, drained = done.result()
+            merge_metrics(drained)
+        if future.cancelled():
+            return
+        if exception is None:
+            future.set_result(result)
+        else:
+            future.set_exception(exception)
+
+    future.add_done_callback(lambda outer: worker_future.cancel() if outer.cancelled() else None)
+    worker_future.add_done_callback(on_worker_done)
+    return future
+
+
+def _warm_worker() -> None:
+    """Process-pool initializer: load the model once per worker process instead of on its first call."""
+    from src.pipline.prediction_pipeline import model_cache
+    from src.utils.metrics import drain_metrics
+
+    # A forked worker starts with a copy of the parent's metrics; only report its own
+    drain_metrics()
+    try:
+        model_cache.load()
+    except Exception:
+        # No artifact yet; the first call will retry and surface the error to the caller.
+        pass
+
+
+class InferenceExecutor(Executor):
+    """
+    Bounded pool that keeps CPU-bound pandas/sklearn work off the event loop.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue_depth`` more may wait.
+    Anything beyond that is rejected immediately with InferenceOverloadedError so the
+    caller can shed load instead of building an unbounded backlog.
+
+    With ``kind="process"`` each call also returns the metrics its worker recorded (stage
+    timings and counters), which are merged into this process's so /metrics sees them.
+    """
+
+    def __init__(
+        self,
+        kind: str = INFERENCE_EXECUTOR_KIND,
+        max_workers: int = INFERENCE_MAX_WORKERS,
+        max_queue_depth: int = INFERENCE_MAX_QUEUE_DEPTH,
+    ):
+        if kind not in ("thread", "process"):
+            raise MyException(f"Unknown inference executor kind: {kind}", sys)
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._pool = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_warm_worker)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        return self._pool
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue_depth:
+                self._rejected += 1
+                raise InferenceOverloadedError(
+                    f"Inference queue is full ({self.max_queue_depth} waiting, {self.max_workers} running)"
+                )
+            self._in_flight += 1
+            pool = self._get_pool()
+        try:
+            if self.kind == "process":
+                # Stage timings recorded in the worker would otherwise never reach /metrics
+                future = _merge_worker_metrics(pool.submit(_call_in_worker, fn, args, kwargs))
+            else:
+                future = pool.submit(fn, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    async def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Await ``fn(*args, **kwargs)`` on the pool from async code."""
+        return await asyncio.get_running_loop().run_in_executor(self, partial(fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue_depth": self.max_queue_depth,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.max_workers),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
@@ -0,0 +1,109 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.constants import MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS
+from src.exception import MyException
+from src.logger import logging
+from src.utils.metrics import observe_batch_size
+
+
+class PredictionBatcher:
+    """
+    Coalesces concurrent single-row prediction requests into one model call.
+
+    Requests arriving within ``max_wait_ms`` of the first queued request (or until
+    ``max_batch_size`` rows are queued) are scored together by ``score_fn``, which
+    receives the list of rows and must return one result per row in the same order.
+    Each caller's future is then resolved with its own result.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+        max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS,
+        executor: Optional[Executor] = None,
+    ):
+        if max_batch_size < 1:
+            raise MyException("max_batch_size must be at least 1", sys)
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.executor = executor
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stats_lock = threading.Lock()
+        self._batch_size_counts: Dict[int, int] = {}
+        self._batches = 0
+        self._rows = 0
+        self._queued_seconds_total = 0.0
+        self._queued_seconds_max = 0.0
+
+    async def submit(self, row: Any) -> Any:
+        """Queue one row and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        asyncio.get_running_loop().create_task(self._run_batch(batch))
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait_ms / 1000.0, self._flush)
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        started = time.perf_counter()
+        self._record_batch(len(batch), [started - queued_at for _, _, queued_at in batch])
+        rows = [row for row, _, _ in batch]
+        try:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self.executor, self.score_fn, rows)
+            if len(results) != len(rows):
+                raise MyException(f"score_fn returned {len(results)} results for {len(rows)} rows", sys)
+        except Exception as e:
+            logging.error(f"Micro-batch of {len(rows)} rows failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _record_batch(self, size: int, queued_seconds: List[float]) -> None:
+        with self._stats_lock:
+            self._batches += 1
+            self._rows += size
+            self._batch_size_counts[size] = self._batch_size_counts.get(size, 0) + 1
+            self._queued_seconds_total += sum(queued_seconds)
+            self._queued_seconds_max = max(self._queued_seconds_max, max(queued_seconds))
+        observe_batch_size(size)
+
+    def stats(self) -> dict:
+        """Batch-size distribution and time spent queued, since process start."""
+        with self._stats_lock:
+            return {
+                "batches": self._batches,
+                "rows": self._rows,
+                "pending": len(self._pending),
+                "mean_batch_size": self._rows / self._batches if self._batches else 0.0,
+                "batch_size_counts": dict(sorted(self._batch_size_counts.items())),
+                "queued_seconds_total": self._queued_seconds_total,
+                "queued_seconds_mean": self._queued_seconds_total / self._rows if self._rows else 0.0,
+                "queued_seconds_max": self._queued_seconds_max,
+            }
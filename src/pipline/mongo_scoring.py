@@ -0,0 +1,221 @@
+"""
+Bulk scoring of the MongoDB collection with predictions written back to MongoDB.
+
+    python -m src.pipline.mongo_scoring --workers 8 --batch-size 5000
+
+Documents are read in ``_id`` order through a batched cursor and scored in batches on a
+process pool, so scoring uses one core per worker instead of sharing the GIL. Every worker
+loads the exact model run the parent resolved, so a retrain mid-run cannot mix models.
+Threads are only used for the I/O: each batch's predictions are upserted into the predictions
+collection with an unordered ``bulk_write`` while later batches score. The last ``_id`` whose
+batch (and every batch before it) has been written is checkpointed, so an interrupted run
+resumes from there; re-scoring the few batches after the checkpoint is harmless because
+writes are upserts keyed by the source ``_id``. A checkpoint written with a different model
+is refused rather than resumed.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pymongo import UpdateOne
+
+from src.constants import (
+    COLLECTION_NAME,
+    DATABASE_NAME,
+    MONGO_SCORING_BATCH_SIZE,
+    MONGO_SCORING_CHECKPOINT_COLLECTION,
+    MONGO_SCORING_PREDICTIONS_COLLECTION,
+    MONGO_SCORING_WORKERS,
+)
+from src.exception import MyException
+from src.logger import logging
+from src.pipline.prediction_pipeline import RAW_FEATURE_COLUMNS, ModelCache, VehicleDataClassifier, score_raw_dataframe
+
+_worker_classifier: Optional[VehicleDataClassifier] = None
+
+
+def _init_worker(run_dir: str) -> None:
+    """Load the parent's model run (not whichever run is newest by now) once per worker process."""
+    global _worker_classifier
+    cache = ModelCache(base_dir=os.path.dirname(os.path.normpath(run_dir)))
+    cache.pin(run_dir)
+    _worker_classifier = VehicleDataClassifier(cache=cache)
+
+
+def _model_version(classifier: VehicleDataClassifier) -> str:
+    return os.path.basename(os.path.normpath(classifier.latest_dir))
+
+
+def _score_batch(raw: pd.DataFrame, signature: Tuple) -> Tuple[List[int], List[float]]:
+    """Process-pool task: labels and probabilities, from the model with the parent's ``signature`` only."""
+    if _worker_classifier.signature != signature:
+        # The run's files changed after the parent loaded them; its checkpoint would name the wrong model
+        raise ValueError(f"Worker loaded {_worker_classifier.signature}, expected {signature}")
+    output = score_raw_dataframe(raw, classifier=_worker_classifier)
+    return output["prediction"].tolist(), output["probability"].tolist()
+
+
+class MongoBulkScorer:
+    def __init__(self, database=None, source_collection: str = COLLECTION_NAME,
+                 predictions_collection: str = MONGO_SCORING_PREDICTIONS_COLLECTION,
+                 checkpoint_collection: str = MONGO_SCORING_CHECKPOINT_COLLECTION,
+                 batch_size: int = MONGO_SCORING_BATCH_SIZE, workers: int = MONGO_SCORING_WORKERS,
+                 classifier: Optional[VehicleDataClassifier] = None):
+        """
+        :param database: pymongo (or compatible) Database; defaults to the configured MongoDB database
+        :param classifier: model to score with; defaults to the latest trained model
+        """
+        try:
+            if database is None:
+                from src.configuration.mongo_db_connection import MongoDBClient
+
+                database = MongoDBClient(database_name=DATABASE_NAME).database
+            self.database = database
+            self.source = database[source_collection]
+            self.predictions = database[predictions_collection]
+            self.checkpoints = database[checkpoint_collection]
+            self.checkpoint_id = f"{source_collection}->{predictions_collection}"
+            self.batch_size = batch_size
+            self.workers = workers
+            self.classifier = VehicleDataClassifier() if classifier is None else classifier
+            self.model_version = _model_version(self.classifier)
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def last_checkpoint(self):
+        checkpoint = self.checkpoints.find_one({"_id": self.checkpoint_id})
+        return None if checkpoint is None else checkpoint["last_id"]
+
+    def _save_checkpoint(self, last_id) -> None:
+        self.checkpoints.update_one(
+            {"_id": self.checkpoint_id},
+            {"$set": {"last_id": last_id, "model_version": self.model_version, "updated_at": datetime.now()}},
+            upsert=True,
+        )
+
+    def iter_batches(self, after_id=None) -> Iterator[List[dict]]:
+        """Yield lists of at most ``batch_size`` documents in ``_id`` order, starting after ``after_id``."""
+        query = {} if after_id is None else {"_id": {"$gt": after_id}}
+        projection = {column: 1 for column in RAW_FEATURE_COLUMNS + ["id"]}
+        cursor = self.source.find(query, projection).sort("_id", 1).batch_size(self.batch_size)
+        batch = []
+        for document in cursor:
+            batch.append(document)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _raw_frame(documents: List[dict]) -> pd.DataFrame:
+        return pd.DataFrame(documents).drop(columns="_id").replace({"na": np.nan})
+
+    def _write_predictions(self, doc_ids: list, predictions: List[int], probabilities: List[float]) -> int:
+        scored_at = datetime.now()
+        operations = [
+            UpdateOne(
+                {"_id": doc_id},
+                {"$set": {
+                    "prediction": int(prediction),
+                    "probability": float(probability),
+                    "model_version": self.model_version,
+                    "scored_at": scored_at,
+                }},
+                upsert=True,
+            )
+            for doc_id, prediction, probability in zip(doc_ids, predictions, probabilities)
+        ]
+        self.predictions.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    def _write_when_scored(self, doc_ids: list, scored: Future) -> int:
+        """Writer-thread task: wait for a batch's scores from the process pool, then upsert them."""
+        return self._write_predictions(doc_ids, *scored.result())
+
+    def run(self, resume: bool = True) -> dict:
+        """Score every document after the checkpoint (or all of them when ``resume`` is False)."""
+        try:
+            after_id = None
+            checkpoint = self.checkpoints.find_one({"_id": self.checkpoint_id}) if resume else None
+            if checkpoint is not None:
+                if checkpoint.get("model_version") != self.model_version:
+                    raise ValueError(
+                        f"Checkpoint {self.checkpoint_id} was scored with model {checkpoint.get('model_version')}, "
+                        f"not {self.model_version}; resume with that model or rescore with --no-resume"
+                    )
+                after_id = checkpoint["last_id"]
+            logging.info(f"Mongo bulk scoring started after _id={after_id} with {self.workers} workers")
+            started = time.perf_counter()
+            written = 0
+            batches = 0
+            in_flight = []
+
+            def complete_oldest():
+                nonlocal written, batches
+                future, last_id = in_flight.pop(0)
+                written += future.result()
+                batches += 1
+                # Batches complete in submission order here, so everything up to last_id is persisted
+                self._save_checkpoint(last_id)
+
+            # One writer thread per in-flight batch, so a finished batch never waits for a free writer
+            scorers = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.classifier.latest_dir,)
+            )
+            writers = ThreadPoolExecutor(max_workers=2 * self.workers, thread_name_prefix="mongo-scoring")
+            with scorers, writers:
+                for documents in self.iter_batches(after_id):
+                    scored = scorers.submit(_score_batch, self._raw_frame(documents), self.classifier.signature)
+                    doc_ids = [document["_id"] for document in documents]
+                    in_flight.append((writers.submit(self._write_when_scored, doc_ids, scored), doc_ids[-1]))
+                    if len(in_flight) >= 2 * self.workers:
+                        complete_oldest()
+                while in_flight:
+                    complete_oldest()
+
+            elapsed = time.perf_counter() - started
+            summary = {
+                "documents": written,
+                "batches": batches,
+                "workers": self.workers,
+                "model_version": self.model_version,
+                "last_id": self.last_checkpoint(),
+                "seconds": round(elapsed, 3),
+                "documents_per_second": round(written / elapsed, 1) if elapsed > 0 else 0.0,
+            }
+            logging.info(f"Mongo bulk scoring finished: {summary}")
+            return summary
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Score the MongoDB collection and write predictions back.")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--predictions-collection", default=MONGO_SCORING_PREDICTIONS_COLLECTION)
+    parser.add_argument("--batch-size", type=int, default=MONGO_SCORING_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=MONGO_SCORING_WORKERS)
+    parser.add_argument("--no-resume", action="store_true", help="ignore the checkpoint and rescore everything")
+    args = parser.parse_args(argv)
+
+    scorer = MongoBulkScorer(
+        source_collection=args.collection,
+        predictions_collection=args.predictions_collection,
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
+    summary = scorer.run(resume=not args.no_resume)
+    print(f"Scored {summary['documents']} documents in {summary['seconds']}s "
+          f"({summary['documents_per_second']} docs/sec, model {summary['model_version']})")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
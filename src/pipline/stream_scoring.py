@@ -0,0 +1,101 @@
+import io
+import json
+import sys
+from typing import AsyncIterator, List, Optional
+
+import pandas as pd
+
+from src.constants import STREAM_SCORING_CHUNK_ROWS
+from src.exception import MyException
+from src.pipline.prediction_pipeline import RAW_FEATURE_COLUMNS, score_raw_dataframe
+
+OUTPUT_FORMATS = ("csv", "ndjson")
+
+
+class CsvChunkReader:
+    """
+    Splits a streamed CSV body into blocks of at most ``chunk_rows`` data rows.
+
+    Only the current block is held in memory. Each block is returned as bytes that start with
+    the header line, so it can be parsed on its own. Rows are split on newlines, so quoted
+    fields must not contain line breaks (true for the raw vehicle schema).
+    """
+
+    def __init__(self, byte_stream: AsyncIterator[bytes], chunk_rows: int = STREAM_SCORING_CHUNK_ROWS):
+        self.byte_stream = byte_stream.__aiter__()
+        self.chunk_rows = chunk_rows
+        self.header: Optional[bytes] = None
+        self._buffer = b""
+        self._exhausted = False
+
+    async def _next_piece(self) -> Optional[bytes]:
+        if self._exhausted:
+            return None
+        try:
+            return await self.byte_stream.__anext__()
+        except StopAsyncIteration:
+            self._exhausted = True
+            return None
+
+    async def read_header(self) -> List[str]:
+        while b"\n" not in self._buffer:
+            piece = await self._next_piece()
+            if piece is None:
+                break
+            self._buffer += piece
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        self.header = line.rstrip(b"\r") + b"\n"
+        return [name.strip().strip('"') for name in self.header.decode("utf-8").strip().split(",")]
+
+    async def __aiter__(self):
+        if self.header is None:
+            await self.read_header()
+        pieces, newlines = [self._buffer], self._buffer.count(b"\n")
+        self._buffer = b""
+        while True:
+            while newlines < self.chunk_rows:
+                piece = await self._next_piece()
+                if piece is None:
+                    break
+                pieces.append(piece)
+                newlines += piece.count(b"\n")
+
+            data = b"".join(pieces)
+            if newlines >= self.chunk_rows:
+                *rows, rest = data.split(b"\n", self.chunk_rows)
+                yield self.header + b"\n".join(rows) + b"\n"
+                pieces, newlines = [rest], rest.count(b"\n")
+                continue
+
+            if data.strip():
+                yield self.header + data.rstrip(b"\n") + b"\n"
+            return
+
+
+def score_csv_block(csv_block: bytes) -> pd.DataFrame:
+    """
+    Parse one CSV block in the raw schema, encode it like DataTransformation and score it.
+    Returns ``id`` (when present), ``prediction`` and ``probability`` per input row.
+    """
+    try:
+        return score_raw_dataframe(pd.read_csv(io.BytesIO(csv_block), skip_blank_lines=True))
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def format_scored_block(output: pd.DataFrame, output_format: str, include_header: bool) -> bytes:
+    if output_format == "ndjson":
+        return "".join(json.dumps(record) + "\n" for record in output.to_dict("records")).encode("utf-8")
+    return output.to_csv(index=False, header=include_header).encode("utf-8")
+
+
+def format_stream_error(error: Exception, output_format: str) -> bytes:
+    """Trailer marking a streamed result as incomplete."""
+    message = " ".join(str(error).split())
+    if output_format == "ndjson":
+        return (json.dumps({"error": message}) + "\n").encode("utf-8")
+    return f"# error: {message}\n".encode("utf-8")
+
+
+def missing_raw_columns(columns: List[str]) -> List[str]:
+    return [column for column in RAW_FEATURE_COLUMNS if column not in columns]
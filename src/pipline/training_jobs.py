@@ -0,0 +1,333 @@
+import json
+import multiprocessing
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from src.constants import TRAINING_JOB_DIR, TRAINING_JOB_HISTORY, TRAINING_JOB_NICENESS
+from src.exception import MyException
+from src.logger import logging
+from src.utils.file_lock import FileLock
+
+TERMINAL_STATES = ("succeeded", "failed", "cancelled")
+
+
+def run_training_pipeline(report: Callable[[str, str], None]) -> dict:
+    """Default job target: run TrainPipeline, reporting stage progress through ``report``."""
+    from src.pipline.training_pipeline import TrainPipeline
+
+    pipeline = TrainPipeline(stage_callback=report)
+    model_trainer_artifact = pipeline.run_pipeline()
+    return {
+        "artifact_dir": pipeline.training_pipeline_config.artifact_dir,
+        "model_file_path": model_trainer_artifact.trained_model_file_path,
+    }
+
+
+def _job_process_main(target: Callable, events, niceness: int) -> None:
+    """Entry point of the training process: lower its CPU priority, run the target, post events."""
+    if niceness and hasattr(os, "nice"):
+        # Serving workers keep the CPU whenever both want it
+        os.nice(niceness)
+
+    def report(stage: str, event: str) -> None:
+        events.put(("stage", stage, event, time.time()))
+
+    try:
+        events.put(("succeeded", target(report), time.time()))
+    except BaseException as e:
+        events.put(("failed", str(e), time.time()))
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds") if timestamp else None
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != "posix":
+        # os.kill would terminate the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class TrainingJobManager:
+    """
+    Runs training jobs one at a time in a separate, lower-priority process.
+
+    ``submit`` returns a job record immediately; a dispatcher thread starts queued jobs in a
+    fresh (spawned) process and follows its stage events, so the serving event loop and the
+    inference pool never run training code. At most one job runs and one waits: submitting
+    while a job is already queued returns that job, since it would train on the same data.
+
+    Both rules hold across uvicorn workers sharing ``jobs_dir``. Every job record is written to
+    ``<jobs_dir>/<job_id>.json`` on each change, so any worker can report on any job; new jobs
+    are created under ``jobs.lock`` after checking the other workers' records for a queued job,
+    and a job only starts once its worker holds ``running.lock``. A queued or running job whose
+    worker has exited is reported as failed. Only the newest ``history`` jobs are kept: older
+    finished records are deleted whenever a job is submitted or finishes.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[Callable[[str, str], None]], dict] = run_training_pipeline,
+        niceness: int = TRAINING_JOB_NICENESS,
+        history: int = TRAINING_JOB_HISTORY,
+        jobs_dir: str = TRAINING_JOB_DIR,
+    ):
+        self.target = target
+        self.niceness = niceness
+        self.history = history
+        self.jobs_dir = jobs_dir
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._dispatcher: Optional[threading.Thread] = None
+        self._process = None
+        self._closed = False
+        self._run_lock = FileLock(os.path.join(jobs_dir, "running.lock"))
+        # (jobs_dir mtime, job records as read then); every job write replaces a file in the directory
+        self._stats_cache = None
+
+    def submit(self) -> dict:
+        """Queue a training run (or return the one already queued) and return its record."""
+        with self._lock:
+            if self._closed:
+                raise MyException("Training job manager is shut down", sys)
+            with FileLock(os.path.join(self.jobs_dir, "jobs.lock")):
+                jobs = self._load_all()
+                queued = [job for job in jobs if job["state"] == "queued"]
+                if queued:
+                    return self._snapshot(queued[-1])
+                job_id = uuid.uuid4().hex
+                job = {
+                    "job_id": job_id,
+                    "state": "queued",
+                    "owner_pid": os.getpid(),
+                    "submitted_at": time.time(),
+                    "started_at": None,
+                    "finished_at": None,
+                    "pid": None,
+                    "current_stage": None,
+                    "stages": OrderedDict(),
+                    "result": None,
+                    "error": None,
+                }
+                self._jobs[job_id] = job
+                self._save(job)
+                self._forget_old_jobs(jobs + [job])
+            self._pending.append(job_id)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name="training-jobs", daemon=True)
+                self._dispatcher.start()
+            self._wake.notify()
+            logging.info(f"Training job {job_id} queued")
+            return self._snapshot(self._jobs[job_id])
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Record of any job in ``jobs_dir``, whichever worker started it; None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self._snapshot(job)
+        if not re.fullmatch(r"[0-9a-f]{32}", job_id):
+            return None
+        job = self._load(job_id)
+        return None if job is None else self._snapshot(job)
+
+    def stats(self) -> dict:
+        """Job counts per state over all workers; job files are only re-read after one changes."""
+        try:
+            version = os.stat(self.jobs_dir).st_mtime_ns
+        except FileNotFoundError:
+            version = None
+        cached = self._stats_cache
+        if cached is None or cached[0] != version:
+            cached = self._stats_cache = (version, self._load_all(check_owner=False))
+        states = [self._check_owner(job)["state"] for job in cached[1]]
+        return {state: states.count(state) for state in ("queued", "running") + TERMINAL_STATES}
+
+    def shutdown(self) -> None:
+        """Stop dispatching, cancel queued jobs and terminate a running training process."""
+        with self._lock:
+            self._closed = True
+            while self._pending:
+                self._finish(self._jobs[self._pending.popleft()], "cancelled", error="Server shut down")
+            process = self._process
+            self._wake.notify()
+        if process is not None and process.is_alive():
+            process.terminate()
+
+    def _job_file_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _save(self, job: dict) -> None:
+        file_path = self._job_file_path(job["job_id"])
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as job_file:
+            json.dump(job, job_file)
+        os.replace(tmp_path, file_path)
+        # Directory mtimes can be too coarse to tell apart writes in quick succession
+        self._stats_cache = None
+
+    def _load(self, job_id: str, check_owner: bool = True) -> Optional[dict]:
+        try:
+            with open(self._job_file_path(job_id)) as job_file:
+                job = json.load(job_file)
+        except FileNotFoundError:
+            return None
+        return self._check_owner(job) if check_owner else job
+
+    def _load_all(self, check_owner: bool = True) -> List[dict]:
+        """Every job in ``jobs_dir``, oldest first."""
+        if not os.path.isdir(self.jobs_dir):
+            return []
+        jobs = [
+            self._load(name[:-len(".json")], check_owner) for name in os.listdir(self.jobs_dir) if name.endswith(".json")
+        ]
+        return sorted((job for job in jobs if job is not None), key=lambda job: job["submitted_at"])
+
+    @staticmethod
+    def _check_owner(job: dict) -> dict:
+        """``job``, or a failed copy of it when the worker owning the unfinished job has exited."""
+        if job["state"] not in TERMINAL_STATES and job["owner_pid"] != os.getpid() and not _pid_alive(job["owner_pid"]):
+            return dict(job, state="failed", error=f"Worker {job['owner_pid']} exited before the job finished")
+        return job
+
+    def _forget_old_jobs(self, jobs: List[dict]) -> None:
+        """Drop the oldest finished jobs beyond ``history``, from ``jobs_dir`` and from memory."""
+        finished = [job["job_id"] for job in jobs if job["state"] in TERMINAL_STATES]
+        for job_id in finished[:max(0, len(jobs) - self.history)]:
+            try:
+                os.remove(self._job_file_path(job_id))
+            except FileNotFoundError:
+                pass
+        finished = [job_id for job_id, job in self._jobs.items() if job["state"] in TERMINAL_STATES]
+        for job_id in finished[:max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job_id]
+
+    def _finish(self, job: dict, state: str, result: Optional[dict] = None, error: Optional[str] = None,
+                finished_at: Optional[float] = None) -> None:
+        job.update(state=state, result=result, error=error, finished_at=finished_at or time.time())
+        self._save(job)
+        logging.info(f"Training job {job['job_id']} {state}" + (f": {error}" if error else ""))
+        self._forget_old_jobs(self._load_all())
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._lock:
+                # A job queued here may have to wait for one running in another worker
+                while not self._closed and not (self._pending and self._run_lock.acquire(blocking=False)):
+                    self._wake.wait(timeout=0.5 if self._pending else None)
+                if self._closed:
+                    return
+                job_id = self._pending.popleft()
+            try:
+                self._run(job_id)
+            except Exception as e:
+                with self._lock:
+                    self._finish(self._jobs[job_id], "failed", error=str(e))
+            finally:
+                self._run_lock.release()
+
+    def _run(self, job_id: str) -> None:
+        # spawn, not fork: the serving process has event-loop and pool threads that fork would copy mid-state
+        context = multiprocessing.get_context("spawn")
+        events = context.Queue()
+        process = context.Process(
+            target=_job_process_main, args=(self.target, events, self.niceness), name=f"training-{job_id[:8]}"
+        )
+        with self._lock:
+            if self._closed:
+                self._finish(self._jobs[job_id], "cancelled", error="Server shut down")
+                return
+            process.start()
+            self._process = process
+            self._jobs[job_id].update(state="running", started_at=time.time(), pid=process.pid)
+            self._save(self._jobs[job_id])
+
+        finished = False
+        while not finished:
+            try:
+                event = events.get(timeout=0.5)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                try:
+                    event = events.get(timeout=0.5)
+                except queue.Empty:
+                    break
+            finished = self._apply(job_id, event)
+
+        process.join()
+        with self._lock:
+            self._process = None
+            job = self._jobs.get(job_id)
+            if job is not None and job["state"] == "running":
+                state = "cancelled" if self._closed else "failed"
+                self._finish(job, state, error=f"Training process exited with code {process.exitcode}")
+        events.close()
+
+    def _apply(self, job_id: str, event: tuple) -> bool:
+        """Fold one event from the training process into the job record; True once it is final."""
+        with self._lock:
+            job = self._jobs[job_id]
+            if event[0] == "stage":
+                _, stage, kind, timestamp = event
+                if kind == "started":
+                    job["stages"][stage] = {"state": "running", "started_at": timestamp, "finished_at": None}
+                    job["current_stage"] = stage
+                elif stage in job["stages"]:
+                    job["stages"][stage].update(state="succeeded", finished_at=timestamp)
+                self._save(job)
+                return False
+            kind, payload, timestamp = event
+            if kind == "succeeded":
+                job["current_stage"] = None
+                self._finish(job, "succeeded", result=payload, finished_at=timestamp)
+            else:
+                for stage in job["stages"].values():
+                    if stage["state"] == "running":
+                        stage.update(state="failed", finished_at=timestamp)
+                self._finish(job, "failed", error=payload, finished_at=timestamp)
+            return True
+
+    @staticmethod
+    def _snapshot(job: dict) -> dict:
+        """JSON-ready copy of a job record with elapsed seconds per stage (so far, for a running stage)."""
+        now = time.time()
+
+        def seconds(started: Optional[float], finished: Optional[float]) -> Optional[float]:
+            return round((finished or now) - started, 3) if started else None
+
+        result = job["result"] or {}
+        return {
+            "job_id": job["job_id"],
+            "state": job["state"],
+            "pid": job["pid"],
+            "submitted_at": _isoformat(job["submitted_at"]),
+            "started_at": _isoformat(job["started_at"]),
+            "finished_at": _isoformat(job["finished_at"]),
+            "elapsed_seconds": seconds(job["started_at"], job["finished_at"]),
+            "current_stage": job["current_stage"],
+            "stages": [
+                {"name": name, "state": stage["state"], "seconds": seconds(stage["started_at"], stage["finished_at"])}
+                for name, stage in job["stages"].items()
+            ],
+            "artifact_dir": result.get("artifact_dir"),
+            "model_file_path": result.get("model_file_path"),
+            "error": job["error"],
+        }
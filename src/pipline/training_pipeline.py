@@ -1,4 +1,7 @@
+import os
 import sys
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
 from src.exception import MyException
 from src.logger import logging
 
@@ -7,7 +10,10 @@ from src.components.data_validation import DataValidation
 from src.components.data_transformation import DataTransformation
 from src.components.model_trainer import ModelTrainer
 
+from src.utils.artifact_index import record_stage
+
 from src.entity.config_entity import (
+    training_pipeline_config,
     DataIngestionConfig,
     DataValidationConfig,
     DataTransformationConfig,
@@ -23,10 +29,15 @@ from src.entity.artifact_entity import (
 
 
 class TrainPipeline:
-    def __init__(self):
+    def __init__(self, stage_callback: Optional[Callable[[str, str], None]] = None):
         """
         Initialize all configuration objects
+
+        stage_callback, when given, is called as (stage, "started" | "finished") around each
+        stage so a caller (the background training job) can report progress
         """
+        self.stage_callback = stage_callback
+        self.training_pipeline_config = training_pipeline_config
         self.data_ingestion_config = DataIngestionConfig()
         self.data_validation_config = DataValidationConfig()
         self.data_transformation_config = DataTransformationConfig()
@@ -124,29 +135,74 @@ class TrainPipeline:
         except Exception as e:
             raise MyException(e, sys)
 
-    def run_pipeline(self) -> None:
+    def record_stage(self, stage: str, **paths: str) -> None:
+        """
+        Mark a stage of this run as complete in the artifact index read by the serving app
+        """
+        artifact_dir = self.training_pipeline_config.artifact_dir
+        record_stage(
+            base_dir=os.path.dirname(artifact_dir),
+            run_name=os.path.basename(artifact_dir),
+            stage=stage,
+            paths=paths,
+        )
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """
+        Notify stage_callback that a stage started, and that it finished if it did not raise
+        """
+        if self.stage_callback is not None:
+            self.stage_callback(stage, "started")
+        yield
+        if self.stage_callback is not None:
+            self.stage_callback(stage, "finished")
+
+    def run_pipeline(self) -> ModelTrainerArtifact:
         """
-        Run the complete training pipeline
+        Run the complete training pipeline and return the model trainer artifact
         """
         try:
             logging.info("Starting Training Pipeline")
 
-            data_ingestion_artifact = self.start_data_ingestion()
+            with self.stage("data_ingestion"):
+                data_ingestion_artifact = self.start_data_ingestion()
+            self.record_stage(
+                "data_ingestion",
+                train=data_ingestion_artifact.trained_file_path,
+                test=data_ingestion_artifact.test_file_path,
+            )
 
-            data_validation_artifact = self.start_data_validation(
-                data_ingestion_artifact=data_ingestion_artifact
+            with self.stage("data_validation"):
+                data_validation_artifact = self.start_data_validation(
+                    data_ingestion_artifact=data_ingestion_artifact
+                )
+            self.record_stage(
+                "data_validation",
+                report=data_validation_artifact.validation_report_file_path,
             )
 
-            data_transformation_artifact = self.start_data_transformation(
-                data_ingestion_artifact=data_ingestion_artifact,
-                data_validation_artifact=data_validation_artifact
+            with self.stage("data_transformation"):
+                data_transformation_artifact = self.start_data_transformation(
+                    data_ingestion_artifact=data_ingestion_artifact,
+                    data_validation_artifact=data_validation_artifact
+                )
+            self.record_stage(
+                "data_transformation",
+                preprocessor=data_transformation_artifact.transformed_object_file_path,
             )
 
-            model_trainer_artifact = self.start_model_trainer(
-                data_transformation_artifact=data_transformation_artifact
+            with self.stage("model_trainer"):
+                model_trainer_artifact = self.start_model_trainer(
+                    data_transformation_artifact=data_transformation_artifact
+                )
+            self.record_stage(
+                "model_trainer",
+                model=model_trainer_artifact.trained_model_file_path,
             )
 
             logging.info("Training Pipeline completed successfully")
+            return model_trainer_artifact
 
         except Exception as e:
             raise MyException(e, sys)
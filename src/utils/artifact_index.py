@@ -0,0 +1,175 @@
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.constants import ARTIFACT_INDEX_FILE_NAME, ARTIFACT_TIMESTAMP_FORMAT
+from src.exception import MyException
+from src.logger import logging
+from src.utils.file_lock import FileLock
+
+# Files whose presence marks a stage as complete in runs that predate the index; a tuple is
+# satisfied by any one of its files (splits were CSV before they were Parquet)
+STAGE_MARKER_FILES = {
+    "data_ingestion": [(os.path.join("data_ingestion", "ingested", "train.parquet"),
+                        os.path.join("data_ingestion", "ingested", "train.csv")),
+                       (os.path.join("data_ingestion", "ingested", "test.parquet"),
+                        os.path.join("data_ingestion", "ingested", "test.csv"))],
+    "data_validation": [os.path.join("data_validation", "report.yaml")],
+    "data_transformation": [os.path.join("data_transformation", "transformed_object", "preprocessing.pkl")],
+    "model_trainer": [os.path.join("model_trainer", "trained_model", "model.pkl")],
+}
+
+
+def _parse_run_name(name: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(name, ARTIFACT_TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def _has_stage_files(run_dir: str, stage: str) -> bool:
+    return all(any(os.path.exists(os.path.join(run_dir, path)) for path in
+                   (marker if isinstance(marker, tuple) else (marker,))) for marker in STAGE_MARKER_FILES[stage])
+
+
+def scan_artifact_runs(base_dir: str, skip: Iterable[str] = ()) -> Dict[str, dict]:
+    """Build index entries by walking the artifact directory (the pre-index behaviour), except for ``skip``."""
+    runs = {}
+    if not os.path.isdir(base_dir):
+        return runs
+    skip = set(skip)
+    for name in os.listdir(base_dir):
+        run_dir = os.path.join(base_dir, name)
+        if name in skip or not os.path.isdir(run_dir) or _parse_run_name(name) is None:
+            continue
+        stages = {stage: {"completed": True, "paths": {}} for stage in STAGE_MARKER_FILES
+                  if _has_stage_files(run_dir, stage)}
+        runs[name] = {"stages": stages}
+    return runs
+
+
+def record_stage(base_dir: str, run_name: str, stage: str, paths: Optional[Dict[str, str]] = None) -> None:
+    """
+    Mark ``stage`` of run ``run_name`` as complete in ``<base_dir>/index.json``. Paths are stored
+    relative to ``base_dir``. The file is replaced atomically so readers never see a partial write,
+    and writers take ``index.json.lock`` so concurrent runs (in any process) never drop each
+    other's updates.
+    """
+    try:
+        index_path = os.path.join(base_dir, ARTIFACT_INDEX_FILE_NAME)
+        with FileLock(f"{index_path}.lock"):
+            if os.path.exists(index_path):
+                with open(index_path) as index_file:
+                    index = json.load(index_file)
+            else:
+                index = {"runs": scan_artifact_runs(base_dir)}
+
+            run = index["runs"].setdefault(run_name, {"stages": {}})
+            run["stages"][stage] = {
+                "completed": True,
+                "completed_at": datetime.now().isoformat(),
+                "paths": {key: os.path.relpath(value, base_dir) for key, value in (paths or {}).items()},
+            }
+
+            os.makedirs(base_dir, exist_ok=True)
+            tmp_path = f"{index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as index_file:
+                json.dump(index, index_file, indent=2, sort_keys=True)
+            os.replace(tmp_path, index_path)
+        logging.info(f"Artifact index updated: {run_name}/{stage}")
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+class ArtifactIndex:
+    """
+    In-memory view of the artifact index for one base directory.
+
+    The index is merged with a scan of the run directories it does not list (runs copied in
+    from S3, trained before the index existed or outside TrainPipeline), and the result is
+    reused until the index file or the base directory changes, so lookups cost two ``stat``
+    calls instead of a listdir plus several stats per run. A run is only returned as complete
+    once its model and preprocessing files are confirmed on disk, so entries for deleted or
+    pruned runs are skipped.
+    """
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self.index_path = os.path.join(base_dir, ARTIFACT_INDEX_FILE_NAME)
+        self._lock = threading.Lock()
+        self._version = None
+        self._runs: Dict[str, dict] = {}
+        self._ordered = []
+
+    def _current_version(self) -> Tuple:
+        version = []
+        for path in (self.index_path, self.base_dir):
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+
+    def _reload(self, version: Tuple) -> None:
+        runs = {}
+        if version[0] is not None:
+            with open(self.index_path) as index_file:
+                runs = json.load(index_file).get("runs", {})
+        if version[1] is not None:
+            runs = {**scan_artifact_runs(self.base_dir, skip=runs), **runs}
+        ordered = sorted(
+            (name for name in runs if _parse_run_name(name) is not None),
+            key=_parse_run_name,
+            reverse=True,
+        )
+        self._runs, self._ordered, self._version = runs, ordered, version
+
+    def runs(self) -> Dict[str, dict]:
+        version = self._current_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    try:
+                        self._reload(version)
+                    except Exception as e:
+                        logging.error(f"Could not read artifact index {self.index_path}: {e}")
+                        self._runs, self._ordered, self._version = {}, [], None
+        return self._runs
+
+    def stage_status(self, run_name: str) -> Dict[str, bool]:
+        stages = self.runs().get(run_name, {}).get("stages", {})
+        return {stage: bool(stages.get(stage, {}).get("completed")) for stage in STAGE_MARKER_FILES}
+
+    def latest_run(self) -> Optional[str]:
+        self.runs()
+        return self._ordered[0] if self._ordered else None
+
+    def latest_complete_run_dir(self) -> Optional[str]:
+        """Newest run whose preprocessing object and model were both produced and are still on disk."""
+        runs = self.runs()
+        for name in self._ordered:
+            stages = runs[name].get("stages", {})
+            if not (stages.get("data_transformation", {}).get("completed") and
+                    stages.get("model_trainer", {}).get("completed")):
+                continue
+            run_dir = os.path.join(self.base_dir, name)
+            if _has_stage_files(run_dir, "data_transformation") and _has_stage_files(run_dir, "model_trainer"):
+                return run_dir
+            logging.warning(f"Artifact index lists {name} as complete but its model files are gone; skipping it")
+        return None
+
+
+_indexes: Dict[str, ArtifactIndex] = {}
+
+
+def get_artifact_index(base_dir: str) -> ArtifactIndex:
+    """Process-wide ArtifactIndex for ``base_dir``."""
+    key = os.path.abspath(base_dir)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes.setdefault(key, ArtifactIndex(base_dir))
+    return index
@@ -0,0 +1,35 @@
+import importlib
+from typing import Any, Callable, Optional
+
+
+class LazyCallable:
+    """
+    Reference to a ``"package.module:function"`` target that is imported on first call.
+
+    Lets light modules (app.py) hand heavy scoring functions to a batcher or pool without
+    importing pandas/sklearn at import time. Pickles as the target string, so process-pool
+    workers import the target module themselves.
+    """
+
+    def __init__(self, target: str):
+        self.target = target
+        self._fn: Optional[Callable] = None
+
+    def resolve(self) -> Callable:
+        if self._fn is None:
+            module_name, _, attribute = self.target.partition(":")
+            self._fn = getattr(importlib.import_module(module_name), attribute)
+        return self._fn
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __getstate__(self) -> dict:
+        return {"target": self.target}
+
+    def __setstate__(self, state: dict) -> None:
+        self.target = state["target"]
+        self._fn = None
+
+    def __repr__(self) -> str:
+        return f"LazyCallable({self.target!r})"
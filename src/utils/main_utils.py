@@ -1,11 +1,15 @@
 import os
 import sys
 
+from typing import Dict, List, Optional
+
 import numpy as np
 import dill
+import pandas as pd
 import yaml
 from pandas import DataFrame
 
+from src.constants import ARTIFACT_PARQUET_COMPRESSION, SCHEMA_FILE_PATH
 from src.exception import MyException
 from src.logger import logging
 
@@ -83,4 +87,87 @@ def save_object(file_path: str, obj: object) -> None:
         logging.info("Exited the save_object method of utils")
 
     except Exception as e:
-        raise MyException(e, sys) from e
\ No newline at end of file
+        raise MyException(e, sys) from e
+
+
+def schema_column_types(schema_file_path: str = SCHEMA_FILE_PATH) -> Dict[str, str]:
+    """Ordered {column: type} from the ``columns`` list of config/schema.yaml."""
+    return {name: dtype for column in read_yaml_file(schema_file_path)["columns"] for name, dtype in column.items()}
+
+
+def schema_int_dtype(dtype: str) -> np.dtype:
+    """numpy dtype of a schema integer type: 'int' is int64, 'int8'/'int16'/'int32' are as named."""
+    return np.dtype(np.int64 if dtype == "int" else dtype)
+
+
+def cast_to_schema(dataframe: DataFrame, column_types: Optional[Dict[str, str]] = None) -> DataFrame:
+    """
+    Cast the schema columns present in ``dataframe`` to their schema types: categories with
+    sorted categories (so get_dummies drops the same level as it does for strings), integers at
+    the schema width (float64 where values are missing) and float64. Other columns are left as-is.
+    """
+    column_types = schema_column_types() if column_types is None else column_types
+    columns = {}
+    for name in dataframe.columns:
+        series, dtype = dataframe[name], column_types.get(name)
+        if dtype == "category":
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype("category")
+            categories = series.cat.categories
+            if not categories.is_monotonic_increasing:
+                series = series.cat.reorder_categories(categories.sort_values())
+        elif dtype is not None and dtype.startswith("int"):
+            series = series.astype(np.float64 if series.isna().any() else schema_int_dtype(dtype))
+        elif dtype == "float":
+            series = series.astype(np.float64)
+        columns[name] = series
+    return pd.DataFrame(columns, index=dataframe.index, copy=False)
+
+
+def _legacy_csv_path(file_path: str) -> Optional[str]:
+    """The CSV that older runs wrote in place of a Parquet artifact, if it exists."""
+    csv_path = os.path.splitext(file_path)[0] + ".csv"
+    return csv_path if not os.path.exists(file_path) and os.path.exists(csv_path) else None
+
+
+def save_dataframe(file_path: str, dataframe: DataFrame, compression: str = ARTIFACT_PARQUET_COMPRESSION) -> None:
+    """
+    Save a dataset artifact as Parquet with schema column types
+    file_path: str location of file to save
+    dataframe: DataFrame data to save
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        cast_to_schema(dataframe).to_parquet(file_path, index=False, compression=compression)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def load_dataframe(file_path: str, columns: Optional[List[str]] = None) -> DataFrame:
+    """
+    Load a dataset artifact with schema column types, reading only ``columns`` if given.
+    A path ending in .csv, or a Parquet path that only exists as the CSV older runs wrote, is read as CSV.
+    file_path: str location of file to load
+    return: DataFrame data loaded
+    """
+    try:
+        csv_path = file_path if file_path.endswith(".csv") else _legacy_csv_path(file_path)
+        if csv_path is None:
+            return cast_to_schema(pd.read_parquet(file_path, columns=columns))
+        dataframe = pd.read_csv(csv_path, usecols=columns)
+        return cast_to_schema(dataframe if columns is None else dataframe[columns])
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def read_dataframe_columns(file_path: str) -> List[str]:
+    """Column names of a dataset artifact, read from the Parquet footer (or the CSV header) only."""
+    try:
+        csv_path = file_path if file_path.endswith(".csv") else _legacy_csv_path(file_path)
+        if csv_path is not None:
+            return list(pd.read_csv(csv_path, nrows=0).columns)
+        import pyarrow.parquet as pq
+
+        return list(pq.read_schema(file_path).names)
+    except Exception as e:
+        raise MyException(e, sys) from e
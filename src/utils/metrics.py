@@ -0,0 +1,201 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from src.constants import METRICS_ENABLED
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, *labelvalues) -> None:
+        key = tuple(str(value) for value in labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labelvalues) -> float:
+        return self._values.get(tuple(str(value) for value in labelvalues), 0.0)
+
+    def drain(self) -> Dict[Tuple, float]:
+        """Take this process's values and reset them, for a pool worker to hand to its parent."""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[Tuple, float]) -> None:
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = self._values.get(key, 0.0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues) -> None:
+        key = tuple(str(label) for label in labelvalues)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labelvalues) -> int:
+        series = self._series.get(tuple(str(label) for label in labelvalues))
+        return 0 if series is None else series[2]
+
+    def drain(self) -> Dict[Tuple, list]:
+        """Take this process's observations and reset them, for a pool worker to hand to its parent."""
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def merge(self, series: Dict[Tuple, list]) -> None:
+        with self._lock:
+            for key, (bucket_counts, total, count) in series.items():
+                own = self._series.get(key)
+                if own is None:
+                    own = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                own[0] = [mine + theirs for mine, theirs in zip(own[0], bucket_counts)]
+                own[1] += total
+                own[2] += count
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    labels = _format_labels(self.labelnames, key, 'le="%s"' % le)
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labelvalues", "started")
+
+    def __init__(self, histogram: Histogram, labelvalues: Tuple):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labelvalues)
+        return False
+
+
+_NOOP = nullcontext()
+
+STAGE_LATENCY = Histogram(
+    "vehicle_stage_latency_seconds",
+    "Latency of serving stages (form_parsing, encoding, model_load, preprocessing_transform, "
+    "forest_inference, template_rendering).",
+    labelnames=("stage",),
+)
+PREDICTIONS = Counter("vehicle_predictions_total", "Predictions served, by predicted class.", labelnames=("class",))
+ERRORS = Counter("vehicle_errors_total", "Requests that failed, by route.", labelnames=("route",))
+BATCH_SIZE = Histogram(
+    "vehicle_batch_size", "Rows per coalesced model call made by the prediction batcher.", buckets=BATCH_SIZE_BUCKETS
+)
+_METRICS = (STAGE_LATENCY, PREDICTIONS, ERRORS, BATCH_SIZE)
+
+
+def timed(stage: str):
+    """Context manager recording the block's duration under ``stage``; a shared no-op when metrics are off."""
+    if not METRICS_ENABLED:
+        return _NOOP
+    return _Timer(STAGE_LATENCY, (stage,))
+
+
+def count_predictions(labels: Iterable) -> None:
+    if not METRICS_ENABLED:
+        return
+    # Only reached after a model call, so numpy is already loaded; keeps app import light
+    import numpy as np
+
+    values, counts = np.unique(np.asarray(labels), return_counts=True)
+    for value, count in zip(values, counts):
+        PREDICTIONS.inc(count, int(value))
+
+
+def count_error(route: str) -> None:
+    if METRICS_ENABLED:
+        ERRORS.inc(1, route)
+
+
+def observe_batch_size(size: int) -> None:
+    if METRICS_ENABLED:
+        BATCH_SIZE.observe(size)
+
+
+def drain_metrics() -> Dict[str, dict]:
+    """
+    Everything recorded in this process since the last drain, reset to zero. Inference pool
+    worker processes send this back with each result so the parent's /metrics includes them.
+    """
+    return {metric.name: metric.drain() for metric in _METRICS}
+
+
+def merge_metrics(drained: Dict[str, dict]) -> None:
+    """Add the output of drain_metrics() from another process to this process's metrics."""
+    for metric in _METRICS:
+        metric.merge(drained.get(metric.name, {}))
+
+
+def render_gauges(prefix: str, stats: dict) -> List[str]:
+    """Render the numeric entries of a stats() dict as Prometheus gauges named ``<prefix>_<key>``."""
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines.extend([f"# TYPE {name} gauge", f"{name} {value}"])
+    return lines
+
+
+def render_metrics(extra_lines: Iterable[str] = ()) -> str:
+    """Prometheus text exposition of every serving metric plus ``extra_lines``."""
+    lines = [line for metric in _METRICS for line in metric.render()]
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
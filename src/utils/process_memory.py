@@ -0,0 +1,33 @@
+import os
+from typing import Dict, Union
+
+# smaps_rollup fields (kB) summed into each reported figure
+_FIELDS = {
+    "rss_bytes": ("Rss",),
+    "pss_bytes": ("Pss",),
+    "shared_bytes": ("Shared_Clean", "Shared_Dirty"),
+    "private_bytes": ("Private_Clean", "Private_Dirty"),
+    # Anonymous / written pages: what a process really costs on its own. File-backed pages
+    # such as a memory-mapped model count as private while only one process maps them.
+    "private_dirty_bytes": ("Private_Dirty",),
+}
+
+
+def process_memory(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """
+    RSS / PSS / shared / private memory of a process from /proc/<pid>/smaps_rollup.
+    Returns an empty dict where that file is unavailable (non-Linux hosts, old kernels).
+    """
+    path = os.path.join("/proc", str(pid), "smaps_rollup")
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return {}
+
+    kilobytes = {}
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 3 and parts[2] == "kB":
+            kilobytes[parts[0].rstrip(":")] = int(parts[1])
+    return {name: sum(kilobytes.get(field, 0) for field in fields) * 1024 for name, fields in _FIELDS.items()}
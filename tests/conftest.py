@@ -0,0 +1,27 @@
+import pytest
+
+from src.entity.estimator import MyModel
+from tests.helpers import make_trained_model, write_artifact
+
+
+@pytest.fixture(scope="session")
+def trained_model() -> MyModel:
+    return make_trained_model()
+
+
+@pytest.fixture
+def artifact_dir(tmp_path, trained_model) -> str:
+    base_dir = str(tmp_path / "artifact")
+    write_artifact(base_dir, "01_01_2026_00_00_00", trained_model)
+    return base_dir
+
+
+@pytest.fixture
+def serving_model(artifact_dir, monkeypatch):
+    """Point the process-wide model cache at ``artifact_dir`` for one test, starting and ending empty."""
+    from src.pipline.prediction_pipeline import model_cache
+
+    monkeypatch.setattr(model_cache, "base_dir", artifact_dir)
+    model_cache.clear()
+    yield model_cache
+    model_cache.clear()
@@ -0,0 +1,65 @@
+"""Plain test helpers shared across test modules; fixtures live in conftest.py."""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_synthetic_model
+from src.entity.estimator import MyModel
+from src.utils.main_utils import save_object
+
+
+def make_raw_frame(n_rows: int) -> pd.DataFrame:
+    """Synthetic rows in the raw config/schema.yaml layout (``id`` included, no ``Response``)."""
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "id": np.arange(1, n_rows + 1),
+        "Gender": rng.choice(["Male", "Female"], n_rows),
+        "Age": rng.integers(20, 80, n_rows),
+        "Driving_License": rng.integers(0, 2, n_rows),
+        "Region_Code": rng.integers(0, 52, n_rows).astype(float),
+        "Previously_Insured": rng.integers(0, 2, n_rows),
+        "Vehicle_Age": rng.choice(["< 1 Year", "1-2 Year", "> 2 Years"], n_rows),
+        "Vehicle_Damage": rng.choice(["Yes", "No"], n_rows),
+        "Annual_Premium": rng.uniform(2630, 100000, n_rows).round(1),
+        "Policy_Sales_Channel": rng.integers(1, 160, n_rows).astype(float),
+        "Vintage": rng.integers(10, 300, n_rows),
+    })
+
+
+def make_trained_model(n_rows: int = 400, seed: int = 7) -> MyModel:
+    """A small, noise-free synthetic model, quick enough to fit per test session."""
+    return make_synthetic_model(n_rows, n_estimators=15, max_depth=6, seed=seed, noise=0.0, class_weight="balanced")
+
+
+def write_artifact(base_dir: str, timestamp: str, model: MyModel) -> str:
+    """Write model.pkl and preprocessing.pkl in the training pipeline's artifact layout."""
+    artifact_dir = os.path.join(base_dir, timestamp)
+    save_object(os.path.join(artifact_dir, "model_trainer", "trained_model", "model.pkl"), model)
+    save_object(
+        os.path.join(artifact_dir, "data_transformation", "transformed_object", "preprocessing.pkl"),
+        model.preprocessing_object,
+    )
+    return artifact_dir
+
+
+def fake_training_pipeline(report):
+    """TrainingJobManager target; runs in a spawned process, so it has to live at module level."""
+    assert os.nice(0) >= 5, "training process was not reniced"
+    for stage in ("data_ingestion", "model_trainer"):
+        report(stage, "started")
+        time.sleep(0.05)
+        report(stage, "finished")
+    return {"artifact_dir": "artifact/run", "model_file_path": "artifact/run/model.pkl"}
+
+
+def wait_for_job(manager, job_id, states=("succeeded", "failed", "cancelled"), timeout=60):
+    """Poll a TrainingJobManager until the job reaches one of ``states``."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job["state"] in states:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} still {manager.get(job_id)['state']}")
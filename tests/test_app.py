@@ -1,6 +1,9 @@
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 from app import app
+from tests.helpers import fake_training_pipeline, make_raw_frame, wait_for_job
 
 client = TestClient(app)
 
@@ -31,3 +34,183 @@ def test_prediction_endpoint_structure():
     
     response = client.post("/", data=test_payload)
     assert response.status_code == 200
+
+def test_batch_prediction_rejects_empty_payload():
+    response = client.post("/predict/batch", json={"records": []})
+    assert response.status_code == 400
+    assert response.json()["status"] is False
+
+
+@pytest.mark.usefixtures("serving_model")
+def test_batch_prediction_scores_records():
+    record = {
+        "Gender": "Male", "Age": 40, "Driving_License": 1, "Region_Code": 28.0,
+        "Previously_Insured": 0, "Annual_Premium": 55555.0, "Policy_Sales_Channel": 26.0,
+        "Vintage": 520, "Vehicle_Age": "> 2 Years", "Vehicle_Damage": "Yes",
+    }
+    response = client.post("/predict/batch", json=[record] * 3)
+    data = response.json()
+    assert response.status_code == 200
+    assert data["count"] == 3
+    assert len(data["predictions"]) == len(data["probabilities"]) == 3
+
+
+@pytest.mark.usefixtures("serving_model")
+def test_metrics_endpoint_exposes_stage_histograms():
+    record = {
+        "Gender": "Female", "Age": 30, "Driving_License": 1, "Region_Code": 8.0,
+        "Previously_Insured": 1, "Annual_Premium": 30000.0, "Policy_Sales_Channel": 152.0,
+        "Vintage": 100, "Vehicle_Age": "< 1 Year", "Vehicle_Damage": "No",
+    }
+    client.post("/predict/batch", json=[record] * 2)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    for stage in ("model_load", "encoding", "preprocessing_transform", "forest_inference"):
+        assert f'vehicle_stage_latency_seconds_count{{stage="{stage}"}}' in body
+    assert "vehicle_predictions_total{" in body
+    assert "vehicle_inference_completed" in body
+
+
+def test_overloaded_inference_returns_503(monkeypatch):
+    import app as app_module
+    from src.pipline.inference_executor import InferenceOverloadedError
+
+    async def overloaded(*args, **kwargs):
+        raise InferenceOverloadedError("full")
+
+    monkeypatch.setattr(app_module.inference_executor, "run", overloaded)
+    response = client.post("/predict/batch", json=[{"Gender": "Male"}])
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.usefixtures("serving_model")
+def test_csv_stream_scores_every_row():
+    raw = make_raw_frame(120)
+    response = client.post("/predict/csv?format=ndjson", content=raw.to_csv(index=False).encode())
+    assert response.status_code == 200
+    lines = response.text.strip().split("\n")
+    assert len(lines) == 120
+    assert '"id": 1,' in lines[0]
+
+
+def test_csv_stream_rejects_missing_columns():
+    response = client.post("/predict/csv", content=b"id,Gender\n1,Male\n")
+    assert response.status_code == 400
+
+
+def test_importing_app_skips_heavy_modules():
+    import subprocess
+    import sys
+
+    heavy = ["pandas", "sklearn", "imblearn", "boto3", "src.pipline.prediction_pipeline", "src.pipline.training_pipeline"]
+    script = f"import sys, app; print([m for m in {heavy!r} if m in sys.modules])"
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+    assert output.strip().splitlines()[-1] == "[]"
+
+
+@pytest.mark.usefixtures("serving_model")
+def test_lifespan_warms_model_before_ready(artifact_dir, monkeypatch):
+    import app as app_module
+
+    monkeypatch.setattr(app_module, "readiness", {"ready": False, "error": None})
+    with TestClient(app) as warm_client:
+        deadline = time.monotonic() + 30
+        response = warm_client.get("/ready")
+        while response.status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            response = warm_client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+    assert response.json()["artifact_dir"].startswith(artifact_dir)
+
+
+def test_train_route_returns_a_job_id_and_status(monkeypatch, tmp_path):
+    import app as app_module
+    from src.pipline.training_jobs import TrainingJobManager
+
+    manager = TrainingJobManager(target=fake_training_pipeline, niceness=5, jobs_dir=str(tmp_path))
+    monkeypatch.setattr(app_module, "training_jobs", manager)
+    try:
+        response = client.get("/train")
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.json()["status_url"] == f"/train/{job_id}"
+        wait_for_job(manager, job_id)
+        # Any worker can answer for the job, not only the one that started it
+        monkeypatch.setattr(app_module, "training_jobs", TrainingJobManager(jobs_dir=str(tmp_path)))
+        status = client.get(f"/train/{job_id}").json()
+    finally:
+        manager.shutdown()
+
+    assert status["state"] == "succeeded"
+    assert status["model_file_path"] == "artifact/run/model.pkl"
+    assert client.get("/train/unknown").status_code == 404
+
+
+def test_stats_and_metrics_report_mongo_pool(monkeypatch):
+    from src.configuration.mongo_db_connection import MongoDBClient
+
+    for name in ("client", "pool_counters", "_owned_client", "_owner_pid"):
+        monkeypatch.setattr(MongoDBClient, name, None)
+    monkeypatch.setenv("MONGODB_URL", "mongodb://localhost:1")
+    mongo_client = MongoDBClient.get_client()  # connect=False: no socket is opened
+    try:
+        pool = client.get("/stats").json()["mongo_pool"]
+        metrics = client.get("/metrics").text
+    finally:
+        mongo_client.close()
+    assert pool["client"] == "pymongo" and pool["checkouts"] == 0 and pool["checkout_waits"] == 0
+    assert "vehicle_mongo_pool_checkout_waits 0" in metrics
+
+
+def test_ready_probes_do_not_start_warm_ups(monkeypatch):
+    import app as app_module
+    from src.pipline import prediction_pipeline
+
+    attempts = []
+
+    def failing_warm_up():
+        attempts.append(1)
+        raise RuntimeError("no model yet")
+
+    monkeypatch.setattr(prediction_pipeline, "warm_up_serving", failing_warm_up)
+    monkeypatch.setattr(app_module, "readiness", {"ready": False, "error": None})
+    monkeypatch.setattr(app_module, "WARM_UP_RETRY_SECONDS", 60)
+    with TestClient(app) as probe_client:
+        deadline = time.monotonic() + 10
+        while app_module.readiness["error"] is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        responses = [probe_client.get("/ready") for _ in range(5)]
+    assert all(response.status_code == 503 for response in responses)
+    assert responses[-1].json()["error"] == "no model yet"
+    assert len(attempts) == 1
+
+
+@pytest.mark.usefixtures("serving_model")
+def test_csv_stream_failures_are_rejected_or_abort_the_transfer(monkeypatch):
+    from functools import partial
+
+    from src.pipline import stream_scoring
+
+    monkeypatch.setattr(stream_scoring, "CsvChunkReader", partial(stream_scoring.CsvChunkReader, chunk_rows=50))
+    score_csv_block = stream_scoring.score_csv_block
+    scored_blocks = []
+
+    def fail_on_second_block(block):
+        scored_blocks.append(block)
+        if len(scored_blocks) == 2:
+            raise ValueError("could not parse row 73")
+        return score_csv_block(block)
+
+    monkeypatch.setattr(stream_scoring, "score_csv_block", fail_on_second_block)
+    body = make_raw_frame(120).to_csv(index=False).encode()
+    with pytest.raises(ValueError, match="row 73"):
+        client.post("/predict/csv", content=body)
+    # Block 1 streamed, block 2 failed, so the transfer was aborted after block 2
+    assert len(scored_blocks) == 2
+
+    scored_blocks[:] = [b"so the first block is the one that fails"]
+    rejected = client.post("/predict/csv", content=body)
+    assert rejected.status_code == 400 and "row 73" in rejected.json()["error"]
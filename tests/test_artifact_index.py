@@ -0,0 +1,83 @@
+import json
+import os
+import shutil
+
+from src.utils.artifact_index import ArtifactIndex, record_stage
+from tests.helpers import write_artifact
+
+
+def test_index_falls_back_to_directory_scan(artifact_dir):
+    index = ArtifactIndex(artifact_dir)
+    assert index.latest_run() == "01_01_2026_00_00_00"
+    assert index.stage_status("01_01_2026_00_00_00")["model_trainer"] is True
+    assert index.latest_complete_run_dir() == os.path.join(artifact_dir, "01_01_2026_00_00_00")
+
+
+def test_recorded_stages_are_picked_up_by_mtime(artifact_dir, trained_model):
+    index = ArtifactIndex(artifact_dir)
+    assert index.latest_run() == "01_01_2026_00_00_00"
+
+    run_dir = os.path.join(artifact_dir, "02_01_2026_00_00_00")
+    record_stage(artifact_dir, "02_01_2026_00_00_00", "data_transformation",
+                 {"preprocessor": os.path.join(run_dir, "preprocessing.pkl")})
+    assert index.latest_run() == "02_01_2026_00_00_00"
+    assert index.stage_status("02_01_2026_00_00_00")["data_transformation"] is True
+    # Not complete until the model exists
+    assert index.latest_complete_run_dir().endswith("01_01_2026_00_00_00")
+
+    write_artifact(artifact_dir, "02_01_2026_00_00_00", trained_model)
+    record_stage(artifact_dir, "02_01_2026_00_00_00", "model_trainer")
+    assert index.latest_complete_run_dir().endswith("02_01_2026_00_00_00")
+    # Runs that existed before the index was created are kept
+    assert "01_01_2026_00_00_00" in index.runs()
+
+
+def test_index_is_not_reread_while_unchanged(artifact_dir, monkeypatch):
+    record_stage(artifact_dir, "02_01_2026_00_00_00", "data_ingestion")
+    index = ArtifactIndex(artifact_dir)
+    index.runs()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("index re-read without a change")
+
+    monkeypatch.setattr(index, "_reload", fail)
+    assert index.latest_run() == "02_01_2026_00_00_00"
+
+
+def test_missing_base_dir_has_no_runs(tmp_path):
+    index = ArtifactIndex(str(tmp_path / "nothing"))
+    assert index.latest_run() is None
+    assert index.latest_complete_run_dir() is None
+
+
+def test_concurrent_writers_in_separate_processes_keep_every_stage(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    run_names = [f"0{day}_01_2026_00_00_00" for day in range(1, 9)]
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(record_stage, [str(tmp_path)] * len(run_names), run_names, ["data_ingestion"] * len(run_names)))
+    assert sorted(ArtifactIndex(str(tmp_path)).runs()) == run_names
+
+
+def test_indexed_run_whose_files_are_gone_is_skipped(artifact_dir, trained_model):
+    for run_name in ("01_01_2026_00_00_00", "02_01_2026_00_00_00"):
+        write_artifact(artifact_dir, run_name, trained_model)
+        for stage in ("data_transformation", "model_trainer"):
+            record_stage(artifact_dir, run_name, stage)
+    index = ArtifactIndex(artifact_dir)
+    assert index.latest_complete_run_dir().endswith("02_01_2026_00_00_00")
+
+    shutil.rmtree(os.path.join(artifact_dir, "02_01_2026_00_00_00"))
+    assert index.latest_complete_run_dir().endswith("01_01_2026_00_00_00")
+
+
+def test_newer_run_missing_from_the_index_is_still_found(artifact_dir, trained_model):
+    for stage in ("data_transformation", "model_trainer"):
+        record_stage(artifact_dir, "01_01_2026_00_00_00", stage)
+    index = ArtifactIndex(artifact_dir)
+    assert index.latest_complete_run_dir().endswith("01_01_2026_00_00_00")
+
+    # Copied in from S3 or trained by demo.py, so never recorded in index.json
+    write_artifact(artifact_dir, "03_01_2026_00_00_00", trained_model)
+    assert index.latest_complete_run_dir().endswith("03_01_2026_00_00_00")
+    assert "03_01_2026_00_00_00" not in json.load(open(os.path.join(artifact_dir, "index.json")))["runs"]
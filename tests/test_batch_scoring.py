@@ -0,0 +1,27 @@
+import glob
+
+import pandas as pd
+
+from src.pipline.batch_scoring import main
+from src.pipline.prediction_pipeline import ModelCache, VehicleDataClassifier, score_raw_dataframe
+
+from tests.helpers import make_raw_frame
+
+
+def test_batch_scoring_preserves_row_order(artifact_dir, tmp_path):
+    raw = make_raw_frame(250)
+    input_path = str(tmp_path / "book.parquet")
+    raw.to_parquet(input_path, index=False)
+    output_dir = str(tmp_path / "scored")
+
+    summary = main(["--input", input_path, "--output", output_dir, "--workers", "2",
+                    "--chunk-size", "60", "--artifact-dir", artifact_dir])
+
+    assert summary["rows"] == 250
+    assert summary["partitions"] == 5
+    parts = sorted(glob.glob(f"{output_dir}/part-*.csv"))
+    scored = pd.concat([pd.read_csv(part) for part in parts], ignore_index=True)
+    assert scored["id"].tolist() == raw["id"].tolist()
+
+    expected = score_raw_dataframe(raw, VehicleDataClassifier(cache=ModelCache(base_dir=artifact_dir)))
+    assert scored["prediction"].tolist() == expected["prediction"].tolist()
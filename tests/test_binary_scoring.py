@@ -0,0 +1,58 @@
+import io
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from benchmarks.synthetic import make_feature_frame
+from src.entity.estimator import EXPECTED_COLUMNS
+
+client = TestClient(app)
+
+
+def _arrow_body(table: pa.Table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _post(body: bytes, content_type: str):
+    return client.post("/predict/batch", content=body, headers={"Content-Type": content_type})
+
+
+@pytest.mark.usefixtures("serving_model")
+def test_binary_formats_match_the_json_path(trained_model):
+    features = make_feature_frame(50, seed=3)
+    expected = trained_model.predict_with_scores(features)
+    npy = io.BytesIO()
+    np.save(npy, features.to_numpy(dtype=np.float64))
+    table = pa.Table.from_pandas(features, preserve_index=False).append_column("id", pa.array(np.arange(50) + 100))
+    npy_response = _post(npy.getvalue(), "application/x-npy")
+    arrow_response = _post(_arrow_body(table), "application/vnd.apache.arrow.stream")
+
+    assert npy_response.status_code == 200, npy_response.text
+    assert npy_response.headers["x-row-count"] == "50"
+    scored = np.load(io.BytesIO(npy_response.content))
+    np.testing.assert_array_equal(scored[:, 0], expected.labels)
+    np.testing.assert_allclose(scored[:, 1], expected.probabilities)
+
+    assert arrow_response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    result = pa.ipc.open_stream(arrow_response.content).read_all()
+    assert result.column_names == ["id", "prediction", "probability"]
+    assert result.column("id").to_pylist() == list(range(100, 150))
+    np.testing.assert_array_equal(result.column("prediction").to_numpy(), expected.labels)
+    np.testing.assert_allclose(result.column("probability").to_numpy(), expected.probabilities)
+    assert float(result.schema.metadata[b"threshold"]) == expected.threshold
+
+
+def test_malformed_binary_batches_are_rejected():
+    wrong_width = io.BytesIO()
+    np.save(wrong_width, np.zeros((3, len(EXPECTED_COLUMNS) - 1)))
+    missing_column = pa.table({"Age": [40]})
+
+    assert _post(wrong_width.getvalue(), "application/x-npy").status_code == 400
+    assert _post(b"not numpy", "application/x-npy").status_code == 400
+    assert _post(_arrow_body(missing_column), "application/vnd.apache.arrow.stream").status_code == 400
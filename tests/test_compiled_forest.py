@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.entity.compiled_forest import CompiledForest, forest_size_report
+from src.exception import MyException
+from src.pipline.prediction_pipeline import ModelCache
+
+from benchmarks.synthetic import make_feature_frame
+
+
+def _fitted_forest():
+    rng = np.random.default_rng(3)
+    features = rng.normal(size=(2000, 11))
+    target = (features[:, 0] + features[:, 3] * features[:, 5] + rng.normal(size=2000) > 0).astype(float)
+    forest = RandomForestClassifier(n_estimators=40, max_depth=10, min_samples_leaf=6, criterion="entropy",
+                                    class_weight="balanced", random_state=101)
+    return forest.fit(features, target), rng.normal(size=(3000, 11))
+
+
+def test_compiled_forest_matches_sklearn_exactly():
+    forest, features = _fitted_forest()
+    compiled = CompiledForest.from_sklearn(forest)
+    assert np.array_equal(compiled.predict_proba(features), forest.predict_proba(features))
+    assert np.array_equal(compiled.predict(features), forest.predict(features))
+    assert np.array_equal(compiled.predict_proba(features[0]), forest.predict_proba(features[:1]))
+
+
+def test_compiled_forest_round_trips_through_file(tmp_path):
+    forest, features = _fitted_forest()
+    file_path = str(tmp_path / "compiled_forest.npz")
+    CompiledForest.from_sklearn(forest).save(file_path)
+    loaded = CompiledForest.load(file_path)
+    assert np.array_equal(loaded.predict_proba(features), forest.predict_proba(features))
+
+
+def test_model_cache_serves_compiled_forest_when_exported(artifact_dir, trained_model):
+    model_dir = os.path.join(artifact_dir, "01_01_2026_00_00_00", "model_trainer", "trained_model")
+    CompiledForest.from_sklearn(trained_model.trained_model_object).save(os.path.join(model_dir, "compiled_forest.npz"))
+
+    loaded = ModelCache(base_dir=artifact_dir, poll_interval=3600).get()
+    assert isinstance(loaded.model._classifier(), CompiledForest)
+    frame = make_feature_frame(100, seed=9)
+    assert np.array_equal(loaded.model.predict_proba(frame.copy()), trained_model.predict_proba(frame.copy()))
+
+
+def test_compiled_forest_uses_narrow_dtypes_and_leaf_only_values():
+    forest, _ = _fitted_forest()
+    compiled = CompiledForest.from_sklearn(forest)
+    assert compiled.feature.dtype == np.uint8
+    assert compiled.threshold.dtype == np.float32
+    assert compiled.children.dtype == np.int16
+    assert len(compiled.leaf_value) == sum(e.tree_.n_leaves for e in forest.estimators_)
+    assert compiled.nbytes < forest_size_report(forest, compiled)["sklearn_tree_array_bytes"] / 4
+
+
+def test_compiled_forest_rejects_other_format_versions(tmp_path):
+    forest, _ = _fitted_forest()
+    compiled = CompiledForest.from_sklearn(forest)
+    file_path = str(tmp_path / "compiled_forest.npz")
+    compiled.save(file_path)
+    with np.load(file_path) as data:
+        arrays = dict(data)
+    arrays["meta"] = np.array([compiled.n_features_in_, compiled.max_depth, 1])
+    np.savez(file_path, **arrays)
+
+    with pytest.raises(MyException, match="compiled forest format 1, expected 2"):
+        CompiledForest.load(file_path)
+
+
+def test_model_cache_maps_serving_model_without_unpickling(artifact_dir, trained_model, monkeypatch):
+    from src.entity.estimator import MyModel
+    from src.entity.fused_preprocessor import FusedPreprocessor
+    from src.pipline import prediction_pipeline
+
+    model_dir = os.path.join(artifact_dir, "01_01_2026_00_00_00", "model_trainer", "trained_model")
+    serving = MyModel(preprocessing_object=None, trained_model_object=None)
+    serving.compiled_forest = CompiledForest.from_sklearn(trained_model.trained_model_object)
+    serving.fused_preprocessor = FusedPreprocessor.from_pipeline(trained_model.preprocessing_object)
+    serving.save_serving_model(os.path.join(model_dir, "serving_model"))
+
+    def no_unpickling(*args, **kwargs):
+        raise AssertionError("model.pkl should not be unpickled when a serving model exists")
+
+    monkeypatch.setattr(prediction_pipeline.pickle, "load", no_unpickling)
+    loaded = ModelCache(base_dir=artifact_dir, poll_interval=3600).get()
+    assert isinstance(loaded.model._classifier().leaf_value, np.memmap)
+    frame = make_feature_frame(100, seed=9)
+    assert np.array_equal(loaded.model.predict_proba(frame.copy()), trained_model.predict_proba(frame.copy()))
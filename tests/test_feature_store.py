@@ -0,0 +1,108 @@
+import mongomock
+import numpy as np
+import pandas as pd
+import pytest
+from bson import json_util
+
+from src.components.data_ingestion import DataIngestion
+from src.configuration.mongo_db_connection import MongoDBClient
+from src.data_access.feature_store import FeatureStore
+from src.entity.config_entity import DataIngestionConfig
+from src.exception import MyException
+from src.utils.main_utils import load_dataframe, read_dataframe_columns, save_dataframe
+from tests.helpers import make_raw_frame
+
+
+def _documents(ids):
+    raw = make_raw_frame(len(ids))
+    raw["id"] = list(ids)
+    raw["Response"] = np.arange(len(ids)) % 2
+    return raw.to_dict("records")
+
+
+def _ingestion(tmp_path, run: str, **overrides) -> DataIngestion:
+    run_dir = tmp_path / run / "data_ingestion"
+    config = DataIngestionConfig(
+        data_ingestion_dir=str(run_dir),
+        feature_store_file_path=str(run_dir / "feature_store" / "data.parquet"),
+        training_file_path=str(run_dir / "ingested" / "train.parquet"),
+        testing_file_path=str(run_dir / "ingested" / "test.parquet"),
+        feature_store_dir=str(tmp_path / "feature_store" / "Proj1-Data"),
+        incremental=True,
+        **overrides,
+    )
+    return DataIngestion(config)
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(MongoDBClient, "client", client)
+    collection = client["Proj1"]["Proj1-Data"]
+    collection.insert_many(_documents(range(1, 41)))
+    return collection
+
+
+def test_incremental_runs_append_only_new_documents(collection, tmp_path):
+    first = _ingestion(tmp_path, "run1").initiate_data_ingestion()
+    store = FeatureStore(str(tmp_path / "feature_store" / "Proj1-Data"))
+    assert [part["rows"] for part in store.read_state()["parts"]] == [40]
+
+    collection.insert_many(_documents(range(41, 51)))
+    second = _ingestion(tmp_path, "run2").initiate_data_ingestion()
+    state = store.read_state()
+    assert [part["rows"] for part in state["parts"]] == [40, 10]
+    assert state["watermark"] == collection.find_one(sort=[("_id", -1)])["_id"]
+
+    split = pd.concat([load_dataframe(second.trained_file_path), load_dataframe(second.test_file_path)])
+    assert sorted(split["id"]) == list(range(1, 51))
+    assert len(load_dataframe(first.trained_file_path)) + len(load_dataframe(first.test_file_path)) == 40
+    with open(tmp_path / "run2" / "data_ingestion" / "feature_store" / "manifest.json") as f:
+        manifest = json_util.loads(f.read())
+    assert manifest["parts"] == ["part-00000.parquet", "part-00001.parquet"] and manifest["rows"] == 50
+    assert manifest["watermark_from"] == state["parts"][0]["watermark"] and manifest["watermark_to"] == state["watermark"]
+    # The manifest pins the run's input even after later runs append
+    collection.insert_many(_documents(range(51, 56)))
+
+    _ingestion(tmp_path, "run3").initiate_data_ingestion()
+    assert len(store.read_state()["parts"]) == 3
+    assert sorted(store.read(parts=manifest["parts"])["id"]) == list(range(1, 51))
+    _ingestion(tmp_path, "run4").initiate_data_ingestion()
+    assert len(store.read_state()["parts"]) == 3
+
+
+def test_store_rejects_a_different_watermark_field(collection, tmp_path):
+    _ingestion(tmp_path, "run1").initiate_data_ingestion()
+    with pytest.raises(MyException, match="watermarked on '_id'"):
+        _ingestion(tmp_path, "run2", watermark_field="id").initiate_data_ingestion()
+
+
+def test_update_timestamp_watermark_keeps_the_latest_version(collection, tmp_path):
+    collection.update_many({}, {"$set": {"updated_at": 1}})
+    _ingestion(tmp_path, "run1", watermark_field="updated_at").initiate_data_ingestion()
+
+    collection.update_one({"id": 7}, {"$set": {"Age": 99, "updated_at": 2}})
+    collection.insert_many([dict(document, updated_at=2) for document in _documents([41])])
+    _ingestion(tmp_path, "run2", watermark_field="updated_at").initiate_data_ingestion()
+
+    store = FeatureStore(str(tmp_path / "feature_store" / "Proj1-Data"))
+    assert [part["rows"] for part in store.read_state()["parts"]] == [40, 2]
+    combined = store.read(deduplicate_on="id")
+    assert len(combined) == 41 and combined.set_index("id").loc[7, "Age"] == 99
+
+
+def test_parquet_artifacts_keep_schema_types_and_fall_back_to_csv(tmp_path):
+    frame = pd.DataFrame(_documents(range(1, 21)))
+    save_dataframe(str(tmp_path / "train.parquet"), frame)
+    frame.to_csv(tmp_path / "test.csv", index=False)
+
+    typed = load_dataframe(str(tmp_path / "train.parquet"))
+    assert typed["Gender"].dtype == "category" and list(typed["Vehicle_Age"].cat.categories) == sorted(
+        frame["Vehicle_Age"].unique())
+    assert typed["Previously_Insured"].dtype == np.int8 and typed["Age"].dtype == np.int16
+
+    # Runs from before Parquet artifacts only have the CSV next to the Parquet path
+    legacy = load_dataframe(str(tmp_path / "test.parquet"), columns=["Response", "Gender"])
+    assert list(legacy.columns) == ["Response", "Gender"] and legacy["Gender"].dtype == "category"
+    assert read_dataframe_columns(str(tmp_path / "test.parquet")) == list(frame.columns)
+    assert read_dataframe_columns(str(tmp_path / "train.parquet")) == list(frame.columns)
@@ -0,0 +1,39 @@
+import os
+
+import numpy as np
+
+from src.entity.estimator import EXPECTED_COLUMNS
+from src.entity.fused_preprocessor import FusedPreprocessor
+from src.pipline.prediction_pipeline import ModelCache
+
+from benchmarks.synthetic import make_feature_frame
+
+
+def test_fused_kernel_matches_column_transformer_exactly(trained_model):
+    frame = make_feature_frame(500, seed=13)
+    kernel = FusedPreprocessor.from_pipeline(trained_model.preprocessing_object)
+    expected = trained_model.preprocessing_object.transform(frame)
+    assert np.array_equal(kernel.transform(frame.to_numpy(dtype=np.float64)), expected)
+
+
+def test_fused_kernel_reorders_inputs(trained_model, tmp_path):
+    frame = make_feature_frame(50, seed=14)
+    shuffled = list(reversed(EXPECTED_COLUMNS))
+    file_path = str(tmp_path / "preprocessing_kernel.npz")
+    FusedPreprocessor.from_pipeline(trained_model.preprocessing_object).save(file_path)
+
+    kernel = FusedPreprocessor.load(file_path).with_input_columns(shuffled)
+    assert np.array_equal(kernel.transform(frame[shuffled].to_numpy(dtype=np.float64)),
+                          trained_model.preprocessing_object.transform(frame))
+
+
+def test_model_cache_serves_fused_kernel_when_exported(artifact_dir, trained_model):
+    object_dir = os.path.join(artifact_dir, "01_01_2026_00_00_00", "data_transformation", "transformed_object")
+    FusedPreprocessor.from_pipeline(trained_model.preprocessing_object).save(
+        os.path.join(object_dir, "preprocessing_kernel.npz"))
+
+    loaded = ModelCache(base_dir=artifact_dir, poll_interval=3600).get()
+    assert loaded.model.__dict__.get("fused_preprocessor") is not None
+    frame = make_feature_frame(100, seed=15)
+    assert np.array_equal(loaded.model.predict_proba(frame.copy()), trained_model.predict_proba(frame.copy()))
+    assert np.array_equal(loaded.model.predict_records(frame.to_dict("records")), trained_model.predict(frame.copy()))
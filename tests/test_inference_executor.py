@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+from src.pipline.inference_executor import InferenceExecutor, InferenceOverloadedError
+from src.utils import metrics
+
+
+def test_executor_sheds_load_beyond_queue_depth():
+    executor = InferenceExecutor(kind="thread", max_workers=1, max_queue_depth=1)
+    release = threading.Event()
+    try:
+        running = executor.submit(release.wait)
+        queued = executor.submit(release.wait)
+        assert executor.stats()["queue_depth"] == 1
+        with pytest.raises(InferenceOverloadedError):
+            executor.submit(release.wait)
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+    finally:
+        release.set()
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["in_flight"] == 0
+
+
+def test_unknown_executor_kind_is_rejected():
+    with pytest.raises(Exception):
+        InferenceExecutor(kind="fiber")
+
+
+def _timed_in_worker(value):
+    with metrics.timed("test_worker_stage"):
+        return value * 2
+
+
+def test_process_workers_report_their_metrics_to_the_parent():
+    # Already recorded here before the workers start, so a forked worker inherits it
+    metrics.STAGE_LATENCY.observe(0.001, "test_worker_stage")
+    before = metrics.STAGE_LATENCY.count("test_worker_stage")
+    executor = InferenceExecutor(kind="process", max_workers=2, max_queue_depth=4)
+    try:
+        assert [executor.submit(_timed_in_worker, i).result(timeout=60) for i in range(3)] == [0, 2, 4]
+    finally:
+        executor.shutdown()
+    assert metrics.STAGE_LATENCY.count("test_worker_stage") == before + 3
@@ -0,0 +1,44 @@
+from src.utils import metrics
+from src.utils.metrics import Counter, Histogram
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_latency_seconds", "test", labelnames=("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "encoding")
+    lines = histogram.render()
+    assert 'test_latency_seconds_bucket{stage="encoding",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{stage="encoding",le="1.0"} 3' in lines
+    assert 'test_latency_seconds_bucket{stage="encoding",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_count{stage="encoding"} 4' in lines
+
+
+def test_counter_accumulates_per_label():
+    counter = Counter("test_total", "test", labelnames=("class",))
+    counter.inc(2, 1)
+    counter.inc(1, 1)
+    counter.inc(1, 0)
+    assert counter.value(1) == 3
+    assert counter.value(0) == 1
+
+
+def test_timed_is_noop_when_disabled(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+    before = metrics.STAGE_LATENCY.count("disabled_stage")
+    with metrics.timed("disabled_stage"):
+        pass
+    assert metrics.STAGE_LATENCY.count("disabled_stage") == before
+
+
+def test_drained_worker_metrics_merge_into_the_parent():
+    worker = Histogram("test_stage_seconds", "test", labelnames=("stage",), buckets=(0.1, 1.0))
+    parent = Histogram("test_stage_seconds", "test", labelnames=("stage",), buckets=(0.1, 1.0))
+    parent.observe(0.05, "encoding")
+    worker.observe(0.5, "encoding")
+    worker.observe(0.5, "forest_inference")
+
+    parent.merge(worker.drain())
+    assert worker.count("encoding") == 0
+    assert parent.count("encoding") == 2 and parent.count("forest_inference") == 1
+    assert 'test_stage_seconds_bucket{stage="encoding",le="0.1"} 1' in parent.render()
+    assert 'test_stage_seconds_bucket{stage="encoding",le="1.0"} 2' in parent.render()
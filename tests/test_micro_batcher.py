@@ -0,0 +1,54 @@
+import asyncio
+
+from src.pipline.micro_batcher import PredictionBatcher
+from src.utils import metrics
+
+
+def test_concurrent_requests_are_coalesced():
+    calls = []
+    observed_batches = metrics.BATCH_SIZE.count()
+
+    def score(rows):
+        calls.append(len(rows))
+        return [row * 2 for row in rows]
+
+    async def run():
+        batcher = PredictionBatcher(score_fn=score, max_batch_size=64, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        return batcher, results
+
+    batcher, results = asyncio.run(run())
+    assert results == [i * 2 for i in range(10)]
+    assert calls == [10]
+    stats = batcher.stats()
+    assert stats["batch_size_counts"] == {10: 1}
+    assert stats["rows"] == 10
+    assert metrics.BATCH_SIZE.count() == observed_batches + 1
+    assert 'vehicle_batch_size_bucket{le="16"}' in metrics.render_metrics()
+
+
+def test_full_batch_flushes_without_waiting():
+    calls = []
+
+    def score(rows):
+        calls.append(len(rows))
+        return rows
+
+    async def run():
+        batcher = PredictionBatcher(score_fn=score, max_batch_size=4, max_wait_ms=10_000)
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(8))), timeout=5)
+
+    assert asyncio.run(run()) == list(range(8))
+    assert calls == [4, 4]
+
+
+def test_scoring_error_reaches_every_caller():
+    def score(rows):
+        raise ValueError("boom")
+
+    async def run():
+        batcher = PredictionBatcher(score_fn=score, max_wait_ms=1)
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
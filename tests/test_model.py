@@ -25,3 +25,30 @@ def test_dataframe_structure():
     
     assert list(test_data.columns) == EXPECTED_COLUMNS
     assert len(test_data) == 1
+
+
+def test_predict_array_matches_dataframe_path(trained_model):
+    from benchmarks.synthetic import make_feature_frame
+
+    frame = make_feature_frame(300, seed=21)
+    expected = trained_model.predict(frame.copy())
+    assert (trained_model.predict_array(frame.to_numpy(dtype="float64")) == expected).all()
+    assert (trained_model.predict_records(frame.to_dict("records")) == expected).all()
+    assert (trained_model._transform_array(frame.to_numpy(dtype="float64"))
+            == trained_model.preprocessing_object.transform(frame)).all()
+
+
+def test_single_row_fast_path_matches_dataframe_path(trained_model):
+    from benchmarks.synthetic import make_feature_frame
+
+    frame = make_feature_frame(40, seed=22)
+    for record in frame.to_dict("records"):
+        expected = trained_model.predict(pd.DataFrame([record]))
+        assert trained_model.predict_records(record)[0] == expected[0]
+        assert trained_model.predict_array(list(record.values()))[0] == expected[0]
+
+
+def test_records_path_coerces_like_dataframe_path(trained_model):
+    record = {"Gender": "1", "Age": "40", "Region_Code": "bad", "Annual_Premium": None, "Vintage": 520}
+    expected = trained_model.predict(pd.DataFrame([record]))
+    assert trained_model.predict_records(record)[0] == expected[0]
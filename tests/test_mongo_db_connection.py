@@ -0,0 +1,91 @@
+import threading
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from src.configuration import mongo_db_connection
+from src.configuration.mongo_db_connection import MongoDBClient, PoolCounters, create_client, pool_stats
+from src.data_access.proj1_data import Proj1Data
+from src.exception import MyException
+
+
+@pytest.fixture(autouse=True)
+def fresh_client(monkeypatch):
+    for name in ("client", "pool_counters", "_owned_client", "_owner_pid"):
+        monkeypatch.setattr(MongoDBClient, name, None)
+
+
+def test_client_is_created_lazily_once_and_shared(monkeypatch):
+    monkeypatch.setenv("MONGODB_URL", "mongomock://")
+    assert pool_stats() == {"client": "none"}
+
+    first, second = Proj1Data(), Proj1Data()
+    assert isinstance(MongoDBClient.client, mongomock.MongoClient)
+    assert first.mongo_client.client is second.mongo_client.client is MongoDBClient.client
+    first.mongo_client.database["Proj1-Data"].insert_one({"id": 1})
+    assert second.mongo_client.database["Proj1-Data"].count_documents({}) == 1
+    assert pool_stats() == {"client": "stand-in"}
+
+
+def test_client_inherited_through_fork_is_replaced(monkeypatch):
+    monkeypatch.setenv("MONGODB_URL", "mongomock://")
+    parent = MongoDBClient.get_client()
+    assert MongoDBClient.get_client() is parent
+
+    monkeypatch.setattr(mongo_db_connection.os, "getpid", lambda: -1)
+    child = MongoDBClient.get_client()
+    assert child is not parent and MongoDBClient.get_client() is child
+
+    injected = mongomock.MongoClient()
+    MongoDBClient.client = injected
+    monkeypatch.setattr(mongo_db_connection.os, "getpid", lambda: -2)
+    assert MongoDBClient.get_client() is injected
+
+
+def test_missing_url_raises(monkeypatch):
+    monkeypatch.delenv("MONGODB_URL", raising=False)
+    with pytest.raises(MyException, match="MONGODB_URL"):
+        MongoDBClient()
+
+
+def test_pymongo_client_gets_pool_settings_without_connecting(monkeypatch):
+    monkeypatch.setattr(mongo_db_connection, "MONGODB_MAX_POOL_SIZE", 8)
+    monkeypatch.setattr(mongo_db_connection, "MONGODB_MIN_POOL_SIZE", 2)
+    monkeypatch.setattr(mongo_db_connection, "MONGODB_COMPRESSORS", "no-such-codec,zlib")
+
+    client, counters = create_client("mongodb://localhost:1")
+    try:
+        pool_options = client.options.pool_options
+        assert (pool_options.max_pool_size, pool_options.min_pool_size) == (8, 2)
+        assert client.options.server_selection_timeout == 5
+        assert counters in client.options.event_listeners
+        assert client.options.pool_options._compression_settings.compressors == ["zlib"]
+        assert counters.stats()["connections_created"] == 0
+    finally:
+        client.close()
+
+
+def test_pool_counters_count_checkouts_and_waits():
+    counters = PoolCounters(max_pool_size=2)
+    server = SimpleNamespace(address=("db", 27017))
+
+    for _ in range(2):
+        counters.connection_check_out_started(server)
+        counters.connection_checked_out(server)
+    counters.connection_check_out_started(server)  # both connections are in use: this one waits
+    counters.connection_check_out_failed(server)
+    counters.connection_checked_in(server)
+
+    def checkout():
+        counters.connection_check_out_started(server)
+        counters.connection_checked_out(server)
+
+    worker = threading.Thread(target=checkout)
+    worker.start()
+    worker.join()
+
+    stats = counters.stats()
+    assert stats["checkouts"] == 3 and stats["checkout_waits"] == 1 and stats["checkout_failures"] == 1
+    assert stats["in_use"] == 2 and stats["peak_in_use"] == 2
+    assert stats["max_checkout_seconds"] >= 0
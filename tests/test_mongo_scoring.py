@@ -0,0 +1,70 @@
+import mongomock
+import pytest
+
+from src.exception import MyException
+from src.pipline.mongo_scoring import MongoBulkScorer
+from src.pipline.prediction_pipeline import ModelCache, VehicleDataClassifier, score_raw_dataframe
+
+from tests.helpers import make_raw_frame, write_artifact
+
+
+def _database(n_rows):
+    database = mongomock.MongoClient()["Proj1"]
+    raw = make_raw_frame(n_rows)
+    raw["Response"] = 0
+    database["Proj1-Data"].insert_many(raw.to_dict("records"))
+    return database, raw
+
+
+def test_bulk_scoring_writes_every_prediction(artifact_dir, trained_model):
+    database, raw = _database(230)
+    classifier = VehicleDataClassifier(cache=ModelCache(base_dir=artifact_dir))
+    scorer = MongoBulkScorer(database=database, batch_size=50, workers=2, classifier=classifier)
+    # A retrain finishing before the workers start must not change the model they score with
+    write_artifact(artifact_dir, "02_01_2026_00_00_00", trained_model)
+
+    summary = scorer.run()
+    assert summary["documents"] == 230
+    assert summary["batches"] == 5
+    assert database["Proj1-Predictions"].count_documents({}) == 230
+    assert database["Proj1-Predictions"].count_documents({"model_version": "01_01_2026_00_00_00"}) == 230
+
+    expected = score_raw_dataframe(raw, classifier)
+    by_id = {doc["_id"]: doc for doc in database["Proj1-Predictions"].find()}
+    for source, prediction in zip(database["Proj1-Data"].find().sort("_id", 1), expected["prediction"]):
+        assert by_id[source["_id"]]["prediction"] == prediction
+
+
+def test_interrupted_run_resumes_after_its_checkpoint(artifact_dir, monkeypatch):
+    database, _ = _database(120)
+    classifier = VehicleDataClassifier(cache=ModelCache(base_dir=artifact_dir))
+    scorer = MongoBulkScorer(database=database, batch_size=40, workers=1, classifier=classifier)
+    second_batch_start = database["Proj1-Data"].find().sort("_id", 1)[40]["_id"]
+    write_predictions = scorer._write_predictions
+
+    def fail_on_second_batch(doc_ids, *scores):
+        if doc_ids[0] == second_batch_start:
+            raise ConnectionError("connection reset")
+        return write_predictions(doc_ids, *scores)
+
+    monkeypatch.setattr(scorer, "_write_predictions", fail_on_second_batch)
+    with pytest.raises(MyException, match="connection reset"):
+        scorer.run()
+    first_batch_end = database["Proj1-Data"].find().sort("_id", 1)[39]["_id"]
+    assert scorer.last_checkpoint() == first_batch_end
+
+    monkeypatch.setattr(scorer, "_write_predictions", write_predictions)
+    summary = scorer.run()
+    assert summary["documents"] == 80
+    assert database["Proj1-Predictions"].count_documents({}) == 120
+
+
+def test_checkpoint_of_another_model_is_not_resumed(artifact_dir):
+    database, _ = _database(10)
+    classifier = VehicleDataClassifier(cache=ModelCache(base_dir=artifact_dir))
+    scorer = MongoBulkScorer(database=database, batch_size=40, workers=1, classifier=classifier)
+    scorer.checkpoints.insert_one({"_id": scorer.checkpoint_id, "last_id": None, "model_version": "older_run"})
+
+    with pytest.raises(MyException, match="older_run"):
+        scorer.run()
+    assert scorer.run(resume=False)["documents"] == 10
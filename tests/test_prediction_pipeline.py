@@ -0,0 +1,71 @@
+from src.pipline.prediction_pipeline import ModelCache, VehicleDataClassifier, get_latest_complete_artifact_dir
+
+from benchmarks.synthetic import make_feature_frame
+from tests.helpers import make_trained_model, write_artifact
+
+
+def test_latest_complete_artifact_dir_skips_incomplete_runs(artifact_dir, tmp_path):
+    (tmp_path / "artifact" / "02_01_2026_00_00_00" / "model_trainer").mkdir(parents=True)
+    (tmp_path / "artifact" / "not_a_timestamp").mkdir()
+    assert get_latest_complete_artifact_dir(artifact_dir).endswith("01_01_2026_00_00_00")
+
+
+def test_model_cache_loads_once(artifact_dir):
+    cache = ModelCache(base_dir=artifact_dir, poll_interval=3600)
+    first = cache.get()
+    assert cache.get() is first
+    assert VehicleDataClassifier(cache=cache).model is first.model
+
+
+def test_model_cache_swaps_in_newer_artifact(artifact_dir):
+    cache = ModelCache(base_dir=artifact_dir, poll_interval=3600)
+    first = cache.get()
+    assert cache.refresh() is False
+
+    write_artifact(artifact_dir, "03_01_2026_00_00_00", make_trained_model(seed=11))
+    assert cache.refresh() is True
+    assert cache.get() is not first
+    assert cache.get().artifact_dir.endswith("03_01_2026_00_00_00")
+
+
+def test_classifier_predicts_with_cached_model(artifact_dir, trained_model):
+    cache = ModelCache(base_dir=artifact_dir, poll_interval=3600)
+    frame = make_feature_frame(5, seed=3)
+    classifier = VehicleDataClassifier(cache=cache)
+    assert list(classifier.predict(frame.copy())) == list(trained_model.predict(frame.copy()))
+    assert 0.0 <= classifier.predict_proba(frame.head(1).copy()) <= 1.0
+
+
+def test_encode_vehicle_dataframe_matches_form_encoding():
+    import pandas as pd
+    from src.pipline.prediction_pipeline import encode_vehicle_dataframe
+
+    raw = pd.DataFrame([
+        {"Gender": "Male", "Age": "40", "Driving_License": 1, "Region_Code": 28.0, "Previously_Insured": 0,
+         "Annual_Premium": 55555.0, "Policy_Sales_Channel": 26.0, "Vintage": 520,
+         "Vehicle_Age": "> 2 Years", "Vehicle_Damage": "Yes"},
+        {"Gender": "Female", "Age": 25, "Driving_License": 1, "Region_Code": 3.0, "Previously_Insured": 1,
+         "Annual_Premium": 25000.0, "Policy_Sales_Channel": 152.0, "Vintage": 100,
+         "Vehicle_Age": "< 1 Year", "Vehicle_Damage": "No"},
+    ])
+    encoded = encode_vehicle_dataframe(raw)
+    encoded_columns = ["Gender", "Vehicle_Age_lt_1_Year", "Vehicle_Age_gt_2_Years", "Vehicle_Damage_Yes"]
+    assert encoded.iloc[0][encoded_columns].tolist() == [1, 0, 1, 1]
+    assert encoded.iloc[1][encoded_columns].tolist() == [0, 1, 0, 0]
+    assert encoded["Age"].tolist() == [40, 25]
+
+
+def test_predict_with_scores_matches_separate_calls(artifact_dir, trained_model):
+    cache = ModelCache(base_dir=artifact_dir, poll_interval=3600)
+    frame = make_feature_frame(50, seed=5)
+    classifier = VehicleDataClassifier(cache=cache)
+    scored = classifier.predict_with_scores(frame)
+    assert scored.threshold == 0.5
+    assert list(scored.labels) == list(trained_model.predict(frame.copy()))
+    assert list(scored.probabilities) == list(trained_model.trained_model_object.predict_proba(
+        trained_model.preprocessing_object.transform(frame))[:, 1])
+    assert classifier.predict_proba(frame.head(1).copy()) == scored.probabilities[0]
+
+    from_records = classifier.predict_with_scores(frame.to_dict("records"))
+    assert list(from_records.labels) == list(scored.labels)
+    assert list(from_records.probabilities) == list(scored.probabilities)
@@ -0,0 +1,18 @@
+import sys
+
+import pytest
+
+from src.utils.process_memory import process_memory
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc/<pid>/smaps_rollup")
+def test_process_memory_reports_private_and_shared():
+    memory = process_memory()
+    if not memory:
+        pytest.skip("smaps_rollup not available on this kernel")
+    assert memory["rss_bytes"] > 0
+    assert memory["private_bytes"] + memory["shared_bytes"] == memory["rss_bytes"]
+
+
+def test_process_memory_of_missing_process_is_empty():
+    assert process_memory(2 ** 31) == {}
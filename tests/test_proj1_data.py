@@ -0,0 +1,80 @@
+import mongomock
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.configuration.mongo_db_connection import MongoDBClient
+from src.data_access.proj1_data import Proj1Data
+from tests.helpers import make_raw_frame
+
+
+@pytest.fixture
+def proj1_data(monkeypatch):
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(MongoDBClient, "client", client)
+    raw = make_raw_frame(45)
+    raw["Response"] = np.arange(45) % 2
+    documents = raw.to_dict("records")
+    documents[3]["Age"] = "na"
+    documents[4]["Vehicle_Damage"] = "na"
+    del documents[5]["Annual_Premium"]
+    documents[6]["extra_field"] = "ignored"
+    client["Proj1"]["Proj1-Data"].insert_many(documents)
+    return Proj1Data(batch_size=10), raw
+
+
+def test_export_projects_schema_columns_with_schema_types(proj1_data):
+    export, raw = proj1_data
+    df = export.export_collection_as_dataframe("Proj1-Data")
+
+    assert list(df.columns) == list(export.column_types)
+    assert "_id" not in df.columns and "extra_field" not in df.columns
+    assert df["Gender"].dtype == "category"
+    assert df["Vintage"].dtype == np.int16 and df["Response"].dtype == np.int8
+    assert df["Age"].dtype == np.float64 and np.isnan(df.loc[3, "Age"])
+    assert pd.isna(df.loc[4, "Vehicle_Damage"]) and np.isnan(df.loc[5, "Annual_Premium"])
+    assert df["id"].tolist() == raw["id"].tolist()
+    assert df["Vehicle_Age"].astype(str).tolist() == raw["Vehicle_Age"].tolist()
+
+
+def test_chunks_match_the_dataframe_export(proj1_data):
+    export, _ = proj1_data
+    df = export.export_collection_as_dataframe("Proj1-Data")
+
+    chunks = list(export.iter_collection_chunks("Proj1-Data", chunk_rows=20))
+    assert [len(chunk) for chunk in chunks] == [20, 20, 5]
+    combined = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(combined.astype(str), df.astype(str))
+
+
+@pytest.mark.usefixtures("proj1_data")
+@pytest.mark.parametrize("partition_key", ["_id", "id"])
+def test_parallel_range_export_matches_single_cursor_row_for_row(partition_key):
+    single = Proj1Data(batch_size=10, workers=1, partition_key=partition_key)
+    parallel = Proj1Data(batch_size=7, workers=4, partition_key=partition_key)
+
+    ranges = parallel.partition_ranges(parallel._collection("Proj1-Data", None), 4)
+    assert len(ranges) > 1
+    assert ranges[0][0] is None and ranges[-1][1] is None
+    assert all(upper == lower for (_, upper), (lower, _) in zip(ranges, ranges[1:]))
+
+    pd.testing.assert_frame_equal(
+        parallel.export_collection_as_dataframe("Proj1-Data"),
+        single.export_collection_as_dataframe("Proj1-Data"),
+    )
+
+
+def test_export_new_documents_fetches_only_past_the_watermark(proj1_data):
+    export, raw = proj1_data
+    collection = export._collection("Proj1-Data", None)
+    first, watermark = export.export_new_documents("Proj1-Data")
+    assert len(first) == 45 and watermark == export.max_key("Proj1-Data")
+
+    collection.insert_many(make_raw_frame(5).assign(id=np.arange(100, 105), Response=0).to_dict("records"))
+    parallel = Proj1Data(batch_size=2, workers=3)
+    delta, new_watermark = parallel.export_new_documents("Proj1-Data", watermark)
+    assert delta["id"].tolist() == list(range(100, 105))
+    assert new_watermark > watermark
+
+    empty, unchanged = parallel.export_new_documents("Proj1-Data", new_watermark)
+    assert empty.empty and list(empty.columns) == list(export.column_types) and unchanged == new_watermark
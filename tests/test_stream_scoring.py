@@ -0,0 +1,47 @@
+import asyncio
+import io
+
+import pandas as pd
+
+from src.pipline.prediction_pipeline import encode_vehicle_dataframe
+from src.pipline.stream_scoring import CsvChunkReader, format_stream_error
+from tests.helpers import make_raw_frame
+
+
+async def _pieces(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def test_chunk_reader_splits_rows_without_losing_any():
+    raw = make_raw_frame(25)
+    data = raw.to_csv(index=False).encode()
+
+    async def collect():
+        reader = CsvChunkReader(_pieces(data, 37), chunk_rows=10)
+        header = await reader.read_header()
+        return header, [block async for block in reader]
+
+    header, blocks = asyncio.run(collect())
+    assert header == list(raw.columns)
+    parsed = [pd.read_csv(io.BytesIO(block)) for block in blocks]
+    assert [len(frame) for frame in parsed] == [10, 10, 5]
+    pd.testing.assert_frame_equal(pd.concat(parsed, ignore_index=True), raw)
+
+
+def test_encoding_matches_data_transformation_steps():
+    from src.components.data_transformation import DataTransformation
+
+    raw = make_raw_frame(60)
+    transformation = DataTransformation.__new__(DataTransformation)
+    expected = transformation._rename_columns(
+        transformation._create_dummy_columns(transformation._map_gender_column(raw.drop(columns=["id"]).copy()))
+    )
+    encoded = encode_vehicle_dataframe(raw)
+    for column in encoded.columns:
+        assert (encoded[column].to_numpy() == expected[column].to_numpy()).all(), column
+
+
+def test_stream_error_trailer_is_one_parseable_line():
+    assert format_stream_error(ValueError("bad\nrow 73"), "csv") == b"# error: bad row 73\n"
+    assert format_stream_error(ValueError("bad row"), "ndjson") == b'{"error": "bad row"}\n'
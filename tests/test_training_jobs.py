@@ -0,0 +1,117 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from src.pipline.training_jobs import TrainingJobManager
+from tests.helpers import fake_training_pipeline, wait_for_job
+
+# Targets run in a spawned process, so they must be importable module-level functions
+
+
+def failing_pipeline(report):
+    report("data_ingestion", "started")
+    raise ValueError("no data")
+
+
+def slow_pipeline(report):
+    report("data_ingestion", "started")
+    time.sleep(60)
+
+
+def test_job_reports_stages_and_artifact_in_a_lower_priority_process(tmp_path):
+    manager = TrainingJobManager(target=fake_training_pipeline, niceness=5, jobs_dir=str(tmp_path))
+    try:
+        job = manager.submit()
+        assert job["state"] == "queued"
+        done = wait_for_job(manager, job["job_id"])
+    finally:
+        manager.shutdown()
+
+    assert done["state"] == "succeeded", done["error"]
+    assert done["pid"] != os.getpid()
+    assert [stage["name"] for stage in done["stages"]] == ["data_ingestion", "model_trainer"]
+    assert all(stage["state"] == "succeeded" and stage["seconds"] >= 0.05 for stage in done["stages"])
+    assert done["model_file_path"] == "artifact/run/model.pkl"
+    assert manager.stats()["succeeded"] == 1
+
+
+def test_failed_job_records_the_error_and_failed_stage(tmp_path):
+    manager = TrainingJobManager(target=failing_pipeline, niceness=0, jobs_dir=str(tmp_path))
+    try:
+        done = wait_for_job(manager, manager.submit()["job_id"])
+    finally:
+        manager.shutdown()
+
+    assert done["state"] == "failed"
+    assert "no data" in done["error"]
+    assert done["stages"][0]["state"] == "failed"
+
+
+def test_one_job_runs_at_a_time_and_a_queued_job_is_reused(tmp_path):
+    manager = TrainingJobManager(target=slow_pipeline, niceness=0, jobs_dir=str(tmp_path))
+    try:
+        first = manager.submit()
+        running = wait_for_job(manager, first["job_id"], states=("running",))
+        second = manager.submit()
+        third = manager.submit()
+        assert second["state"] == "queued"
+        assert third["job_id"] == second["job_id"]
+        assert manager.stats()["running"] == 1
+    finally:
+        manager.shutdown()
+
+    assert running["current_stage"] in (None, "data_ingestion")
+    assert manager.get(second["job_id"])["state"] == "cancelled"
+    assert wait_for_job(manager, first["job_id"])["state"] == "cancelled"
+
+
+def test_workers_sharing_a_jobs_dir_see_each_others_jobs_and_run_one_at_a_time(tmp_path):
+    # Two managers stand in for two uvicorn workers
+    first_worker = TrainingJobManager(target=slow_pipeline, niceness=0, jobs_dir=str(tmp_path))
+    second_worker = TrainingJobManager(target=slow_pipeline, niceness=0, jobs_dir=str(tmp_path))
+    try:
+        running = first_worker.submit()
+        wait_for_job(first_worker, running["job_id"], states=("running",))
+        queued = second_worker.submit()
+        assert first_worker.submit()["job_id"] == queued["job_id"]
+        assert second_worker.get(running["job_id"])["state"] == "running"
+        time.sleep(1.5)
+        assert first_worker.get(queued["job_id"])["state"] == "queued"
+        assert first_worker.stats()["running"] == 1 and first_worker.stats()["queued"] == 1
+    finally:
+        first_worker.shutdown()
+        second_worker.shutdown()
+
+
+def test_jobs_of_an_exited_worker_are_reported_failed(tmp_path):
+    dead_pid = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    job_id = "0" * 32
+    with open(tmp_path / f"{job_id}.json", "w") as job_file:
+        json.dump({"job_id": job_id, "state": "queued", "owner_pid": int(dead_pid), "submitted_at": time.time(),
+                   "started_at": None, "finished_at": None, "pid": None, "current_stage": None, "stages": {},
+                   "result": None, "error": None}, job_file)
+    manager = TrainingJobManager(target=failing_pipeline, niceness=0, jobs_dir=str(tmp_path))
+    try:
+        assert manager.get(job_id)["state"] == "failed"
+        assert manager.submit()["job_id"] != job_id
+    finally:
+        manager.shutdown()
+
+
+def test_finished_jobs_beyond_history_are_pruned_and_stats_follow_the_files(tmp_path):
+    manager = TrainingJobManager(target=failing_pipeline, niceness=0, history=2, jobs_dir=str(tmp_path))
+    try:
+        job_ids = [wait_for_job(manager, manager.submit()["job_id"])["job_id"] for _ in range(3)]
+        assert sorted(name for name in os.listdir(tmp_path) if name.endswith(".json")) == \
+            sorted(f"{job_id}.json" for job_id in job_ids[1:])
+        assert manager.get(job_ids[0]) is None
+        assert manager.stats()["failed"] == 2
+
+        # Another worker removing a record is picked up on the next scrape
+        os.remove(tmp_path / f"{job_ids[1]}.json")
+        assert manager.stats()["failed"] == 1
+    finally:
+        manager.shutdown()